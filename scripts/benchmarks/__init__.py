@@ -0,0 +1,44 @@
+"""
+# Scripts / Benchmarks
+
+Micro-benchmarks for the helper code shipped alongside the stubs. Each
+benchmark is a module which can be run directly, for example:
+
+```sh
+poetry run python -m scripts.benchmarks.fl_midi_msg
+```
+"""
+import sys
+import time
+from collections.abc import Callable
+
+# Add `src/*` to PATH so that the stub modules can be imported
+sys.path.extend([
+    'src/edison_scripting',
+    'src/midi_controller_scripting',
+    'src/piano_roll_scripting',
+])
+
+
+def time_per_call(fn: Callable[[], object], count: int) -> float:
+    """
+    Call `fn` `count` times and return the average time per call, in
+    nanoseconds.
+
+    The best of three runs is used, to reduce the noise caused by other
+    processes.
+    """
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter_ns()
+        for _ in range(count):
+            fn()
+        best = min(best, time.perf_counter_ns() - start)
+    return best / count
+
+
+def report(name: str, ns_per_call: float) -> None:
+    """
+    Print the result of a benchmark.
+    """
+    print(f"{name:<48} {ns_per_call:>10.1f} ns")
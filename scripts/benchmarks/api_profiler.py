@@ -0,0 +1,76 @@
+"""
+# Scripts / Benchmarks / API profiler
+
+Profile a "chatty" script, which reads the name and volume of every mixer
+track on each refresh, using `fl_sim.ApiProfiler`, then measure the overhead
+that the profiler adds to each API call.
+"""
+import device
+import midi
+import mixer
+from fl_classes import FlMidiMsg
+from fl_sim import ApiProfiler, EventLoop, MixerSim
+
+from . import report, time_per_call
+
+SECOND = 1_000_000
+COUNT = 100_000
+
+
+class Script:
+    def OnControlChange(self, msg: FlMidiMsg) -> None:
+        mixer.setTrackVolume(msg.data1, msg.data2 / 127)
+        msg.handled = True
+
+    def OnRefresh(self, flags: int) -> None:
+        for i in range(mixer.trackCount()):
+            # Reads the name twice, as scripts often do when formatting.
+            # Sending MIDI in between doesn't change the name.
+            if mixer.getTrackName(i):
+                device.midiOutMsg(midi.MIDI_CONTROLCHANGE | i % 128 << 8)
+                mixer.getTrackName(i)
+            mixer.getTrackVolume(i)
+
+
+def read_name() -> None:
+    mixer.getTrackName(1)
+
+
+def main():
+    profiler = ApiProfiler(Script())
+    loop = EventLoop(profiler)
+    with MixerSim(loop.notifier):
+        report("getTrackName", time_per_call(read_name, COUNT))
+        with profiler:
+            report("getTrackName (profiled)", time_per_call(read_name, COUNT))
+            profiler.reset()
+            loop.start()
+            loop.scheduleMidiMany(
+                (t, midi.MIDI_CONTROLCHANGE, t // 10_000 % 100, 64)
+                for t in range(0, 10 * SECOND, 10_000)
+            )
+            loop.runFor(10 * SECOND)
+            loop.stop()
+        tracks = mixer.trackCount()
+
+    refreshes = profiler.invocations['OnRefresh']
+    stats = profiler.stats
+    names = stats['OnRefresh', 'mixer.getTrackName']
+    assert names.calls == 2 * refreshes * tracks
+    assert names.redundant == names.calls // 2
+    assert stats['OnRefresh', 'mixer.getTrackVolume'].redundant == 0
+    assert stats['OnRefresh', 'device.midiOutMsg'].calls == refreshes * tracks
+    assert stats['OnControlChange', 'mixer.setTrackVolume'].calls == 1000
+    print()
+    print(f"{'Callback':<16} {'Function':<28} {'Calls':>8} {'Redundant':>10}")
+    for (callback, function), s in sorted(stats.items()):
+        print(f"{callback:<16} {function:<28} {s.calls:>8} {s.redundant:>10}")
+    print()
+    for (filename, line), count in profiler.callSites(
+        'mixer.getTrackName'
+    ).items():
+        print(f"mixer.getTrackName  {filename}:{line}  {count}")
+
+
+if __name__ == "__main__":
+    main()
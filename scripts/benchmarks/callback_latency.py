@@ -0,0 +1,75 @@
+"""
+# Scripts / Benchmarks / Callback latency
+
+Measure the latency of each callback of a script with a fader per mixer
+track, over ten simulated minutes of notes and CC messages, using
+`fl_sim.CallbackProfiler`.
+
+The summary is printed as JSON, or written to the path given as the first
+argument. The exit code is non-zero if any callback exceeded its budget, so
+that this can be used as a CI gate.
+"""
+import sys
+
+import midi
+import mixer
+from fl_classes import FlMidiMsg
+from fl_sim import CallbackProfiler, EventLoop, MixerSim
+
+SECOND = 1_000_000
+DURATION = 600 * SECOND
+
+
+class Script:
+    def OnInit(self) -> None:
+        self.faders = [0] * 128
+
+    def OnMidiIn(self, msg: FlMidiMsg) -> None:
+        if msg.status & 0xF0 == midi.MIDI_NOTEON and msg.data2 == 0:
+            msg.handled = True
+
+    def OnControlChange(self, msg: FlMidiMsg) -> None:
+        mixer.setTrackVolume(msg.data1, msg.data2 / 127)
+        msg.handled = True
+
+    def OnNoteOn(self, msg: FlMidiMsg) -> None:
+        msg.handled = True
+
+    def OnRefresh(self, flags: int) -> None:
+        for i in range(mixer.trackCount()):
+            self.faders[i % 128] = round(mixer.getTrackVolume(i) * 127)
+
+    def OnIdle(self) -> None:
+        pass
+
+
+def main():
+    profiler = CallbackProfiler(Script())
+    loop = EventLoop(profiler)
+    with MixerSim(loop.notifier):
+        loop.start()
+        loop.scheduleMidiMany(
+            (t, midi.MIDI_CONTROLCHANGE, t // 10_000 % 100, t // 10_000 % 127)
+            for t in range(0, DURATION, 10_000)
+        )
+        loop.scheduleMidiMany(
+            (t, midi.MIDI_NOTEON | 9, 36, t // 250_000 % 2 * 100)
+            for t in range(5_000, DURATION, 250_000)
+        )
+        loop.runFor(DURATION)
+        loop.stop()
+
+    report = profiler.toJson(indent=2)
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'w') as f:
+            f.write(report + '\n')
+    else:
+        print(report)
+    if profiler.violations:
+        for violation in profiler.violations[:10]:
+            print(violation, file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
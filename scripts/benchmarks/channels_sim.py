@@ -0,0 +1,86 @@
+"""
+# Scripts / Benchmarks / Channels sim
+
+Check that the bulk grid operations of `fl_sim.ChannelsSim` agree with the
+`channels` module and reject windows outside the grid, and that channel
+volumes in decibels follow the mixer's fader curve. Then compare the time
+taken to fill and read back the step sequencer grid one bit at a time
+through the `channels` module, against the bulk row operations, for an 8x8
+pad grid.
+"""
+from functools import partial
+
+import channels
+import utils
+from fl_sim import ChannelsSim
+
+from . import report, time_per_call
+
+COUNT = 1_000
+
+ROWS = range(8)
+STEPS = 8
+
+
+def fill_per_bit() -> None:
+    # The `fill_channel` example from the `channels` docs
+    for idx in ROWS:
+        for i in range(16):
+            if (i - idx) % 4 == 0:
+                channels.setGridBit(idx, i, True)
+
+
+def fill_bulk(sim: ChannelsSim) -> None:
+    for idx in ROWS:
+        sim.fillGridRow(idx, 4, idx % 4, 16)
+
+
+def read_per_bit() -> list[list[bool]]:
+    return [
+        [channels.getGridBit(idx, step) for step in range(STEPS)]
+        for idx in ROWS
+    ]
+
+
+def read_bulk(sim: ChannelsSim) -> list[int]:
+    return sim.getGridRows(ROWS, 0, STEPS)
+
+
+def main():
+    with ChannelsSim() as sim:
+        fill_per_bit()
+        expected = read_per_bit()
+        sim.setGridRows(ROWS, 0, 16, [0] * len(ROWS))
+        fill_bulk(sim)
+        assert read_per_bit() == expected
+        assert read_bulk(sim) == [
+            sum(bit << i for i, bit in enumerate(row)) for row in expected
+        ]
+
+        # Windows that don't fit within the 128 steps are rejected
+        for start, count in ((-1, 4), (0, -1), (120, 16)):
+            try:
+                sim.getGridRows(ROWS, start, count)
+            except IndexError:
+                pass
+            else:
+                raise AssertionError(f"Window {start}, {count} wasn't rejected")
+
+        # Volumes in decibels use the same curve as the mixer's faders
+        channels.setChannelVolume(0, 0.8)
+        assert channels.getChannelVolume(0, True) == 0.0
+        channels.setChannelVolume(0, 0.5)
+        assert channels.getChannelVolume(0, True) == utils.FaderTodB(0.5)
+
+        report("Fill 8 rows with setGridBit", time_per_call(
+            fill_per_bit, COUNT))
+        report("Fill 8 rows with fillGridRow", time_per_call(
+            partial(fill_bulk, sim), COUNT))
+        report("Read 8x8 pads with getGridBit", time_per_call(
+            read_per_bit, COUNT))
+        report("Read 8x8 pads with getGridRows", time_per_call(
+            partial(read_bulk, sim), COUNT))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+# Scripts / Benchmarks / Color batch
+
+Check that the batch color conversion functions in `utils` give the same
+results as calling the scalar functions on each color, then compare the time
+taken to convert the colors of a 512-pad grid each way.
+"""
+import random
+from functools import partial
+
+import utils
+
+from . import report, time_per_call
+
+PADS = 512
+COUNT = 200
+
+
+def make_colors() -> list[int]:
+    """
+    Colors of a pad grid, where many pads share the colors of a smaller
+    number of channels or tracks.
+    """
+    rng = random.Random(0)
+    channel_colors = [rng.randrange(0x1000000) for _ in range(64)]
+    # Some colors have junk in the upper bits, as returned by FL Studio
+    channel_colors += [c | 0xFF000000 for c in channel_colors[:8]]
+    colors = [rng.choice(channel_colors) for _ in range(PADS)]
+    # Include edge cases: black, white and greys
+    colors[:4] = [0x000000, 0xFFFFFF, 0x808080, 0x7F7F7F]
+    return colors
+
+
+def make_awkward_colors() -> list[int]:
+    """
+    Colors that can't be packed into 64-bit integers, which use a slower
+    code path.
+    """
+    colors = make_colors()
+    colors[4:6] = [-1, (1 << 70) | 0x123456]
+    return colors
+
+
+def check(colors: list[int]) -> None:
+    assert all(len(a) == 0 for a in utils.RGBToHSVColorBatch([]))
+    assert list(utils.RGBToColorBatch([256, -1], [0, 0], [300, 0])) == [
+        utils.RGBToColor(256, 0, 300), utils.RGBToColor(-1, 0, 0)]
+
+    r, g, b = utils.ColorToRGBBatch(colors)
+    assert list(zip(r, g, b, strict=True)) == [
+        utils.ColorToRGB(c) for c in colors]
+    assert list(utils.RGBToColorBatch(r, g, b)) == [
+        utils.RGBToColor(*utils.ColorToRGB(c)) for c in colors]
+
+    h, s, v = utils.RGBToHSVColorBatch(colors)
+    assert list(zip(h, s, v, strict=True)) == [
+        utils.RGBToHSVColor(c) for c in colors]
+
+    floats = [x / 255 for x in r], [x / 255 for x in g], [x / 255 for x in b]
+    h, s, v = utils.RGBToHSVBatch(*floats)
+    assert list(zip(h, s, v, strict=True)) == [
+        utils.RGBToHSV(*rgb) for rgb in zip(*floats, strict=True)]
+
+    rgb = utils.HSVtoRGBBatch(h, s, v)
+    assert list(zip(*rgb, strict=True)) == [
+        utils.HSVtoRGB(*hsv) for hsv in zip(h, s, v, strict=True)]
+
+    for value in (0, 1, 64, 127.5, 200, 255, 300):
+        for end in (0x000000, 0xFFFFFF, 0x123456):
+            assert list(utils.FadeColorBatch(colors, end, value)) == [
+                utils.FadeColor(c, end, value) for c in colors]
+        assert list(utils.LightenColorBatch(colors, value)) == [
+            utils.LightenColor(c, value) for c in colors]
+
+
+def scalar_hsv(colors: list[int]) -> list[tuple[float, float, float]]:
+    return [utils.RGBToHSVColor(c) for c in colors]
+
+
+def scalar_fade(colors: list[int]) -> list[int]:
+    return [utils.FadeColor(c, 0x000000, 100) for c in colors]
+
+
+def scalar_lighten(colors: list[int]) -> list[int]:
+    return [utils.LightenColor(c, 100) for c in colors]
+
+
+def scalar_rgb(colors: list[int]) -> list[tuple[int, int, int]]:
+    return [utils.ColorToRGB(c) for c in colors]
+
+
+def main():
+    colors = make_colors()
+    check(colors)
+    check(make_awkward_colors())
+    print("Batch results match scalar functions")
+
+    for name, scalar, batch in (
+        ("ColorToRGB", scalar_rgb, utils.ColorToRGBBatch),
+        ("RGBToHSVColor", scalar_hsv, utils.RGBToHSVColorBatch),
+        (
+            "FadeColor",
+            scalar_fade,
+            partial(utils.FadeColorBatch, EndColor=0x000000, Value=100),
+        ),
+        (
+            "LightenColor",
+            scalar_lighten,
+            partial(utils.LightenColorBatch, Value=100),
+        ),
+    ):
+        report(
+            f"{name} loop ({PADS} colors)",
+            time_per_call(partial(scalar, colors), COUNT),
+        )
+        report(
+            f"{name}Batch ({PADS} colors)",
+            time_per_call(partial(batch, colors), COUNT),
+        )
+
+
+if __name__ == "__main__":
+    main()
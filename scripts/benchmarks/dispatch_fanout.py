@@ -0,0 +1,84 @@
+"""
+# Scripts / Benchmarks / Dispatch fan-out
+
+Run a controller script and several extender scripts in separate processes
+using `fl_sim.DispatchHarness`, with the controller forwarding each message
+it receives to every extender using `device.dispatch`, and measure the
+dispatch latency and throughput for each extender, first with messages sent
+as fast as possible, then with each message handled before the next is sent.
+"""
+import device
+from fl_classes import FlMidiMsg
+from fl_sim import DispatchHarness
+
+MESSAGES = 5_000
+EXTENDERS = 3
+
+SYSEX = bytes([0xF0, 0x00, 0x20, 0x29, 0x02, 0x0D, 0x01, 0xF7])
+
+
+class Controller:
+    def OnMidiIn(self, msg: FlMidiMsg) -> None:
+        if msg.status == 0xF0:
+            for i in range(device.dispatchReceiverCount()):
+                device.dispatch(i, 0xF0, msg.sysex)
+        else:
+            message = msg.status + (msg.data1 << 8) + (msg.data2 << 16)
+            for i in range(device.dispatchReceiverCount()):
+                device.dispatch(i, message)
+        msg.handled = True
+
+
+class Extender:
+    def __init__(self) -> None:
+        self.received = 0
+
+    def OnMidiIn(self, msg: FlMidiMsg) -> None:
+        if msg.status == 0xF0:
+            assert msg.sysex == SYSEX
+        else:
+            # Messages must arrive in order
+            assert msg.data1 == self.received % 128
+            self.received += 1
+        msg.handled = True
+
+
+def print_stats(name: str, harness: DispatchHarness) -> None:
+    assert not harness.errors, harness.errors
+    stats = harness.stats()
+    assert list(stats) == list(range(1, EXTENDERS + 1))
+    print(name)
+    for receiver, result in stats.items():
+        latency = result.latency
+        print(
+            f"  Extender {receiver}: {result.messages} messages, "
+            f"{result.throughput:>7.0f} msg/s, "
+            f"latency p50 {latency.percentile(50) / 1000:>7.1f} us, "
+            f"p99 {latency.percentile(99) / 1000:>7.1f} us, "
+            f"max {latency.max / 1000:>7.1f} us"
+        )
+        assert result.messages == MESSAGES + 1
+    harness.resetStats()
+
+
+def main():
+    scripts = [f'{__name__}:Controller']
+    scripts += [f'{__name__}:Extender'] * EXTENDERS
+    routes = {0: list(range(1, EXTENDERS + 1))}
+    with DispatchHarness(scripts, routes, ports=[0, 10, 11, 12]) as harness:
+        for i in range(MESSAGES):
+            harness.send(0, 0xB0, i % 128, 64)
+        harness.sendSysex(0, SYSEX)
+        harness.settle()
+        print_stats("Saturated", harness)
+
+        for i in range(MESSAGES, 2 * MESSAGES):
+            harness.send(0, 0xB0, i % 128, 64)
+            harness.settle()
+        harness.sendSysex(0, SYSEX)
+        harness.settle()
+        print_stats("One at a time", harness)
+
+
+if __name__ == "__main__":
+    main()
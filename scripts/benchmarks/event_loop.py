@@ -0,0 +1,75 @@
+"""
+# Scripts / Benchmarks / Event loop
+
+Measure how quickly `fl_sim.EventLoop` can simulate an hour of a session, in
+which a script with a fader per mixer track receives a CC message every
+100 ms while the transport is playing.
+"""
+import time
+
+import midi
+import mixer
+from fl_classes import FlMidiMsg
+from fl_sim import EventLoop, MixerSim, ScriptNotifier
+
+SECOND = 1_000_000
+HOUR = 3600 * SECOND
+
+
+class Script:
+    def __init__(self) -> None:
+        self.calls: dict[str, int] = {}
+
+    def count(self, name: str) -> None:
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def OnInit(self) -> None:
+        self.count('OnInit')
+
+    def OnControlChange(self, msg: FlMidiMsg) -> None:
+        self.count('OnControlChange')
+        mixer.setTrackVolume(msg.data1, msg.data2 / 127)
+        msg.handled = True
+
+    def OnRefresh(self, flags: int) -> None:
+        self.count('OnRefresh')
+
+    def OnIdle(self) -> None:
+        self.count('OnIdle')
+
+    def OnUpdateMeters(self) -> None:
+        self.count('OnUpdateMeters')
+
+    def OnUpdateBeatIndicator(self, value: int) -> None:
+        self.count('OnUpdateBeatIndicator')
+
+    def OnDeInit(self) -> None:
+        self.count('OnDeInit')
+
+
+def main():
+    script = Script()
+    notifier = ScriptNotifier(script)
+    loop = EventLoop(script, notifier)
+    with MixerSim(notifier):
+        loop.start()
+        loop.setPlaying(True, tempo=120)
+        loop.scheduleMidiMany(
+            (t, midi.MIDI_CONTROLCHANGE, (t // 100_000) % 100, t // 100_000 % 127)
+            for t in range(0, HOUR, 100_000)
+        )
+        start = time.perf_counter()
+        events = loop.runFor(HOUR)
+        elapsed = time.perf_counter() - start
+        loop.stop()
+
+    assert script.calls['OnIdle'] == HOUR // 20_000
+    # Beat indicator changes every half beat at 120 bpm
+    assert script.calls['OnUpdateBeatIndicator'] == HOUR // 250_000 + 1
+    for name, count in sorted(script.calls.items()):
+        print(f"{name:<24} {count:>8}")
+    print(f"Simulated 1 hour ({events} events) in {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
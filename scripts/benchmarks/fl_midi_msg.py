@@ -0,0 +1,131 @@
+"""
+# Scripts / Benchmarks / FlMidiMsg
+
+Compare the memory usage and construction speed of `fl_classes.FlMidiMsg`
+against the previous `__dict__`-based layout, which stored each field as a
+separate instance attribute.
+"""
+import tracemalloc
+
+from fl_classes import FlMidiMsg, eventToRawData
+
+from . import report, time_per_call
+
+COUNT = 100_000
+
+SYSEX = bytes([0xF0, 0x7E, 0x7F, 0x06, 0x01, 0xF7])
+
+
+class DictMidiMsg:
+    """
+    Replica of the attribute layout used by `FlMidiMsg` before it was given
+    `__slots__`.
+    """
+
+    def __init__(
+        self,
+        status_sysex: 'int | list[int] | bytes',
+        data1: int | None = None,
+        data2: int | None = None,
+        pmeFlags: int = 0b101110,
+    ) -> None:
+        if isinstance(status_sysex, int):
+            if data1 is None:
+                raise TypeError(
+                    "data1 value cannot be None for standard events")
+            if data2 is None:
+                raise TypeError(
+                    "data2 value cannot be None for standard events")
+            self.__status = status_sysex
+            self.__sysex: bytes | None = None
+        else:
+            self.__sysex = bytes(status_sysex)
+            self.__status = 0xF0
+        self.__data1 = data1
+        self.__data2 = data2
+
+        self.__timestamp = 0
+        self.__handled = False
+        self.__port = 0
+        self.__pitch_bend = 1
+        self.__is_increment = False
+        self.__res = 0.0
+        self.__in_ev = 0
+        self.__out_ev = 0
+        self.__midi_id = 0
+        self.__midi_chan = 0
+        self.__midi_chan_ex = 0
+        self.__pme_flags = pmeFlags
+
+
+class DuckMidiMsg:
+    """
+    An event that isn't an `FlMidiMsg`, but has the same public properties,
+    as used as a test double by scripts.
+    """
+
+    def __init__(self, status: int, data1: int, data2: int) -> None:
+        self.status = status
+        self.data1 = data1
+        self.data2 = data2
+        self.sysex = b''
+
+
+def bytes_per_msg(cls: type) -> float:
+    """
+    Return the average number of bytes allocated per message
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    msgs = [cls(0x90, i & 0x7F, 0x7F) for i in range(COUNT)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del msgs
+    return (after - before) / COUNT
+
+
+def main():
+    print(f"Memory per message ({COUNT} messages)")
+    print(f"  dict-based: {bytes_per_msg(DictMidiMsg):.1f} bytes")
+    print(f"  FlMidiMsg:  {bytes_per_msg(FlMidiMsg):.1f} bytes")
+    print()
+
+    report(
+        "dict-based construction",
+        time_per_call(lambda: DictMidiMsg(0x90, 0x3C, 0x7F), COUNT),
+    )
+    report(
+        "FlMidiMsg construction",
+        time_per_call(lambda: FlMidiMsg(0x90, 0x3C, 0x7F), COUNT),
+    )
+    report(
+        "dict-based sysex construction",
+        time_per_call(lambda: DictMidiMsg(SYSEX), COUNT),
+    )
+    report(
+        "FlMidiMsg sysex construction",
+        time_per_call(lambda: FlMidiMsg(SYSEX), COUNT),
+    )
+
+    msg = FlMidiMsg(0x90, 0x3C, 0x7F)
+    other = FlMidiMsg(0x90, 0x3C, 0x7F)
+    report("FlMidiMsg.data1", time_per_call(lambda: msg.data1, COUNT))
+    report("FlMidiMsg.__eq__", time_per_call(lambda: msg == other, COUNT))
+    report("eventToRawData", time_per_call(lambda: eventToRawData(msg), COUNT))
+
+    # The rarely-changed properties still behave as separate values
+    msg.res = 0.5
+    assert msg.res == 0.5 and not msg.isIncrement and msg.pitchBend == 1
+    assert msg == other and msg == eventToRawData(other) == 0x7F3C90
+    assert FlMidiMsg(SYSEX) == FlMidiMsg(SYSEX) != msg
+
+    # Objects that only provide the public properties still work
+    duck = DuckMidiMsg(0x90, 0x3C, 0x7F)
+    assert eventToRawData(duck) == 0x7F3C90  # type: ignore[arg-type]
+    duck.status = 0xF0
+    duck.sysex = SYSEX
+    assert eventToRawData(duck) == SYSEX  # type: ignore[arg-type]
+
+
+if __name__ == "__main__":
+    main()
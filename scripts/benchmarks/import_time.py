@@ -0,0 +1,48 @@
+"""
+# Scripts / Benchmarks / Import time
+
+Measure the time taken to import each of the stub modules in a fresh Python
+process, using `python -X importtime`.
+"""
+import os
+import subprocess
+import sys
+
+from ..consts import MODULES, PATHS_TO_MODULES
+
+RUNS = 20
+
+
+def import_time_us(module: str) -> int:
+    """
+    Returns the lowest cumulative time taken to import `module` across all
+    runs, in microseconds.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        f"src/{section}" for section in sorted(set(PATHS_TO_MODULES.values()))
+    )
+    best = sys.maxsize
+    for _ in range(RUNS):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        for line in result.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            _, cumulative, name = line.split("|")
+            if name.strip() == module:
+                best = min(best, int(cumulative))
+    return best
+
+
+def main():
+    for module in sorted(MODULES):
+        print(f"{module:<20} {import_time_us(module):>8} us")
+
+
+if __name__ == "__main__":
+    main()
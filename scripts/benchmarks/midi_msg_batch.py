@@ -0,0 +1,110 @@
+"""
+# Scripts / Benchmarks / MIDI message batch
+
+Check that `fl_classes.FlMidiMsgBatch` keeps every field of its messages and
+is left unchanged when a message can't be stored, then compare the time
+taken to count the note on events in a recording and to pack it into raw
+data, for a list of `FlMidiMsg` objects against a batch.
+"""
+import random
+from functools import partial
+
+from fl_classes import FlMidiMsg, FlMidiMsgBatch, eventToRawData
+
+from . import report, time_per_call
+
+COUNT = 100
+MESSAGES = 10_000
+
+SYSEX = bytes([0xF0, 0x7E, 0x7F, 0x06, 0x01, 0xF7])
+
+
+def check() -> None:
+    batch = FlMidiMsgBatch.fromMessages([
+        FlMidiMsg(0x90, 0x3C, 0x7F, pmeFlags=0b10),
+        FlMidiMsg(0xB0, 7, 100),
+    ])
+    batch.port[0] = 3
+    batch.timestamp[0] = 12_345
+
+    # Rows keep their port and timestamp
+    row = msg = batch[0]
+    assert (row.port, row.timestamp, row.pmeFlags) == (3, 12_345, 0b10)
+    assert [eventToRawData(m) for m in batch] == [0x7F3C90, 0x6407B0]
+    assert len(batch[1:]) == 1 and batch[1:][0] == batch[1]
+
+    # Sysex messages are rejected without changing any column
+    for action in (
+        partial(batch.append, FlMidiMsg(SYSEX)),
+        partial(batch.__setitem__, 1, FlMidiMsg(SYSEX)),
+    ):
+        try:
+            action()
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Sysex message wasn't rejected")
+        columns = (
+            batch.status,
+            batch.data1,
+            batch.data2,
+            batch.port,
+            batch.timestamp,
+            batch.pmeFlags,
+        )
+        assert [len(column) for column in columns] == [2] * 6
+        assert [eventToRawData(m) for m in batch] == [0x7F3C90, 0x6407B0]
+
+    batch[1] = msg
+    assert batch[1].timestamp == 12_345 and batch[1] == msg
+
+
+def note_ons_each(messages: list[FlMidiMsg]) -> int:
+    return sum(1 for msg in messages if msg.status & 0xF0 == 0x90)
+
+
+def note_ons_batch(batch: FlMidiMsgBatch) -> int:
+    return batch.statusMask([0x90], ignoreChannel=True).count(1)
+
+
+def raw_each(messages: list[FlMidiMsg]) -> list[int | bytes]:
+    return [eventToRawData(msg) for msg in messages]
+
+
+def main():
+    check()
+    print("Batch checks OK")
+
+    rng = random.Random(0)
+    messages = [
+        FlMidiMsg(
+            rng.choice((0x80, 0x90, 0xB0)) | rng.randrange(16),
+            rng.randrange(128),
+            rng.randrange(128),
+        )
+        for _ in range(MESSAGES)
+    ]
+    batch = FlMidiMsgBatch.fromMessages(messages)
+    assert note_ons_batch(batch) == note_ons_each(messages)
+    assert list(batch.toRawData()) == raw_each(messages)
+
+    report(
+        f"Note ons, each FlMidiMsg ({MESSAGES} messages)",
+        time_per_call(partial(note_ons_each, messages), COUNT),
+    )
+    report(
+        f"Note ons, batch mask ({MESSAGES} messages)",
+        time_per_call(partial(note_ons_batch, batch), COUNT),
+    )
+    report(
+        f"Raw data, each FlMidiMsg ({MESSAGES} messages)",
+        time_per_call(partial(raw_each, messages), COUNT),
+    )
+    report(
+        f"Raw data, batch ({MESSAGES} messages)",
+        time_per_call(batch.toRawData, COUNT),
+    )
+
+
+if __name__ == "__main__":
+    main()
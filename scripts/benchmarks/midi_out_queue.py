@@ -0,0 +1,74 @@
+"""
+# Scripts / Benchmarks / MIDI output queue
+
+Compare the messages sent by a script which refreshes 64 RGB pads and 16
+encoder rings on every `OnRefresh`, where only a few values change each time,
+with and without `fl_classes.MidiOutQueue`, and measure the time taken per
+refresh.
+"""
+from functools import partial
+
+from fl_classes import MidiOutQueue
+
+from . import report, time_per_call
+
+COUNT = 1_000
+REFRESHES = 1_000
+
+
+class Controller:
+    def __init__(self) -> None:
+        self.pads = [0] * 64
+        self.rings = [0] * 16
+        self.tick = 0
+
+    def update(self) -> None:
+        # A couple of values change between refreshes
+        self.tick += 1
+        self.pads[self.tick % 64] = self.tick % 128
+        self.rings[self.tick % 16] = self.tick * 7 % 128
+
+    def refresh_direct(self, send: list[int]) -> None:
+        for pad, color in enumerate(self.pads):
+            send.append(0x90 | pad << 8 | color << 16)
+        for ring, value in enumerate(self.rings):
+            send.append(0xB0 | (16 + ring) << 8 | value << 16)
+
+    def refresh_queued(self, out: MidiOutQueue) -> None:
+        for pad, color in enumerate(self.pads):
+            out.send(0x90, pad, color)
+        for ring, value in enumerate(self.rings):
+            out.send(0xB0, 16 + ring, value)
+        out.flush()
+
+
+def main():
+    controller = Controller()
+    direct: list[int] = []
+    queued: list[int] = []
+    out = MidiOutQueue(queued.append)
+    for _ in range(REFRESHES):
+        controller.update()
+        controller.refresh_direct(direct)
+        controller.refresh_queued(out)
+
+    # The device ends up in the same state
+    def final_state(messages: list[int]) -> dict[int, int]:
+        return {message & 0xFFFF: message for message in messages}
+
+    assert final_state(direct) == final_state(queued)
+    stats = out.stats
+    assert stats.messagesSent == len(queued)
+    print(f"Messages sent directly: {len(direct)}")
+    print(f"Messages sent by queue: {stats.messagesSent}")
+    print(f"Bytes saved:            {stats.bytesSaved}")
+    print()
+
+    report("Refresh 80 controls directly", time_per_call(
+        partial(controller.refresh_direct, []), COUNT))
+    report("Refresh 80 controls with MidiOutQueue", time_per_call(
+        partial(controller.refresh_queued, out), COUNT))
+
+
+if __name__ == "__main__":
+    main()
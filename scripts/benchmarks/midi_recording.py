@@ -0,0 +1,124 @@
+"""
+# Scripts / Benchmarks / MIDI recording
+
+Record an hour of a session (a CC message every 10 ms, with a sysex message
+every second) using `fl_sim.MidiRecorder`, then measure how quickly it can
+be read back and replayed by `fl_sim.MidiReplayer`. Before that, check that
+replayed messages are received as MIDI input, and that missing sysex data is
+reported.
+"""
+import os
+import tempfile
+import time
+
+import midi
+from fl_classes import FlMidiMsg
+from fl_sim import EventLoop, MidiRecorder, MidiReplayer
+
+SECOND = 1_000_000
+HOUR = 3600 * SECOND
+
+SYSEX = bytes([0xF0, 0x00, 0x20, 0x29, 0x02, 0x0D, 0x03, 0x00, 0x7F, 0xF7])
+
+
+class Script:
+    def __init__(self) -> None:
+        self.received: list[int] = []
+
+    def OnMidiIn(self, msg: FlMidiMsg) -> None:
+        self.received.append(msg.status)
+
+
+def check(directory: str) -> None:
+    path = os.path.join(directory, 'check.bin')
+    with MidiRecorder(object(), path) as recorder:
+        recorder.record(FlMidiMsg(0xB0, 7, 100), time=1_000)
+        recorder.record(FlMidiMsg(SYSEX), time=2_000)
+
+    # Replayed messages are received after actions at the same time, like
+    # other MIDI input
+    script = Script()
+    received_before_action: list[int] = []
+    loop = EventLoop(script)
+    loop.start()
+    with MidiReplayer(path) as replayer:
+        replayer.schedule(loop)
+        loop.schedule(
+            1_000,
+            lambda: received_before_action.append(len(script.received)),
+        )
+        loop.runUntil(replayer.duration)
+    loop.stop()
+    assert received_before_action == [0]
+    assert script.received == [0xB0, 0xF0]
+
+    # A missing or truncated heap is reported rather than giving empty sysex
+    for heap_size in (0, len(SYSEX) - 1):
+        with open(path + '.sysex', 'r+b') as heap:
+            heap.truncate(heap_size)
+        with MidiReplayer(path) as replayer:
+            assert replayer[0].status == 0xB0
+            try:
+                replayer[1]
+            except ValueError:
+                pass
+            else:
+                raise AssertionError("Missing sysex data wasn't reported")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        check(directory)
+        path = os.path.join(directory, 'session.bin')
+
+        script = Script()
+        with MidiRecorder(script, path, clock=lambda: loop.now) as recorder:
+            loop = EventLoop(recorder)
+            loop.start()
+            loop.scheduleMidiMany(
+                (t, midi.MIDI_CONTROLCHANGE, 7, t // 10_000 % 128)
+                for t in range(0, HOUR, 10_000)
+            )
+            for t in range(5_000, HOUR, SECOND):
+                loop.scheduleSysex(t, SYSEX)
+            start = time.perf_counter()
+            loop.runFor(HOUR)
+            elapsed = time.perf_counter() - start
+            loop.stop()
+        size = os.path.getsize(path) + os.path.getsize(path + '.sysex')
+        print(
+            f"Recorded {recorder.count} messages ({size / 1e6:.1f} MB) in "
+            f"{elapsed:.2f} s"
+        )
+
+        with MidiReplayer(path) as replayer:
+            assert len(replayer) == recorder.count == len(script.received)
+            assert replayer[1].sysex == SYSEX
+            assert replayer.indexAt(HOUR // 2) == HOUR // 2 // 10_000 + 1800
+
+            start = time.perf_counter()
+            count = sum(1 for _ in replayer)
+            elapsed = time.perf_counter() - start
+            print(f"Read {count} records in {elapsed:.2f} s")
+
+            replayed = Script()
+            start = time.perf_counter()
+            replayer.replay(replayed)
+            elapsed = time.perf_counter() - start
+            assert replayed.received == script.received
+            print(f"Replayed {count} messages into OnMidiIn in {elapsed:.2f} s")
+
+            replayed = Script()
+            loop = EventLoop(replayed)
+            loop.start()
+            replayer.schedule(loop)
+            start = time.perf_counter()
+            loop.runUntil(replayer.duration)
+            elapsed = time.perf_counter() - start
+            loop.stop()
+            assert replayed.received == script.received
+            print(f"Replayed 1 hour through EventLoop in {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+# Scripts / Benchmarks / Mixer sim
+
+Measure the time taken for a script to refresh its view of every mixer track
+when `fl_sim.MixerSim` is installed, and the time taken to change a track's
+volume, including the `OnDirtyMixerTrack` notification.
+"""
+import math
+from functools import partial
+
+import midi
+import mixer
+from fl_sim import MixerSim, ScriptNotifier
+
+from . import report, time_per_call
+
+COUNT = 1_000
+
+
+class Script:
+    """
+    A script that caches the state of every mixer track, like a control
+    surface with a fader and display per track.
+    """
+
+    def __init__(self) -> None:
+        self.dirty: set[int] = set()
+        self.refreshes = 0
+        self.tracks: list[tuple[str, float, float, bool, bool, float]] = []
+
+    def OnDirtyMixerTrack(self, index: int) -> None:
+        self.dirty.add(index)
+
+    def OnRefresh(self, flags: int) -> None:
+        self.refreshes += 1
+        if flags & (
+            midi.HW_Dirty_Mixer_Controls | midi.HW_Dirty_Mixer_Display
+        ):
+            self.full_refresh()
+        self.dirty.clear()
+
+    def full_refresh(self) -> None:
+        self.tracks = [
+            (
+                mixer.getTrackName(i),
+                mixer.getTrackVolume(i),
+                mixer.getTrackPan(i),
+                mixer.isTrackMuted(i),
+                mixer.isTrackSolo(i),
+                mixer.getTrackPeaks(i, 2),
+            )
+            for i in range(mixer.trackCount())
+        ]
+
+
+def set_volume(notifier: ScriptNotifier, value: float) -> None:
+    mixer.setTrackVolume(1, value)
+    mixer.setTrackVolume(1, 1.0 - value)
+    notifier.flush()
+
+
+def main():
+    script = Script()
+    notifier = ScriptNotifier(script)
+    with MixerSim(notifier) as sim:
+        mixer.setTrackVolume(5, 0.25)
+        mixer.muteTrack(6)
+        assert script.dirty == {5, 6}
+        assert notifier.flush() == midi.HW_Dirty_Mixer_Controls
+        assert script.tracks[5][1] == 0.25 and script.tracks[6][3]
+
+        # Volumes in decibels follow the fader, where the default is 0 dB
+        for volume, db in ((0.8, 0.0), (1.0, 5.6), (0.0, -math.inf)):
+            mixer.setTrackVolume(2, volume)
+            assert mixer.getTrackVolume(2, 1) == db
+        mixer.setTrackVolume(2, 0.5)
+        assert mixer.getTrackVolume(2, 1) < 0.0
+        mixer.setTrackStereoSep(2, pan=0.5)
+        assert mixer.getTrackStereoSep(2) == 0.5
+
+        # Slots past the last one don't reach the next track's slots
+        mixer.setSlotColor(2, 9, 0x123456)
+        assert mixer.getSlotColor(2, 9) == 0x123456
+        for slot in (-1, 10):
+            try:
+                mixer.setSlotColor(2, slot, 0x654321)
+            except IndexError:
+                pass
+            else:
+                raise AssertionError(f"Slot {slot} wasn't rejected")
+        assert mixer.getSlotColor(3, 0) == 0
+
+        report(
+            f"Full refresh ({sim.trackCount()} tracks)",
+            time_per_call(script.full_refresh, COUNT),
+        )
+        report(
+            "Set volume twice, then OnRefresh",
+            time_per_call(partial(set_volume, notifier, 0.3), COUNT),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+# Scripts / Benchmarks / Note names
+
+Check that `utils.NoteNameTable`, `utils.GetNoteNames` and
+`utils.ParseNoteName` agree with `utils.GetNoteName`, then compare the time
+taken to name notes by calling `utils.GetNoteName` against looking them up
+in a table, and to name a whole piano roll.
+"""
+from functools import partial
+
+import utils
+
+from . import report, time_per_call
+
+COUNT = 100_000
+NOTES = range(128)
+
+
+def check() -> None:
+    assert utils.NoteNameTable() == tuple(map(utils.GetNoteName, NOTES))
+    assert utils.NoteNameTable() is utils.NoteNameTable()
+    assert utils.NoteNameTable(-2)[60] == 'C3'
+    assert utils.NoteNameTable(-2)[0] == 'C-2'
+
+    wide = range(-1200, 1200)
+    assert utils.GetNoteNames(wide) == list(map(utils.GetNoteName, wide))
+    for n in wide:
+        assert utils.ParseNoteName(utils.GetNoteName(n)) == n
+    for offset in (-2, -1, 1):
+        names = utils.GetNoteNames(wide, offset)
+        assert [utils.ParseNoteName(name, offset) for name in names] == list(
+            wide)
+
+    assert utils.ParseNoteName('C#5') == 61
+    assert utils.ParseNoteName('Db5') == 61
+    assert utils.ParseNoteName(' c#5 ') == 61
+    assert utils.ParseNoteName('B-1') == -1
+    assert utils.ParseNoteName('C#4', -1) == 61
+    for invalid in ('', 'H4', 'C#', '5', 'C#4.5'):
+        try:
+            utils.ParseNoteName(invalid)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"Parsed invalid name {invalid!r}")
+
+
+def lookup(table: tuple[str, ...], note: int) -> str:
+    return table[note]
+
+
+def name_row() -> list[str]:
+    return [utils.GetNoteName(n) for n in NOTES]
+
+
+def main():
+    check()
+    print("Note name tables and parser match GetNoteName")
+
+    table = utils.NoteNameTable()
+    report(
+        "GetNoteName per event",
+        time_per_call(partial(utils.GetNoteName, 61), COUNT),
+    )
+    report(
+        "NoteNameTable lookup per event",
+        time_per_call(partial(lookup, table, 61), COUNT),
+    )
+    report(
+        "ParseNoteName (table hit)",
+        time_per_call(partial(utils.ParseNoteName, 'C#5'), COUNT),
+    )
+    report(
+        "ParseNoteName (parsed)",
+        time_per_call(partial(utils.ParseNoteName, 'Db5'), COUNT),
+    )
+    report("GetNoteName loop (128 notes)", time_per_call(name_row, 1000))
+    report(
+        "GetNoteNames (128 notes)",
+        time_per_call(partial(utils.GetNoteNames, NOTES), 1000),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+# Scripts / Benchmarks / Palette
+
+Check that `fl_classes.PaletteQuantizer` finds the same palette colors as a
+linear search using `utils.ColorToRGB`, then compare the time taken to map
+the colors of a 512-pad grid to a 128-color palette each way.
+"""
+import random
+from functools import partial
+
+import utils
+from fl_classes import PaletteCacheInfo, PaletteQuantizer
+
+from . import report, time_per_call
+
+PADS = 512
+COUNT = 20
+
+
+def make_palette() -> list[int]:
+    """
+    A 128-color palette similar to those of many pad controllers: a grey
+    ramp, followed by hues at several brightness levels.
+    """
+    palette = [utils.RGBToColor(v, v, v) for v in range(0, 256, 32)]
+    for brightness in (1.0, 0.75, 0.5, 0.25, 0.1):
+        for saturation in (1.0, 0.5, 0.25):
+            for hue in range(0, 360, 45):
+                r, g, b = utils.HSVtoRGB(hue, saturation, brightness)
+                palette.append(utils.RGBToColor(
+                    round(r * 255), round(g * 255), round(b * 255)))
+    return palette
+
+
+def linear_search(palette: list[int], color: int) -> int:
+    r, g, b = utils.ColorToRGB(color)
+    best = 0
+    best_distance = 3 * 256 * 256
+    for i, entry in enumerate(palette):
+        pr, pg, pb = utils.ColorToRGB(entry)
+        distance = (pr - r) ** 2 + (pg - g) ** 2 + (pb - b) ** 2
+        if distance < best_distance:
+            best = i
+            best_distance = distance
+    return best
+
+
+def check(palette: list[int]) -> None:
+    rng = random.Random(0)
+    quantizer = PaletteQuantizer(palette, cacheSize=0)
+    colors = [rng.randrange(0x1000000) for _ in range(20_000)]
+    colors += palette + [0x000000, 0xFFFFFF, 0xFF123456]
+    for color in colors:
+        assert quantizer.nearest(color) == linear_search(palette, color)
+
+    # Ties go to the lowest index
+    duplicates = PaletteQuantizer([0x00FF00, 0xFF0000, 0x0000FF, 0xFF0000])
+    assert duplicates.nearest(0xF00000) == 1
+
+    # Sparse palettes
+    sparse = PaletteQuantizer({5: 0xFF0000, 9: 0x00FF00, 100: 0x0000FF})
+    assert sparse.nearestMany([0xE01010, 0x10E010, 0x1010E0]) == [5, 9, 100]
+    assert len(sparse) == 3 and sparse.color(9) == 0x00FF00
+
+
+def main():
+    palette = make_palette()
+    assert len(palette) == 128
+    check(palette)
+    print("Palette search matches linear search")
+
+    rng = random.Random(1)
+    channel_colors = [rng.randrange(0x1000000) for _ in range(72)]
+    pads = [rng.choice(channel_colors) for _ in range(PADS)]
+
+    def linear() -> list[int]:
+        return [linear_search(palette, color) for color in pads]
+
+    def cold() -> list[int]:
+        quantizer.clearCache()
+        return quantizer.nearestMany(pads)
+
+    quantizer = PaletteQuantizer(palette)
+    assert quantizer.nearestMany(pads) == linear()
+
+    report(f"Linear search ({PADS} pads)", time_per_call(linear, COUNT))
+    report(f"PaletteQuantizer, cold cache ({PADS} pads)",
+           time_per_call(cold, COUNT))
+    report(
+        f"PaletteQuantizer, warm cache ({PADS} pads)",
+        time_per_call(partial(quantizer.nearestMany, pads), COUNT),
+    )
+    report(
+        "PaletteQuantizer construction",
+        time_per_call(partial(PaletteQuantizer, palette), COUNT),
+    )
+    info = quantizer.cacheInfo()
+    assert isinstance(info, PaletteCacheInfo) and info.maxsize == 4096
+    print(f"Cache: {info.currsize} colors, {info.hits} hits, "
+          f"{info.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
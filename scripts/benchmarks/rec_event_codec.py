@@ -0,0 +1,191 @@
+"""
+# Scripts / Benchmarks / Rec event codec
+
+Check that `midi.EncodeRecEventID` and `midi.DecodeRecEventID` round-trip
+every kind of Rec event, and that the batch functions
+`midi.EncodeRecEventIDs` and `midi.DecodeRecEventIDs` agree with them, then
+compare the time taken and memory used to decode the event IDs of a bank of
+controls each way.
+"""
+import random
+import sys
+from collections.abc import Callable
+from functools import partial
+
+import midi
+
+from . import report, time_per_call
+
+COUNT = 1_000
+CONTROLS = 512
+
+EFFECT_TRACKS = range(128)
+EFFECT_SLOTS = range(64)
+
+
+def random_effect_param(rng: random.Random) -> int:
+    """
+    A general effect slot property, which isn't a mixer track property.
+    """
+    while True:
+        param = midi.REC_Plug_First + rng.randrange(midi.REC_PluginBase)
+        if not midi.REC_Mixer_First <= param <= midi.REC_Mixer_Last:
+            return param
+
+
+GENERATORS: dict[
+    int, Callable[[random.Random], tuple[int, int, int, int]]
+] = {
+    midi.RecKind_Channel: lambda rng: (
+        midi.RecKind_Channel,
+        rng.randrange(midi.REC_MaxChan),
+        0,
+        rng.randrange(midi.REC_PluginBase),
+    ),
+    midi.RecKind_ChannelPlugin: lambda rng: (
+        midi.RecKind_ChannelPlugin,
+        rng.randrange(midi.REC_MaxChan),
+        0,
+        rng.randrange(midi.REC_PluginBase),
+    ),
+    midi.RecKind_Mixer: lambda rng: (
+        midi.RecKind_Mixer,
+        rng.choice(EFFECT_TRACKS),
+        rng.choice(EFFECT_SLOTS),
+        rng.randrange(midi.REC_Mixer_First, midi.REC_Mixer_Last + 1),
+    ),
+    midi.RecKind_Effect: lambda rng: (
+        midi.RecKind_Effect,
+        rng.choice(EFFECT_TRACKS),
+        rng.choice(EFFECT_SLOTS),
+        random_effect_param(rng),
+    ),
+    midi.RecKind_EffectPlugin: lambda rng: (
+        midi.RecKind_EffectPlugin,
+        rng.choice(EFFECT_TRACKS),
+        rng.choice(EFFECT_SLOTS),
+        rng.randrange(midi.REC_PluginBase),
+    ),
+    midi.RecKind_Global: lambda rng: (
+        midi.RecKind_Global,
+        0,
+        0,
+        rng.randrange(midi.REC_Global_First, midi.REC_Global_Last + 1),
+    ),
+    midi.RecKind_Pattern: lambda rng: (
+        midi.RecKind_Pattern,
+        rng.randrange(0x1000),
+        0,
+        rng.randrange(midi.REC_ItemRange),
+    ),
+    midi.RecKind_PlaylistTrack: lambda rng: (
+        midi.RecKind_PlaylistTrack,
+        rng.randrange(midi.REC_MaxChan),
+        0,
+        rng.randrange(midi.REC_ItemRange),
+    ),
+    midi.RecKind_Other: lambda rng: (
+        midi.RecKind_Other,
+        0,
+        0,
+        rng.choice([
+            rng.randrange(-0x10000, 0),
+            rng.randrange(midi.REC_PLTrack_Last + 1, 0x7FFFFFFF),
+        ]),
+    ),
+}
+
+
+def check() -> None:
+    kinds = {
+        getattr(midi, name)
+        for name in midi.__all__
+        if name.startswith('RecKind_')
+    }
+    assert kinds == set(GENERATORS), "A RecKind has no generator"
+
+    rng = random.Random(0)
+    components = [
+        GENERATORS[kind](rng)
+        for kind in sorted(GENERATORS)
+        for _ in range(2_000)
+    ]
+    for fields in components:
+        event_id = midi.EncodeRecEventID(*fields)
+        assert midi.DecodeRecEventID(event_id) == fields, (fields, event_id)
+
+    # The batch functions give the same results as the scalar functions
+    columns = list(zip(*components, strict=True))
+    event_ids = midi.EncodeRecEventIDs(*columns)
+    assert list(event_ids) == [
+        midi.EncodeRecEventID(*fields) for fields in components]
+    decoded = midi.DecodeRecEventIDs(event_ids)
+    assert [list(column) for column in decoded] == [
+        list(column) for column in columns]
+    assert [list(column) for column in midi.DecodeRecEventIDs([])] == [
+        [], [], [], []]
+
+    # Known event IDs
+    assert midi.EncodeRecEventID(
+        midi.RecKind_Mixer, 0, 0, midi.REC_Mixer_Vol) == midi.REC_Mixer_Vol
+    assert midi.DecodeRecEventID(midi.REC_Tempo) == (
+        midi.RecKind_Global, 0, 0, midi.REC_Tempo)
+    assert midi.DecodeRecEventID(midi.REC_Chan_Vol + 5 * midi.REC_ItemRange) \
+        == (midi.RecKind_Channel, 5, 0, midi.REC_Chan_Vol)
+
+
+def decode_each(event_ids: list[int]) -> list[midi.RecEventInfo]:
+    decode = midi.DecodeRecEventID
+    return [decode(event_id) for event_id in event_ids]
+
+
+def size_of_info(info: midi.RecEventInfo) -> int:
+    """
+    Size of a `RecEventInfo` including its values. Small ints are shared, so
+    only count values outside the cached range.
+    """
+    return sys.getsizeof(info) + sum(
+        sys.getsizeof(value) for value in info if not -5 <= value <= 256)
+
+
+def main():
+    check()
+    print("Round trip OK")
+
+    rng = random.Random(1)
+    components = [
+        GENERATORS[rng.choice(list(GENERATORS))](rng)
+        for _ in range(CONTROLS)
+    ]
+    event_ids = [midi.EncodeRecEventID(*fields) for fields in components]
+
+    # The batch functions trade a little time for much more compact results
+    infos = decode_each(event_ids)
+    print(f"Memory, list of RecEventInfo: "
+          f"{sys.getsizeof(infos) + sum(map(size_of_info, infos))} bytes")
+    print(f"Memory, DecodeRecEventIDs: "
+          f"{sum(map(sys.getsizeof, midi.DecodeRecEventIDs(event_ids)))} "
+          "bytes")
+
+    report(
+        f"DecodeRecEventID ({CONTROLS} controls)",
+        time_per_call(partial(decode_each, event_ids), COUNT),
+    )
+    report(
+        f"DecodeRecEventIDs ({CONTROLS} controls)",
+        time_per_call(partial(midi.DecodeRecEventIDs, event_ids), COUNT),
+    )
+    report(
+        f"EncodeRecEventIDs ({CONTROLS} controls)",
+        time_per_call(
+            partial(
+                midi.EncodeRecEventIDs,
+                *zip(*components, strict=True),
+            ),
+            COUNT,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+# Scripts / Benchmarks / Rectangle index
+
+Check that `utils.TRectIndex` finds the same rectangles as checking every
+rectangle using `utils.RectOverlap` and `utils.RectOverlapEqual`, then
+compare the time taken to find the widgets overlapping each widget of a
+crowded screen layout each way.
+"""
+import random
+
+import utils
+
+from . import report, time_per_call
+
+WIDGETS = 1000
+COUNT = 3
+
+
+def make_rects(rng: random.Random, count: int) -> list[utils.TRect]:
+    rects = []
+    for _ in range(count):
+        left = rng.randrange(0, 2000)
+        top = rng.randrange(0, 1000)
+        rects.append(utils.TRect(
+            left, top, left + rng.randrange(0, 80), top + rng.randrange(0, 40)
+        ))
+    return rects
+
+
+def check(rng: random.Random) -> None:
+    rect = utils.TRect(0, 0, 10, 10)
+    assert not hasattr(rect, '__dict__')
+
+    rects = make_rects(rng, WIDGETS)
+    index = utils.TRectIndex(CellSize=50)
+    for r in rects:
+        index.Insert(r)
+    assert len(index) == WIDGETS
+
+    # Move and remove some rectangles
+    for r in rects[:100]:
+        utils.OffsetRect(r, rng.randrange(-100, 100), rng.randrange(-100, 100))
+        index.Update(r)
+    for r in rects[100:200]:
+        index.Remove(r)
+        assert r not in index
+    rects = rects[:100] + rects[200:]
+
+    for query in make_rects(rng, 500) + rects[:50]:
+        assert set(index.Overlap(query)) == {
+            r for r in rects if utils.RectOverlap(r, query)}
+        assert set(index.OverlapEqual(query)) == {
+            r for r in rects if utils.RectOverlapEqual(r, query)}
+
+    index.Clear()
+    assert len(index) == 0 and index.Overlap(rect) == []
+
+
+def main():
+    rng = random.Random(0)
+    check(rng)
+    print("Index queries match pairwise checks")
+
+    rects = make_rects(rng, WIDGETS)
+    index = utils.TRectIndex(CellSize=64)
+    for r in rects:
+        index.Insert(r)
+
+    def pairwise() -> int:
+        return sum(
+            utils.RectOverlap(a, b) for a in rects for b in rects
+        )
+
+    def indexed() -> int:
+        return sum(len(index.Overlap(a)) for a in rects)
+
+    assert pairwise() == indexed()
+    report(
+        f"Pairwise overlap checks ({WIDGETS} rects)",
+        time_per_call(pairwise, COUNT),
+    )
+    report(
+        f"TRectIndex overlap queries ({WIDGETS} rects)",
+        time_per_call(indexed, COUNT),
+    )
+
+
+if __name__ == "__main__":
+    main()
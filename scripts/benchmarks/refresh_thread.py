@@ -0,0 +1,134 @@
+"""
+# Scripts / Benchmarks / Refresh thread
+
+Check that `fl_sim.RefreshThreadSim` only records the refresh thread's lock
+waits from the thread, and that a script replacing the thread from within a
+refresh leaves only one thread running. Then measure how long `OnMidiIn` has
+to wait for the lock while the refresh thread
+simulated by `fl_sim.RefreshThreadSim` redraws all 127 mixer tracks, for a
+controller sending CC messages as fast as possible, compared to delivering
+the same messages without a refresh thread.
+"""
+import threading
+import time
+
+import device
+import midi
+import mixer
+from fl_classes import FlMidiMsg
+from fl_sim import MixerSim, RefreshThreadSim, ScriptNotifier
+
+MESSAGES = 20_000
+
+
+class Script:
+    def __init__(self) -> None:
+        self.volumes = [0.0] * 128
+        self.refreshes = 0
+
+    def OnMidiIn(self, msg: FlMidiMsg) -> None:
+        mixer.setTrackVolume(msg.data1, msg.data2 / 127)
+        msg.handled = True
+
+    def OnRefresh(self, flags: int) -> None:
+        self.refreshes += 1
+        for i in range(mixer.trackCount()):
+            self.volumes[i % 128] = mixer.getTrackVolume(i)
+
+
+class RestartingScript:
+    """
+    A script that replaces the refresh thread during its first refresh.
+    """
+
+    def __init__(self) -> None:
+        self.refreshes = 0
+
+    def OnRefresh(self, flags: int) -> None:
+        self.refreshes += 1
+        if self.refreshes == 1:
+            device.destroyRefreshThread()
+            device.createRefreshThread()
+
+
+def refresh_threads() -> int:
+    return sum(
+        thread.name == 'RefreshThreadSim' for thread in threading.enumerate())
+
+
+def check() -> None:
+    # Refreshes on the caller's thread aren't waits of the refresh thread
+    notifier = ScriptNotifier(RestartingScript())
+    with RefreshThreadSim(notifier) as refresh:
+        device.fullRefresh()
+        assert refresh.refreshes == 1 and refresh.threadWaits.count == 0
+        device.destroyRefreshThread()
+
+    script = RestartingScript()
+    notifier = ScriptNotifier(script)
+    with RefreshThreadSim(notifier, interval=0.005) as refresh:
+        device.createRefreshThread()
+        device.fullRefresh()
+        deadline = time.monotonic() + 5.0
+        while script.refreshes < 1 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert script.refreshes == 1, "The thread didn't refresh"
+        # Give the replaced thread time to stop
+        time.sleep(0.05)
+        assert refresh.running and refresh_threads() == 1
+        assert not refresh.errors
+    assert refresh_threads() == 0
+
+
+def run(threaded: bool) -> RefreshThreadSim:
+    script = Script()
+    notifier = ScriptNotifier(script)
+    with (
+        MixerSim(notifier),
+        RefreshThreadSim(notifier, interval=0.005) as refresh,
+    ):
+        if threaded:
+            device.createRefreshThread()
+        start = time.perf_counter()
+        for i in range(MESSAGES):
+            msg = FlMidiMsg(midi.MIDI_CONTROLCHANGE, i % 100, i % 128)
+            with refresh.locked():
+                script.OnMidiIn(msg)
+            if not threaded and i % 100 == 0:
+                with refresh.locked():
+                    notifier.flush()
+        elapsed = time.perf_counter() - start
+        device.fullRefresh()
+        if threaded:
+            # Let the full refresh happen
+            time.sleep(0.05)
+            device.destroyRefreshThread()
+    assert not refresh.errors
+    name = "With refresh thread" if threaded else "Without refresh thread"
+    waits = refresh.lockWaits
+    print(
+        f"{name:<24} {MESSAGES / elapsed:>9.0f} msg/s, "
+        f"lock wait p50 {waits.percentile(50):>7} ns, "
+        f"p99 {waits.percentile(99):>9} ns, "
+        f"max {waits.max:>9} ns, "
+        f"{script.refreshes} refreshes"
+    )
+    return refresh
+
+
+def main():
+    check()
+    print("Refresh thread checks OK")
+
+    run(False)
+    refresh = run(True)
+    assert refresh.refreshes > 0
+    durations = refresh.refreshDurations
+    print(
+        f"Refresh duration p50 {durations.percentile(50)} ns, "
+        f"p99 {durations.percentile(99)} ns"
+    )
+
+
+if __name__ == "__main__":
+    main()
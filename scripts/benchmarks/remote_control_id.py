@@ -0,0 +1,84 @@
+"""
+# Scripts / Benchmarks / Remote control ID
+
+Check that `midi.DecodeRemoteControlID` and `midi.BuildRemoteControlIDTable`
+agree with `midi.EncodeRemoteControlID` for every port, channel and CC
+number, then compare the time taken to find the `controlId` of an event by
+calling `midi.EncodeRemoteControlID` against looking it up in a table.
+"""
+import random
+from collections.abc import Sequence
+from functools import partial
+
+import midi
+
+from . import report, time_per_call
+
+COUNT = 100_000
+
+PORTS = range(256)
+CHANNELS = range(16)
+CCS = range(128)
+
+
+def check_round_trip() -> None:
+    """
+    Check that encoding and decoding are inverses for all valid inputs, and
+    that the lookup tables match the encoder.
+    """
+    for port in PORTS:
+        table = midi.BuildRemoteControlIDTable(port)
+        assert len(table) == len(CHANNELS) * len(CCS)
+        for chan in CHANNELS:
+            for cc in CCS:
+                control_id = midi.EncodeRemoteControlID(port, chan, cc)
+                assert table[(chan << 7) | cc] == control_id
+                assert midi.DecodeRemoteControlID(control_id) == (
+                    port, chan, cc)
+
+    # Larger CC numbers and channels are also representable
+    rng = random.Random(0)
+    for _ in range(COUNT):
+        fields = (
+            rng.randrange(-1, 512),
+            rng.randrange(64),
+            rng.randrange(0x10000),
+        )
+        assert midi.DecodeRemoteControlID(
+            midi.EncodeRemoteControlID(*fields)) == fields
+
+
+def encode(port: int, status: int, data1: int) -> int:
+    return midi.EncodeRemoteControlID(port, status & 0xF, data1)
+
+
+def lookup(table: Sequence[int], status: int, data1: int) -> int:
+    return table[((status & 0xF) << 7) | data1]
+
+
+def main():
+    check_round_trip()
+    print("Round trip OK")
+
+    port = 3
+    status = midi.MIDI_CONTROLCHANGE | 9
+    data1 = 0x40
+    table = midi.BuildRemoteControlIDTable(port)
+    assert encode(port, status, data1) == lookup(table, status, data1)
+
+    report(
+        "EncodeRemoteControlID per event",
+        time_per_call(partial(encode, port, status, data1), COUNT),
+    )
+    report(
+        "BuildRemoteControlIDTable lookup per event",
+        time_per_call(partial(lookup, table, status, data1), COUNT),
+    )
+    report(
+        "BuildRemoteControlIDTable (one port)",
+        time_per_call(partial(midi.BuildRemoteControlIDTable, port), 1_000),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+# Scripts / Benchmarks / Router
+
+Compare the time taken to route messages using `fl_classes.FlMidiMsgRouter`
+against an equivalent chain of `if` statements, for a device with 64 knobs
+and 16 pads.
+"""
+from functools import partial
+
+import midi
+from fl_classes import FlMidiMsg, FlMidiMsgRouter
+
+from . import report, time_per_call
+
+COUNT = 100_000
+
+KNOBS = range(0x10, 0x50)
+PADS = range(0x24, 0x34)
+
+handled: list[int] = []
+
+
+def on_knob(msg: FlMidiMsg) -> None:
+    handled.append(msg.data1)
+
+
+def on_pad(msg: FlMidiMsg) -> None:
+    handled.append(msg.data1)
+
+
+def if_chain(msg: FlMidiMsg) -> bool:
+    """
+    The `if` chain that a script would typically use to handle the device.
+    """
+    for cc in KNOBS:
+        if (
+            msg.status & 0xF0 == midi.MIDI_CONTROLCHANGE
+            and msg.data1 == cc
+        ):
+            on_knob(msg)
+            return True
+    for note in PADS:
+        if msg.status == midi.MIDI_NOTEON | 9 and msg.data1 == note:
+            on_pad(msg)
+            return True
+    return False
+
+
+def main():
+    router = FlMidiMsgRouter()
+    for cc in KNOBS:
+        router.register(on_knob, midi.MIDI_CONTROLCHANGE, data1=cc)
+    for note in PADS:
+        router.register(on_pad, midi.MIDI_NOTEON, channel=9, data1=note)
+
+    first = FlMidiMsg(midi.MIDI_CONTROLCHANGE, KNOBS[0], 0x40)
+    last = FlMidiMsg(midi.MIDI_NOTEON | 9, PADS[-1], 0x40)
+    miss = FlMidiMsg(midi.MIDI_PITCHBEND, 0x00, 0x40)
+
+    for name, msg in [("first", first), ("last", last), ("unmatched", miss)]:
+        assert router.dispatch(msg) == if_chain(msg)
+        report(
+            f"if chain ({name} control)",
+            time_per_call(partial(if_chain, msg), COUNT),
+        )
+        report(
+            f"FlMidiMsgRouter ({name} control)",
+            time_per_call(partial(router.dispatch, msg), COUNT),
+        )
+        handled.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+# Scripts / Benchmarks / Sysex sender
+
+Send a screen bitmap every 100 ms (every fifth `OnIdle`) and a 16 KB patch
+dump through a device with a 256-byte output buffer, first by calling
+`device.midiOutSysex` directly, then through `fl_classes.SysexSender`, using
+`fl_sim.MidiLoopback` to count the messages that would have been lost. Also
+check that no tick of a `SysexSender` sends more than its burst size.
+"""
+from collections.abc import Callable
+
+import device
+from fl_classes import SysexSender
+from fl_sim import EventLoop, MidiLoopback
+
+SECOND = 1_000_000
+
+SCREEN_HEADER = bytes([0xF0, 0x00, 0x20, 0x29, 0x02, 0x0D, 0x0E])
+PATCH_HEADER = bytes([0xF0, 0x00, 0x20, 0x29, 0x02, 0x0D, 0x10])
+
+# A 128x64 1-bit screen, packed 7 bits per byte
+SCREEN = bytes(i % 128 for i in range(128 * 64 // 7 + 1))
+PATCH = bytes(i * 7 % 128 for i in range(16 * 1024))
+
+
+def check_burst() -> None:
+    now = 0
+    sent: list[bytes] = []
+    sender = SysexSender(
+        bytesPerSecond=3000,
+        burstSize=256,
+        send=sent.append,
+        clock=lambda: now,
+    )
+    # Three 100-byte packets don't fit in a 256-byte burst
+    packet = bytes([0xF0]) + bytes(98) + b'\xF7'
+    for _ in range(3):
+        sender.send(packet)
+    assert sender.tick() == 2
+    now += 10_000
+    assert sender.tick() == 0
+    now += 20_000
+    assert sender.tick() == 1
+
+    # A packet larger than the burst is only sent once the sender is idle
+    sender.send(bytes([0xF0]) + bytes(398) + b'\xF7')
+    now += 10_000
+    assert sender.tick() == 0
+    now += 1 * SECOND
+    assert sender.tick() == 1
+    assert [len(p) for p in sent] == [100, 100, 100, 400]
+
+
+class DirectScript:
+    def __init__(self, clock: Callable[[], int]) -> None:
+        self.ticks = 0
+
+    def OnInit(self) -> None:
+        device.midiOutSysex(PATCH_HEADER + PATCH + b'\xF7')
+
+    def OnIdle(self) -> None:
+        self.ticks += 1
+        if self.ticks % 5 == 0:
+            device.midiOutSysex(SCREEN_HEADER + SCREEN + b'\xF7')
+
+
+class PacedScript:
+    def __init__(self, clock: Callable[[], int]) -> None:
+        self.sender = SysexSender(
+            bytesPerSecond=3000,
+            packetSize=128,
+            # A full packet, plus the 60 bytes allowed between ticks, so
+            # that the full rate can be reached
+            burstSize=192,
+            maxQueuedBytes=32 * 1024,
+            clock=clock,
+        )
+        self.ticks = 0
+        self.skipped = 0
+        self.max_tick_bytes = 0
+
+    def OnInit(self) -> None:
+        self.sender.sendChunked(PATCH_HEADER, PATCH)
+
+    def OnIdle(self) -> None:
+        self.ticks += 1
+        if self.ticks % 5 == 0:
+            # Only draw the screen once the patch dump has mostly been sent
+            if self.sender.backpressure:
+                self.skipped += 1
+            else:
+                self.sender.sendChunked(SCREEN_HEADER, SCREEN)
+        before = self.sender.bytesSent
+        self.sender.tick()
+        self.max_tick_bytes = max(
+            self.max_tick_bytes, self.sender.bytesSent - before)
+
+
+def run(script_type: type, duration: int) -> tuple[object, MidiLoopback]:
+    def clock() -> int:
+        return loop.now
+
+    script = script_type(clock)
+    loop = EventLoop(script)
+    with MidiLoopback(clock, bufferSize=256) as loopback:
+        loop.start()
+        loop.runFor(duration)
+        loop.stop()
+    return script, loopback
+
+
+def main():
+    check_burst()
+    _, direct = run(DirectScript, 30 * SECOND)
+    paced, loopback = run(PacedScript, 30 * SECOND)
+    assert isinstance(paced, PacedScript)
+
+    for name, result in (("Direct", direct), ("SysexSender", loopback)):
+        print(
+            f"{name:<12} sent {len(result.messages):>5} packets, "
+            f"{result.bytesReceived:>7} bytes, "
+            f"peak {result.peakRate():>6} bytes/s, "
+            f"{result.dropped:>5} dropped"
+        )
+    print(f"SysexSender skipped {paced.skipped} screen redraws")
+    assert direct.dropped > 0
+    assert loopback.dropped == 0
+    assert loopback.peakRate() <= 3000 + 128
+    assert 0 < paced.max_tick_bytes <= 192
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+# Scripts / Benchmarks / Volume to dB
+
+Check that `utils.VolTodBTable` and `utils.dBToVol` are consistent with
+`utils.VolTodB`, and that `utils.dBToFader` is the inverse of
+`utils.FaderTodB`, then compare the time taken to convert a MIDI control value
+to decibels by calling `utils.VolTodB` against looking it up in a table.
+"""
+import math
+from functools import partial
+
+import utils
+
+from . import report, time_per_call
+
+COUNT = 100_000
+
+
+def check() -> None:
+    for steps in (128, 16384):
+        table = utils.VolTodBTable(steps)
+        assert len(table) == steps
+        assert utils.VolTodBTable(steps) is table
+        for i, db in enumerate(table):
+            assert db == utils.VolTodB(i / (steps - 1))
+
+    # Round trip at the 0.1 dB resolution of VolTodB
+    for tenths in range(1000):
+        db = -tenths / 10
+        assert utils.VolTodB(utils.dBToVol(db)) == db
+    assert utils.dBToVol(-math.inf) == 0.0
+    assert utils.dBToVol(6.0) == 1.0
+    # Unlike the mixer's faders, 0 dB is the top of the curve
+    assert utils.dBToVol(0.0) == 1.0
+    assert utils.VolTodB(0.8) == -4.7
+
+    # The mixer's faders put 0 dB at the default volume of 0.8
+    assert utils.FaderTodB(0.8) == 0.0
+    assert utils.FaderTodB(1.0) == 5.6
+    assert utils.FaderTodB(0.0) == -math.inf
+    for tenths in range(-900, 57):
+        db = tenths / 10
+        assert utils.FaderTodB(utils.dBToFader(db)) == db
+    assert utils.dBToFader(0.0) == 0.8
+    assert utils.dBToFader(6.0) == 1.0
+    assert utils.dBToFader(-math.inf) == 0.0
+
+
+def calculate(value: int) -> float:
+    return utils.VolTodB(value / 127)
+
+
+def lookup(table: tuple[float, ...], value: int) -> float:
+    return table[value]
+
+
+def main():
+    check()
+    print("Tables and inverses match VolTodB and FaderTodB")
+
+    table = utils.VolTodBTable()
+    report("VolTodB per event", time_per_call(partial(calculate, 100), COUNT))
+    report(
+        "VolTodBTable lookup per event",
+        time_per_call(partial(lookup, table, 100), COUNT),
+    )
+    report("dBToVol", time_per_call(partial(utils.dBToVol, -6.0), COUNT))
+
+
+if __name__ == "__main__":
+    main()
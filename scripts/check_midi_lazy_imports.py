@@ -0,0 +1,125 @@
+"""
+# Scripts / Check midi lazy imports
+
+Check that the three lists of names in the `midi` package agree with each
+other and with the submodules they come from:
+
+* The imports in the `if TYPE_CHECKING:` block, which are seen by type
+  checkers.
+
+* `__all__`, which is used by `from midi import *`.
+
+* `SUBMODULE_NAMES` in `midi/__submodule_names.py`, which is used to import
+  each name at runtime.
+"""
+import ast
+import importlib
+import sys
+from pathlib import Path
+
+INIT = Path('src/midi_controller_scripting/midi/__init__.py')
+NAMES_FILE = INIT.with_name('__submodule_names.py')
+
+
+def type_checking_imports(tree: ast.Module) -> dict[str, list[str]]:
+    """
+    Returns the names imported from each submodule within the
+    `if TYPE_CHECKING:` block.
+    """
+    imports: dict[str, list[str]] = {}
+    for node in tree.body:
+        if (
+            isinstance(node, ast.If)
+            and isinstance(node.test, ast.Name)
+            and node.test.id == 'TYPE_CHECKING'
+        ):
+            for stmt in node.body:
+                assert isinstance(stmt, ast.ImportFrom) and stmt.level == 1, \
+                    f"Unexpected statement on line {stmt.lineno}"
+                assert stmt.module is not None
+                imports.setdefault(stmt.module, []).extend(
+                    alias.name for alias in stmt.names)
+    return imports
+
+
+def assigned_value(path: Path, tree: ast.Module, name: str) -> object:
+    """
+    Returns the literal value assigned to `name` at the top level of the
+    module at `path`.
+    """
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, ast.AnnAssign):
+            targets = [node.target]
+        else:
+            continue
+        if any(isinstance(t, ast.Name) and t.id == name for t in targets):
+            assert node.value is not None
+            return ast.literal_eval(node.value)
+    raise LookupError(f"{name} is not assigned in {path}")
+
+
+def main() -> int:
+    tree = ast.parse(INIT.read_text())
+    imports = type_checking_imports(tree)
+    exported = assigned_value(INIT, tree, '__all__')
+    lazy = assigned_value(
+        NAMES_FILE,
+        ast.parse(NAMES_FILE.read_text()),
+        'SUBMODULE_NAMES',
+    )
+    assert isinstance(exported, list)
+    assert isinstance(lazy, dict)
+
+    errors: list[str] = []
+
+    if set(imports) != set(lazy):
+        errors.append(
+            "Submodules differ between TYPE_CHECKING imports and "
+            f"SUBMODULE_NAMES: {sorted(set(imports) ^ set(lazy))}"
+        )
+
+    for submodule in sorted(set(imports) & set(lazy)):
+        if set(imports[submodule]) != set(lazy[submodule]):
+            errors.append(
+                f"Names from {submodule} differ between TYPE_CHECKING "
+                "imports and SUBMODULE_NAMES: "
+                f"{sorted(set(imports[submodule]) ^ set(lazy[submodule]))}"
+            )
+
+    imported_names = [name for names in imports.values() for name in names]
+    lazy_names = [name for names in lazy.values() for name in names]
+    for description, names in (
+        ("TYPE_CHECKING imports", imported_names),
+        ("__all__", exported),
+        ("SUBMODULE_NAMES", lazy_names),
+    ):
+        duplicates = {name for name in names if names.count(name) > 1}
+        if duplicates:
+            errors.append(
+                f"Names repeated in {description}: {sorted(duplicates)}")
+
+    if set(exported) != set(lazy_names):
+        errors.append(
+            "Names differ between __all__ and SUBMODULE_NAMES: "
+            f"{sorted(set(exported) ^ set(lazy_names))}"
+        )
+
+    # Every name must actually exist in its submodule
+    sys.path.insert(0, str(INIT.parent.parent))
+    for submodule, names in lazy.items():
+        module = importlib.import_module(f'midi.{submodule}')
+        missing = [name for name in names if not hasattr(module, name)]
+        if missing:
+            errors.append(f"Names missing from {submodule}: {missing}")
+
+    for error in errors:
+        print(error)
+    if not errors:
+        print(f"All {len(lazy_names)} names in midi agree")
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
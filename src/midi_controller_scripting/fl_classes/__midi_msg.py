@@ -0,0 +1,743 @@
+"""
+FL Classes > MIDI message
+
+Definitions for the `FlMidiMsg` type passed to MIDI event callbacks, as well as
+helper functions for type narrowing.
+"""
+from operator import attrgetter
+from typing import Any, TypeGuard, overload
+
+_DEFAULT_PME_FLAGS = 0b101110
+"""
+Default PME flags for messages:
+`PME_System | PME_System_Safe | PME_PreviewNote | PME_FromMIDI`.
+"""
+
+_DATA1_UNSET = 1 << 24
+"""
+Bit within `FlMidiMsg`'s packed data, indicating that `data1` is unset (as is
+the case for sysex events).
+"""
+
+_DATA2_UNSET = 1 << 25
+"""
+Bit within `FlMidiMsg`'s packed data, indicating that `data2` is unset (as is
+the case for sysex events).
+"""
+
+_UNSET = _DATA1_UNSET | _DATA2_UNSET
+
+# Indexes of the rarely-changed properties of `FlMidiMsg` within its list of
+# extra values
+_TIMESTAMP = 0
+_PORT = 1
+_PITCH_BEND = 2
+_IS_INCREMENT = 3
+_RES = 4
+_IN_EV = 5
+_OUT_EV = 6
+_MIDI_ID = 7
+_MIDI_CHAN = 8
+_MIDI_CHAN_EX = 9
+
+_EXTRA_DEFAULTS = (0, 0, 1, False, 0.0, 0, 0, 0, 0, 0)
+"""
+Default values of the rarely-changed properties of `FlMidiMsg`, used until
+one of them is set.
+"""
+
+
+class FlMidiMsg:
+    """
+    Represents an incoming MIDI message.
+
+    ## Changing FL Studio's event handling
+
+    Properties of this object can be accessed, and some properties can be
+    modified, which will change how FL Studio processes the event.
+
+    For example, if we received a system-exclusive event
+    `FlMidiMsg([0xF0, 0x10, 0x20, 0x30, 0xF7])`, but wanted FL Studio to
+    process it as a mod wheel, we could adjust it as follows:
+
+    ```py
+    import midi
+
+    def change_msg(msg: FlMidiMsg):
+        velocity = msg.sysex[3]  # 0x30
+        msg.status = midi.MIDI_CONTROLCHANGE
+        msg.data1 = 0x01
+        msg.data2 = velocity
+    ```
+    """
+    # TODO: Tidy up and remove code that does stuff
+
+    # Status, data1 and data2 are stored in a single int (`__packed`), using
+    # the same little-endian layout as `eventToRawData`. Properties which
+    # are rarely changed share a single list (`__extra`), which is only
+    # created when one of them is set, so that creating large numbers of
+    # messages stays cheap.
+    __slots__ = (
+        '__packed',
+        '__sysex',
+        '__handled',
+        '__pme_flags',
+        '__extra',
+    )
+
+    @overload
+    def __init__(
+        self,
+        status_sysex: int,
+        data1: int,
+        data2: int,
+        pmeFlags: int = ...,
+    ) -> None:
+        ...
+
+    @overload
+    def __init__(
+        self,
+        status_sysex: 'list[int] | bytes',
+        *,
+        pmeFlags: int = ...,
+    ) -> None:
+        ...
+
+    def __init__(
+        self,
+        status_sysex: 'int | list[int] | bytes',
+        data1: int | None = None,
+        data2: int | None = None,
+        pmeFlags: int = _DEFAULT_PME_FLAGS,
+    ) -> None:
+        """
+        Create an `FlMidiMsg` object. Note that this constructor is
+        inaccessible at runtime.
+
+        ### Args:
+        * `status_sysex` (`int | list[int] | bytes`): status byte or sysex data
+
+        * `data1` (`Optional[int]`, optional): data1 byte if applicable.
+          Defaults to `None`.
+
+        * `data2` (`Optional[int]`, optional): data2 byte if applicable.
+          Defaults to `None`.
+
+        * `pmeFlags` (`int`, optional): PME flags of event. Defaults to
+          `PME_System | PME_System_Safe | PME_PreviewNote | PME_FromMIDI`.
+
+        ### Example Usage
+
+        ```py
+        # Create a note on event on middle C
+        msg = FlMidiMsg(0x90, 0x3C, 0x7F)
+
+        # Create a CC#10 event
+        msg = FlMidiMsg(0xB0, 0x0A, 0x00)
+
+        # Create a sysex event for a universal device enquiry
+        msg = FlMidiMsg([0xF0, 0x7E, 0x7F, 0x06, 0x01, 0xF7])
+        ```
+        """
+        if isinstance(status_sysex, int):
+            if data1 is None or data2 is None:
+                raise TypeError(
+                    f"{'data1' if data1 is None else 'data2'} value cannot "
+                    f"be None for standard events"
+                )
+            # OR-ing the values together gives a number with bits set above
+            # 0xFF if any are negative or above 0xFF
+            if (status_sysex | data1 | data2) & ~0xFF:
+                raise ValueError(
+                    "status, data1 and data2 must be in the range 0 - 0xFF")
+            self.__packed = status_sysex | data1 << 8 | data2 << 16
+            self.__sysex: bytes | None = None
+        else:
+            if data1 is not None:
+                raise TypeError(
+                    "data1 value must be None for sysex events")
+            if data2 is not None:
+                raise TypeError(
+                    "data2 value must be None for sysex events")
+            self.__sysex = bytes(status_sysex)
+            self.__packed = 0xF0 | _DATA1_UNSET | _DATA2_UNSET
+
+        self.__handled = False
+        self.__pme_flags = pmeFlags
+        self.__extra: list[Any] | None = None
+
+    def __repr__(self) -> str:
+        if self.__sysex is not None:
+            return f"FlMidiMsg([{', '.join(f'0x{b:02X}' for b in self.sysex)})"
+        else:
+            return (
+                f"FlMidiMsg("
+                f"0x{self.status:02X}, "
+                f"0x{self.data1:02X}, "
+                f"0x{self.data2:02X})"
+            )
+
+    def __eq__(self, other: object) -> bool:
+        packed = self.__packed
+        if isinstance(other, FlMidiMsg):
+            other_packed = other.__packed
+            if packed & 0xFF == 0xF0 or other_packed & 0xFF == 0xF0:
+                return (
+                    packed & 0xFF == other_packed & 0xFF
+                    and self.sysex == other.sysex
+                )
+            if (packed | other_packed) & _UNSET:
+                # Accessing the unset data raises an error
+                return (
+                    self.data1 == other.data1 and self.data2 == other.data2)
+            return packed == other_packed
+        elif isinstance(other, int):
+            if packed & 0xFF != 0xF0:
+                return eventToRawData(self) == other
+        elif isinstance(other, bytes) and packed & 0xFF == 0xF0:
+            return eventToRawData(self) == other
+        return False
+
+    def __get_data1(self, prop: str) -> int:
+        """Check that data1 is set, then return its value"""
+        packed = self.__packed
+        if packed & _DATA1_UNSET:
+            raise ValueError(
+                f"Attempt to access {prop} on sysex event. "
+                f"Are you type narrowing your events correctly?"
+            )
+        return (packed >> 8) & 0xFF
+
+    def __get_data2(self, prop: str) -> int:
+        """Check that data2 is set, then return its value"""
+        packed = self.__packed
+        if packed & _DATA2_UNSET:
+            raise ValueError(
+                f"Attempt to access {prop} on sysex event. "
+                f"Are you type narrowing your events correctly?"
+            )
+        return (packed >> 16) & 0xFF
+
+    def __set_data1(self, value: int, prop: str) -> None:
+        """Range check the value, then store it as data1"""
+        self.__packed = (
+            (self.__packed & ~(0xFF << 8 | _DATA1_UNSET))
+            | self.__range_check(value, prop) << 8
+        )
+
+    def __set_data2(self, value: int, prop: str) -> None:
+        """Range check the value, then store it as data2"""
+        self.__packed = (
+            (self.__packed & ~(0xFF << 16 | _DATA2_UNSET))
+            | self.__range_check(value, prop) << 16
+        )
+
+    def __extras(self) -> list[Any]:
+        """Return the list of extra values, creating it if needed"""
+        extra = self.__extra
+        if extra is None:
+            extra = self.__extra = list(_EXTRA_DEFAULTS)
+        return extra
+
+    def __set_origin(self, port: int, timestamp: int) -> None:
+        """Set the read-only port and timestamp, eg when loading a message
+        from a `FlMidiMsgBatch`"""
+        extra = self.__extras()
+        extra[_PORT] = port
+        extra[_TIMESTAMP] = timestamp
+
+    def __get_extra(self, index: int) -> Any:
+        """Return one of the extra values"""
+        extra = self.__extra
+        return _EXTRA_DEFAULTS[index] if extra is None else extra[index]
+
+    @staticmethod
+    def __range_check(value: int, prop: str) -> int:
+        """Check that the value is within the allowed range, then return it"""
+        if value < 0:
+            raise ValueError(f"Attempt to set {prop} to {value} (< 0)")
+        if value > 0x7F:
+            raise ValueError(f"Attempt to set {prop} to {value} (> 0x7F)")
+        return value
+
+    @property
+    def handled(self) -> bool:
+        """Whether the event is considered to be handled by FL Studio.
+
+        If this is set to `True`, the event will stop propagating after this
+        particular callback returns.
+
+        You script should set it when an event is processed successfully.
+        """
+        return self.__handled
+
+    @handled.setter
+    def handled(self, handled: bool) -> None:
+        self.__handled = handled
+
+    @property
+    def timestamp(self) -> int:
+        """The timestamp of the event
+
+        ### HELP WANTED:
+        * This seems to only ever be zero. I can't determine what it is for. If
+          you know how it is used, create a pull request with details.
+
+        This value is read-only.
+        """
+        return self.__get_extra(_TIMESTAMP)
+
+    @property
+    def status(self) -> int:
+        """The status byte of the event
+
+        This can be used to determine the type of MIDI event using the upper
+        nibble, and the channel of the event using the lower nibble.
+
+        ```py
+        e_type = event.status & 0xF0
+        channel = event.status & 0xF
+        ```
+
+        Note that for sysex messages, this property is `0xF0`. Other standard
+        event properties are inaccessible.
+
+        ## Event types
+        * `0x8` Note off (`data1` is note number, `data2` is release value)
+
+        * `0x9` Note on (`data1` is note number, `data2` is velocity)
+
+        * `0xA` Note after-touch (`data1` is note number, `data2` is pressure
+          value)
+
+        * `0xB` Control change (CC, `data1` is control number as per your
+          controller's documentation, `data2` is value)
+
+        * `0xC` Program change (used to assign instrument selection, `data1` is
+          instrument number)
+
+        * `0xD` Channel after-touch (`data1` is value, `data2` is unused)
+
+        * `0xE` Pitch bend (`data1` and `data2` are value, as per the formula
+          `data1 + (data2 << 7)`, yielding a range of `0` - `16384`)
+        """
+        return self.__packed & 0xFF
+
+    @status.setter
+    def status(self, status: int) -> None:
+        self.__packed = (
+            (self.__packed & ~0xFF) | self.__range_check(status, "status"))
+
+    @property
+    def data1(self) -> int:
+        """The first data byte of a MIDI message.
+
+        This is used to determine the control number for CC events, the note
+        number for note events, and various other values.
+
+        Note that this property is inaccessible for sysex events.
+        """
+        return self.__get_data1("data1")
+
+    @data1.setter
+    def data1(self, data1: int) -> None:
+        self.__set_data1(data1, "data1")
+
+    @property
+    def data2(self) -> int:
+        """The second data byte of a MIDI message.
+
+        This is used to determine the value for CC events, the velocity for
+        note events, and various other values.
+
+        Note that this property is inaccessible for sysex events.
+        """
+        return self.__get_data2("data2")
+
+    @data2.setter
+    def data2(self, data2: int) -> None:
+        self.__set_data2(data2, "data2")
+
+    @property
+    def port(self) -> int:
+        """The port of the message
+
+        ### HELP WANTED:
+        * This value always appears to be zero. How should it be used?
+
+        Note that this property is read-only.
+        """
+        return self.__get_extra(_PORT)
+
+    @property
+    def note(self) -> int:
+        """The note number of a MIDI note on/off message.
+
+        This is a shadow of the `data1` property. Modifications to this will
+        affect all `data1` derived properties.
+
+        Note that this property is inaccessible for sysex events.
+        """
+        return self.__get_data1("note")
+
+    @note.setter
+    def note(self, note: int) -> None:
+        self.__set_data1(note, "note")
+
+    @property
+    def velocity(self) -> int:
+        """The velocity of a MIDI note on/off message.
+
+        This is a shadow of the `data2` property. Modifications to this will
+        affect all `data2` derived properties
+
+        Note that this property is inaccessible for sysex events.
+        """
+        return self.__get_data2("velocity")
+
+    @velocity.setter
+    def velocity(self, velocity: int) -> None:
+        self.__set_data2(velocity, "velocity")
+
+    @property
+    def pressure(self) -> int:
+        """The pressure value for a channel after-touch event.
+
+        This is a shadow of the `data1` property. Modifications to this will
+        affect all `data1` derived properties.
+
+        Note that this property is inaccessible for sysex events.
+        """
+        return self.__get_data1("pressure")
+
+    @pressure.setter
+    def pressure(self, pressure: int) -> None:
+        self.__set_data1(pressure, "pressure")
+
+    @property
+    def progNum(self) -> int:
+        """The instrument number for a program change event.
+
+        This is a shadow of the `data1` property. Modifications to this will
+        affect all `data1` derived properties.
+
+        Note that this property is inaccessible for sysex events.
+        """
+        return self.__get_data1("progNum")
+
+    @progNum.setter
+    def progNum(self, progNum: int) -> None:
+        self.__set_data1(progNum, "progNum")
+
+    @property
+    def controlNum(self) -> int:
+        """The control number for a control change event.
+
+        This is a shadow of the `data1` property. Modifications to this will
+        affect all `data1` derived properties.
+
+        Note that this property is inaccessible for sysex events.
+        """
+        return self.__get_data1("controlNum")
+
+    @controlNum.setter
+    def controlNum(self, controlNum: int) -> None:
+        self.__set_data1(controlNum, "controlNum")
+
+    @property
+    def controlVal(self) -> int:
+        """The value of a control change event.
+
+        This is a shadow of the `data2` property. Modifications to this will
+        affect all `data2` derived properties
+
+        Note that this property is inaccessible for sysex events.
+        """
+        return self.__get_data2("controlVal")
+
+    @controlVal.setter
+    def controlVal(self, controlVal: int) -> None:
+        self.__set_data2(controlVal, "controlVal")
+
+    @property
+    def pitchBend(self) -> int:
+        """MIDI pitch bend value
+
+        ### HELP WANTED:
+        * This only ever seems to equal `1`. How should it be used?
+
+        Note that this property is read-only.
+        """
+        return self.__get_extra(_PITCH_BEND)
+
+    @property
+    def sysex(self) -> bytes:
+        """Data for a sysex event
+
+        Contains the full event data from sysex events.
+
+        This property is inaccessible for standard events.
+        """
+        if self.__sysex is None:
+            raise ValueError(
+                "Attempt to access sysex data on standard event. "
+                "Are you type narrowing your events correctly?"
+            )
+        return self.__sysex
+
+    @sysex.setter
+    def sysex(self, sysex: bytes) -> None:
+        if len(sysex) == 0:
+            raise ValueError("New sysex data has length of zero")
+        if sysex[0] != 0xF0:
+            raise ValueError("New sysex data doesn't first value of 0xF0")
+        self.__sysex = sysex
+
+    @property
+    def isIncrement(self) -> bool:
+        """
+        Whether the event should be an increment event
+
+        If the script sets this to `True`, FL Studio will consider it to be a
+        relative event, meaning that it will change values relative to that
+        value, rather than setting them absolutely.
+
+        ### HELP WANTED:
+        * Notes on the particular cases where this happens.
+        """
+        return self.__get_extra(_IS_INCREMENT)
+
+    @isIncrement.setter
+    def isIncrement(self, isIncrement: bool) -> None:
+        self.__extras()[_IS_INCREMENT] = isIncrement
+
+    @property
+    def res(self) -> float:
+        """
+        Increment resolution of event.
+
+        This value determines how fine-grained an increment event should be
+        when `isIncrement` is set.
+        """
+        return self.__get_extra(_RES)
+
+    @res.setter
+    def res(self, res: float) -> None:
+        self.__extras()[_RES] = res
+
+    @property
+    def inEv(self) -> int:
+        """MIDI inEv
+
+        ### HELP WANTED:
+        * What is this?
+        """
+        return self.__get_extra(_IN_EV)
+
+    @inEv.setter
+    def inEv(self, inEv: int) -> None:
+        self.__extras()[_IN_EV] = inEv
+
+    @property
+    def outEv(self) -> int:
+        """MIDI outEv
+
+        ### HELP WANTED:
+        * What is this?
+        """
+        return self.__get_extra(_OUT_EV)
+
+    @outEv.setter
+    def outEv(self, outEv: int) -> None:
+        self.__extras()[_OUT_EV] = outEv
+
+    @property
+    def midiId(self) -> int:
+        """MIDI ID
+
+        ### HELP WANTED:
+        * What is this?
+        """
+        return self.__get_extra(_MIDI_ID)
+
+    @midiId.setter
+    def midiId(self, midiId: int) -> None:
+        self.__extras()[_MIDI_ID] = midiId
+
+    @property
+    def midiChan(self) -> int:
+        """MIDI chan
+
+        ### HELP WANTED:
+        * What is this?
+
+        * No, it's not a channel. It always seems to be zero, regardless of the
+          channel of the event.
+        """
+        return self.__get_extra(_MIDI_CHAN)
+
+    @midiChan.setter
+    def midiChan(self, midiChan: int) -> None:
+        self.__extras()[_MIDI_CHAN] = midiChan
+
+    @property
+    def midiChanEx(self) -> int:
+        """MIDI chanEx
+
+        ### HELP WANTED:
+        * What is this?
+        """
+        return self.__get_extra(_MIDI_CHAN_EX)
+
+    @midiChanEx.setter
+    def midiChanEx(self, midiChanEx: int) -> None:
+        self.__extras()[_MIDI_CHAN_EX] = midiChanEx
+
+    @property
+    def pmeFlags(self) -> int:
+        """Flags used by FL Studio to indicate the permissions of the script in
+        the current environment.
+
+        These can be used to ensure safety while running the script. If a
+        script ever attempts to execute unsafe behavior, a `TypeError` will be
+        raised.
+
+        ```py
+        TypeError("Operation unsafe at current time")
+        ```
+
+        ## Flag analysis
+
+        The flags can be analyzed by performing bitwise operations to determine
+        the current permissions of the script. You can use the
+        {{docs_url_page("PME Flags", "midi_controller_scripting/midi/pme flags")}}
+        constants from the {{docs_url_mod[midi]}} module to analyse the flags.
+
+        ## Alternate to flag analysis
+
+        It could be considered to be more Pythonic, as well as much simpler to
+        catch this exception rather than checking the flags. The following is
+        a simple decorator that will catch the exception. This does come with
+        the risk that any unsafe behavior that FL Studio misses will cause
+        a system lock-up in FL Studio.
+
+        ```py
+        def catchUnsafeOperation(func):
+            '''
+            Decorator to prevent exceptions due to unsafe operations
+
+            ### Args:
+            * `func` (`Callable`): function to decorate
+            '''
+            def wrapper(*args, **kwargs):
+                try:
+                    func(*args, **kwargs)
+                except TypeError as e:
+                    if e.args != ("Operation unsafe at current time",):
+                        raise e
+            return wrapper
+        ```
+        """
+        return self.__pme_flags
+
+
+class StandardMidiMsg(FlMidiMsg):
+    """
+    An FlMidiMsg object which has been type narrowed to a StandardFlMidiMsg.
+
+    Note that as FL Studio events are actually of a different type to these
+    shadow types, you should never use the `isinstance` function in order to
+    perform type-narrowing operations, as it will lead to very obscure bugs
+    when your type checks never work inside FL Studio, even if they work in
+    your tests.
+
+    Instead, you can type narrow to a `StandardFlMidiMsg` object using the
+    `isMidiMsgStandard()` function.
+    """
+    __slots__ = ()
+
+    def __init__(self, status: int, data1: int, data2: int) -> None:
+        super().__init__(status, data1, data2)
+
+
+class SysexMidiMsg(FlMidiMsg):
+    """
+    An FlMidiMsg object which has been type narrowed to a SysexFlMidiMsg.
+
+    Note that as FL Studio events are actually of a different type to these
+    shadow types, you should never use the `isinstance` function in order to
+    perform type-narrowing operations, as it will lead to very obscure bugs
+    when your type checks never work inside FL Studio, even if they work in
+    your tests.
+
+    Instead, you can type narrow to a `SysexFlMidiMsg` object using the
+    `isMidiMsgSysex()` function.
+    """
+    __slots__ = ()
+
+    def __init__(self, sysex: list[int]) -> None:
+        super().__init__(sysex)
+
+
+_get_packed = attrgetter('_FlMidiMsg__packed')
+"""
+Returns the packed status and data bytes of an `FlMidiMsg`.
+"""
+
+_set_origin = FlMidiMsg._FlMidiMsg__set_origin  # type: ignore[attr-defined]
+"""
+Sets the `port` and `timestamp` of an `FlMidiMsg`, which are otherwise
+read-only.
+"""
+
+
+def isMidiMsgStandard(event: FlMidiMsg) -> 'TypeGuard[StandardMidiMsg]':
+    """
+    Returns whether an event is a standard event
+
+    ### Args:
+    * `event` (`FlMidiMsg`): event to check
+
+    ### Returns:
+    * `TypeGuard[SysexFlMidiMsg]`: type guarded event
+    """
+    return not isMidiMsgSysex(event)
+
+
+def isMidiMsgSysex(event: FlMidiMsg) -> 'TypeGuard[SysexMidiMsg]':
+    """
+    Returns whether an event is a sysex event
+
+    ### Args:
+    * `event` (`FlMidiMsg`): event to check
+
+    ### Returns:
+    * `TypeGuard[SysexFlMidiMsg]`: type guarded event
+    """
+    return event.status == 0xF0
+
+
+def eventToRawData(event: FlMidiMsg) -> 'int | bytes':
+    """
+    Convert event to raw data.
+
+    For standard events data is presented as little-endian, meaning that the
+    status byte has the lowest component value in the integer.
+
+    ### Returns:
+    * `int | bytes`: data
+    """
+    try:
+        packed = _get_packed(event)
+    except AttributeError:
+        # Not an `FlMidiMsg` (eg a test double), so use its properties
+        if isMidiMsgSysex(event):
+            return event.sysex
+        return event.status + (event.data1 << 8) + (event.data2 << 16)
+    if packed & 0xFF == 0xF0:
+        return event.sysex
+    if packed & _UNSET:
+        # Accessing the unset data raises an error
+        return event.status + (event.data1 << 8) + (event.data2 << 16)
+    return packed
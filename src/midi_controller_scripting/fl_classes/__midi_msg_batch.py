@@ -0,0 +1,339 @@
+"""
+FL Classes > MIDI message batch
+
+A columnar container for processing large numbers of standard MIDI messages
+at once.
+"""
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from itertools import compress
+from typing import overload
+
+from .__midi_msg import (
+    _DEFAULT_PME_FLAGS,
+    FlMidiMsg,
+    _set_origin,
+    isMidiMsgSysex,
+)
+
+_UINT32 = 'I' if array('I').itemsize == 4 else 'L'
+"""
+Type code for a 32-bit unsigned integer array on this platform.
+"""
+
+_SYSEX_TABLE = bytes(int(i == 0xF0) for i in range(256))
+"""
+Translation table mapping each status byte to whether it is a sysex status.
+"""
+
+_STANDARD_TABLE = bytes(int(i != 0xF0) for i in range(256))
+"""
+Translation table mapping each status byte to whether it is a standard
+status.
+"""
+
+
+class FlMidiMsgBatch:
+    """
+    A batch of standard MIDI messages, stored in parallel arrays.
+
+    Each property of the messages is stored in its own `array.array`, which
+    allows operations such as filtering or packing to be performed on the
+    whole batch at once, rather than calling a function on each message.
+
+    * `status` (`array[int]`, type code `B`)
+
+    * `data1` (`array[int]`, type code `B`)
+
+    * `data2` (`array[int]`, type code `B`)
+
+    * `port` (`array[int]`, type code `i`)
+
+    * `timestamp` (`array[int]`, type code `q`)
+
+    * `pmeFlags` (`array[int]`, type code `i`)
+
+    Since these arrays support the buffer protocol, they can be viewed as
+    NumPy arrays without copying if NumPy is available, for example
+    `numpy.frombuffer(batch.status, numpy.uint8)`.
+
+    Sysex messages cannot be stored in a batch.
+
+    ### Example Usage
+
+    ```py
+    batch = FlMidiMsgBatch.fromMessages(recorded_events)
+
+    # Find all the note on events on any channel
+    notes = batch.select(batch.statusMask([0x90], ignoreChannel=True))
+
+    for msg in notes:
+        OnNoteOn(msg)
+    ```
+    """
+    __slots__ = (
+        'status',
+        'data1',
+        'data2',
+        'port',
+        'timestamp',
+        'pmeFlags',
+    )
+
+    def __init__(self) -> None:
+        """
+        Create an empty `FlMidiMsgBatch`.
+        """
+        self.status = array('B')
+        self.data1 = array('B')
+        self.data2 = array('B')
+        self.port = array('i')
+        self.timestamp = array('q')
+        self.pmeFlags = array('i')
+
+    @classmethod
+    def fromMessages(cls, messages: Iterable[FlMidiMsg]) -> 'FlMidiMsgBatch':
+        """
+        Create a batch containing the given messages.
+
+        ### Args:
+        * `messages` (`Iterable[FlMidiMsg]`): standard messages to store.
+
+        ### Returns:
+        * `FlMidiMsgBatch`: batch of messages
+        """
+        batch = cls()
+        for msg in messages:
+            batch.append(msg)
+        return batch
+
+    @classmethod
+    def fromRawData(cls, data: Iterable[int]) -> 'FlMidiMsgBatch':
+        """
+        Create a batch from messages in the packed integer form produced by
+        `eventToRawData`.
+
+        The `port`, `timestamp` and `pmeFlags` of each message are set to
+        their defaults.
+
+        ### Args:
+        * `data` (`Iterable[int]`): packed messages.
+
+        ### Returns:
+        * `FlMidiMsgBatch`: batch of messages
+        """
+        packed = array(_UINT32, data)
+        if sys.byteorder == 'big':
+            packed.byteswap()
+        raw = packed.tobytes()
+        batch = cls()
+        batch.status = array('B', raw[0::4])
+        batch.data1 = array('B', raw[1::4])
+        batch.data2 = array('B', raw[2::4])
+        batch.port = array('i', bytes(4 * len(packed)))
+        batch.timestamp = array('q', bytes(8 * len(packed)))
+        batch.pmeFlags = array('i', [_DEFAULT_PME_FLAGS]) * len(packed)
+        return batch
+
+    @staticmethod
+    def __fields(msg: FlMidiMsg) -> tuple[int, int, int, int, int, int]:
+        """
+        Read every field of a message, so that no column is changed if the
+        message can't be stored.
+        """
+        if isMidiMsgSysex(msg):
+            raise ValueError("Sysex messages cannot be stored in a batch")
+        return (
+            msg.status,
+            msg.data1,
+            msg.data2,
+            msg.port,
+            msg.timestamp,
+            msg.pmeFlags,
+        )
+
+    def append(self, msg: FlMidiMsg) -> None:
+        """
+        Add a message to the end of the batch.
+
+        ### Args:
+        * `msg` (`FlMidiMsg`): standard message to add.
+
+        ### Raises:
+        * `ValueError`: the message is a sysex message. The batch is left
+          unchanged.
+        """
+        status, data1, data2, port, timestamp, pme_flags = self.__fields(msg)
+        self.status.append(status)
+        self.data1.append(data1)
+        self.data2.append(data2)
+        self.port.append(port)
+        self.timestamp.append(timestamp)
+        self.pmeFlags.append(pme_flags)
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    @overload
+    def __getitem__(self, index: int) -> FlMidiMsg:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> 'FlMidiMsgBatch':
+        ...
+
+    def __getitem__(
+        self,
+        index: 'int | slice',
+    ) -> 'FlMidiMsg | FlMidiMsgBatch':
+        """
+        Returns the message at `index` as an `FlMidiMsg` object, including its
+        `port` and `timestamp`, or a new batch containing the messages in a
+        slice.
+
+        Note that the message is a copy of the data in the batch. To update
+        the batch, assign the message back to it, eg `batch[i] = msg`.
+        """
+        if isinstance(index, slice):
+            batch = FlMidiMsgBatch()
+            batch.status = self.status[index]
+            batch.data1 = self.data1[index]
+            batch.data2 = self.data2[index]
+            batch.port = self.port[index]
+            batch.timestamp = self.timestamp[index]
+            batch.pmeFlags = self.pmeFlags[index]
+            return batch
+        return self.__row(
+            self.status[index],
+            self.data1[index],
+            self.data2[index],
+            self.port[index],
+            self.timestamp[index],
+            self.pmeFlags[index],
+        )
+
+    @staticmethod
+    def __row(
+        status: int,
+        data1: int,
+        data2: int,
+        port: int,
+        timestamp: int,
+        pmeFlags: int,
+    ) -> FlMidiMsg:
+        msg = FlMidiMsg(status, data1, data2, pmeFlags)
+        if port or timestamp:
+            _set_origin(msg, port, timestamp)
+        return msg
+
+    def __setitem__(self, index: int, msg: FlMidiMsg) -> None:
+        status, data1, data2, port, timestamp, pme_flags = self.__fields(msg)
+        self.status[index] = status
+        self.data1[index] = data1
+        self.data2[index] = data2
+        self.port[index] = port
+        self.timestamp[index] = timestamp
+        self.pmeFlags[index] = pme_flags
+
+    def __iter__(self) -> Iterator[FlMidiMsg]:
+        row = self.__row
+        for columns in zip(
+            self.status,
+            self.data1,
+            self.data2,
+            self.port,
+            self.timestamp,
+            self.pmeFlags,
+            strict=True,
+        ):
+            yield row(*columns)
+
+    def isStandard(self) -> bytes:
+        """
+        Batch equivalent of `isMidiMsgStandard`.
+
+        ### Returns:
+        * `bytes`: mask containing `1` for each standard message and `0` for
+          each other message.
+        """
+        return self.status.tobytes().translate(_STANDARD_TABLE)
+
+    def isSysex(self) -> bytes:
+        """
+        Batch equivalent of `isMidiMsgSysex`.
+
+        ### Returns:
+        * `bytes`: mask containing `1` for each message with a sysex status
+          and `0` for each other message.
+        """
+        return self.status.tobytes().translate(_SYSEX_TABLE)
+
+    def statusMask(
+        self,
+        statuses: Iterable[int],
+        ignoreChannel: bool = False,
+    ) -> bytes:
+        """
+        Returns a mask of the messages with any of the given statuses.
+
+        ### Args:
+        * `statuses` (`Iterable[int]`): status bytes to match.
+
+        * `ignoreChannel` (`bool`, optional): whether to ignore the channel
+          (lower nibble) of each status when matching, so that `0x90` matches
+          note on events on all channels. Defaults to `False`.
+
+        ### Returns:
+        * `bytes`: mask containing `1` for each matching message and `0` for
+          each other message.
+        """
+        wanted = set(statuses)
+        if ignoreChannel:
+            table = bytes(int(i & 0xF0 in wanted) for i in range(256))
+        else:
+            table = bytes(int(i in wanted) for i in range(256))
+        return self.status.tobytes().translate(table)
+
+    def select(self, mask: 'bytes | Iterable[int]') -> 'FlMidiMsgBatch':
+        """
+        Returns a new batch containing only the messages where `mask` is
+        non-zero.
+
+        ### Args:
+        * `mask` (`bytes | Iterable[int]`): mask, as returned by `isStandard`,
+          `statusMask`, etc.
+
+        ### Returns:
+        * `FlMidiMsgBatch`: selected messages
+        """
+        mask = bytes(mask)
+        batch = FlMidiMsgBatch()
+        batch.status = array('B', compress(self.status, mask))
+        batch.data1 = array('B', compress(self.data1, mask))
+        batch.data2 = array('B', compress(self.data2, mask))
+        batch.port = array('i', compress(self.port, mask))
+        batch.timestamp = array('q', compress(self.timestamp, mask))
+        batch.pmeFlags = array('i', compress(self.pmeFlags, mask))
+        return batch
+
+    def toRawData(self) -> 'array[int]':
+        """
+        Batch equivalent of `eventToRawData`.
+
+        ### Returns:
+        * `array[int]`: array of 32-bit unsigned ints, containing each
+          message in the little-endian packed form.
+        """
+        raw = bytearray(4 * len(self.status))
+        raw[0::4] = self.status.tobytes()
+        raw[1::4] = self.data1.tobytes()
+        raw[2::4] = self.data2.tobytes()
+        packed = array(_UINT32, raw)
+        if sys.byteorder == 'big':
+            packed.byteswap()
+        return packed
+
+    def __repr__(self) -> str:
+        return f"FlMidiMsgBatch(<{len(self)} messages>)"
+
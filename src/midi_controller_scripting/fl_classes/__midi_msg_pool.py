@@ -0,0 +1,136 @@
+"""
+FL Classes > MIDI message pool
+
+A pool of reusable `FlMidiMsg` objects, for replaying large numbers of events
+into a script without allocating a new message for each one.
+"""
+import sys
+from collections.abc import Callable
+
+from .__midi_msg import _DEFAULT_PME_FLAGS, FlMidiMsg
+
+
+class FlMidiMsgPool:
+    """
+    A pool of recycled `FlMidiMsg` objects.
+
+    Messages are taken from the pool, passed to a callback, then returned to
+    the pool once the callback has finished with them. When a message is
+    reused, all of its properties (including `handled` and `pmeFlags`) are
+    reset, so the callback can't observe any difference from a freshly
+    created message.
+
+    If the callback keeps a reference to the message after it returns (for
+    example, by storing it in a list of held notes), the message is not
+    returned to the pool, since modifying it would change data that the
+    script still depends on. The number of messages this happens to is
+    tracked by the `retained` property.
+
+    Detecting retained messages relies on reference counts, which are only
+    available on CPython. On other interpreters, messages are never recycled.
+
+    ### Example Usage
+
+    ```py
+    pool = FlMidiMsgPool()
+
+    for status, data1, data2 in recorded_events:
+        pool.dispatch(OnMidiIn, status, data1, data2)
+
+    print(f"Allocated {pool.allocated} messages, reused {pool.reused}")
+    ```
+    """
+
+    def __init__(self, maxSize: int = 64) -> None:
+        """
+        Create an empty `FlMidiMsgPool`.
+
+        ### Args:
+        * `maxSize` (`int`, optional): maximum number of unused messages to
+          keep in the pool. Defaults to `64`.
+        """
+        self.__free: list[FlMidiMsg] = []
+        self.__max_size = maxSize
+        self.__allocated = 0
+        self.__reused = 0
+        self.__retained = 0
+        # Reference count of an object only referenced by a local variable,
+        # so that we can detect when callbacks hold on to messages
+        if hasattr(sys, 'getrefcount'):
+            probe = object()
+            self.__baseline: int | None = sys.getrefcount(probe)
+        else:
+            self.__baseline = None
+
+    @property
+    def allocated(self) -> int:
+        """
+        Number of messages that have been newly created by the pool.
+        """
+        return self.__allocated
+
+    @property
+    def reused(self) -> int:
+        """
+        Number of times that a message has been recycled by the pool.
+        """
+        return self.__reused
+
+    @property
+    def retained(self) -> int:
+        """
+        Number of messages that weren't recycled, because a callback kept a
+        reference to them.
+        """
+        return self.__retained
+
+    def dispatch(
+        self,
+        callback: Callable[[FlMidiMsg], object],
+        status: int,
+        data1: int,
+        data2: int,
+        pmeFlags: int = _DEFAULT_PME_FLAGS,
+    ) -> bool:
+        """
+        Pass a standard MIDI message to `callback`, using a recycled message
+        object if one is available.
+
+        ### Args:
+        * `callback` (`Callable[[FlMidiMsg], object]`): function to call with
+          the message, such as the script's `OnMidiIn` callback.
+
+        * `status` (`int`): status byte of the message.
+
+        * `data1` (`int`): data1 byte of the message.
+
+        * `data2` (`int`): data2 byte of the message.
+
+        * `pmeFlags` (`int`, optional): PME flags of the message. Defaults to
+          `PME_System | PME_System_Safe | PME_PreviewNote | PME_FromMIDI`.
+
+        ### Returns:
+        * `bool`: whether the callback marked the message as handled.
+        """
+        if self.__free:
+            msg = self.__free.pop()
+            # Re-running the constructor resets every property of the message
+            FlMidiMsg.__init__(msg, status, data1, data2, pmeFlags)
+            self.__reused += 1
+        else:
+            msg = FlMidiMsg(status, data1, data2, pmeFlags)
+            self.__allocated += 1
+
+        callback(msg)
+        handled = msg.handled
+
+        if (
+            self.__baseline is None
+            or sys.getrefcount(msg) > self.__baseline
+        ):
+            # Something else still references the message, so we can't
+            # safely reuse it
+            self.__retained += 1
+        elif len(self.__free) < self.__max_size:
+            self.__free.append(msg)
+        return handled
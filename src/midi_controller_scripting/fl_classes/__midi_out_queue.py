@@ -0,0 +1,335 @@
+"""
+FL Classes > MIDI output queue
+
+A queue for outgoing MIDI messages which skips messages that wouldn't change
+the state of the device.
+"""
+from collections.abc import Callable
+from typing import NamedTuple
+
+
+class MidiOutStats(NamedTuple):
+    """
+    Statistics for the messages passed through a `MidiOutQueue`.
+    """
+
+    messagesQueued: int
+    """
+    Number of messages given to the queue.
+    """
+
+    messagesSent: int
+    """
+    Number of messages actually sent.
+    """
+
+    messagesCoalesced: int
+    """
+    Number of messages that were replaced by a later message to the same
+    address before being flushed.
+    """
+
+    messagesRedundant: int
+    """
+    Number of messages that weren't sent because the device already showed
+    their value.
+    """
+
+    bytesQueued: int
+    """
+    Number of bytes given to the queue.
+    """
+
+    bytesSent: int
+    """
+    Number of bytes actually sent.
+    """
+
+    @property
+    def bytesSaved(self) -> int:
+        """
+        Number of bytes that didn't need to be sent.
+        """
+        return self.bytesQueued - self.bytesSent
+
+
+_SIZES = bytes(
+    2 if status & 0xF0 in (0xC0, 0xD0) else 3
+    for status in range(256)
+)
+"""
+Number of bytes in a message with each status byte. System messages are
+counted as 3 bytes.
+"""
+
+_ADDRESS_MASKS = tuple(
+    # Program change, channel pressure and pitch bend: just the status
+    0xFF if status & 0xF0 in (0xC0, 0xD0, 0xE0)
+    # System messages aren't coalesced
+    else 0 if status >= 0xF0
+    else 0xFFFF
+    for status in range(256)
+)
+"""
+Mask applied to a packed message with each status byte to get its address.
+"""
+
+
+def _midi_out_msg(message: int) -> None:
+    # Looked up on each call, so that it can be replaced, eg by a simulation
+    import device
+    device.midiOutMsg(message)
+
+
+def _midi_out_sysex(message: bytes) -> None:
+    import device
+    device.midiOutSysex(message)
+
+
+class MidiOutQueue:
+    """
+    A coalescing queue for the MIDI messages sent to a device.
+
+    Rather than sending messages immediately, the caller queues them, then
+    calls `flush` once it has finished updating the device (for example at
+    the end of each simulated `OnRefresh`). During flushing:
+
+    * If a message was queued more than once for the same address (such as
+      the same CC number on the same channel), only the latest one is sent.
+
+    * Messages that match the last message sent to the same address are
+      dropped as soon as they are queued, since the device already shows
+      their value.
+
+    For channel messages, the address of a message is its status byte and
+    data1 byte, except for program change, channel pressure and pitch bend
+    messages, where it is only the status byte. Note on and note off messages
+    share an address, so that turning a light on and off again in the same
+    window leaves it off. Other messages (such as system real-time messages)
+    are sent during the next flush without being coalesced.
+
+    Sysex messages are addressed by an optional `address` given when they are
+    queued, such as the prefix that identifies a display or pad. If no
+    address is given, the whole message is used, so only exact repeats are
+    skipped.
+
+    The queue assumes that nothing else sends messages to the device. If the
+    device's state is lost (for example when it is reconnected), call
+    `invalidate` so that every value is sent again. Each queue tracks the
+    state of one device, so use one queue per output port.
+
+    This type is not available inside FL Studio. It can be used to measure how
+    much of the output of a script is redundant, for example in a simulation
+    using `fl_sim`, or by tools that drive a device from outside FL Studio.
+
+    ### Example Usage
+
+    ```py
+    # Measure how much of a script's pad output is redundant, by replaying
+    # the colors it sent during a recorded session
+    sent = []
+    out = MidiOutQueue(sendMsg=sent.append)
+    for frame in recorded_pad_colors:
+        for pad, color in enumerate(frame):
+            out.send(0x90, pad, color)
+        out.flush()
+
+    print(f"Sent {len(sent)} messages, saved {out.stats.bytesSaved} bytes")
+    ```
+    """
+
+    def __init__(
+        self,
+        sendMsg: Callable[[int], object] | None = None,
+        sendSysex: Callable[[bytes], object] | None = None,
+    ) -> None:
+        """
+        Create a `MidiOutQueue`.
+
+        ### Args:
+        * `sendMsg` (`Callable[[int], object]`, optional): function used to
+          send standard messages, in the packed form taken by
+          `device.midiOutMsg`. Defaults to `None`, meaning
+          `device.midiOutMsg`.
+
+        * `sendSysex` (`Callable[[bytes], object]`, optional): function used
+          to send sysex messages. Defaults to `None`, meaning
+          `device.midiOutSysex`.
+        """
+        self.__send_msg = sendMsg if sendMsg is not None else _midi_out_msg
+        self.__send_sysex = (
+            sendSysex if sendSysex is not None else _midi_out_sysex)
+        # Mappings from address to packed message
+        self.__pending: dict[int, int] = {}
+        self.__shadow: dict[int, int] = {}
+        self.__pending_sysex: dict[bytes, bytes] = {}
+        self.__shadow_sysex: dict[bytes, bytes] = {}
+        self.__unaddressed: list[int] = []
+        self.__queued = 0
+        self.__sent = 0
+        self.__coalesced = 0
+        self.__redundant = 0
+        self.__bytes_queued = 0
+        self.__bytes_sent = 0
+
+    def send(self, status: int, data1: int, data2: int = 0) -> None:
+        """
+        Queue a standard MIDI message.
+
+        ### Args:
+        * `status` (`int`): status byte.
+
+        * `data1` (`int`): data1 byte.
+
+        * `data2` (`int`, optional): data2 byte. Defaults to `0`.
+        """
+        self.sendPacked(status | data1 << 8 | data2 << 16)
+
+    def sendPacked(self, message: int) -> None:
+        """
+        Queue a standard MIDI message, in the packed form taken by
+        `device.midiOutMsg` (status in the lowest byte, then data1, then
+        data2).
+
+        ### Args:
+        * `message` (`int`): packed message.
+        """
+        status = message & 0xFF
+        self.__queued += 1
+        self.__bytes_queued += _SIZES[status]
+        address = message & _ADDRESS_MASKS[status]
+        if not address:
+            self.__unaddressed.append(message)
+            return
+        if status < 0x90:
+            # Note off shares its address with note on
+            address |= 0x10
+        pending = self.__pending
+        if pending.pop(address, None) is not None:
+            self.__coalesced += 1
+        if self.__shadow.get(address) == message:
+            self.__redundant += 1
+        else:
+            # Re-inserting moves the address to the end, so that the final
+            # values are sent in the order they were queued
+            pending[address] = message
+
+    def sendSysex(self, message: bytes, address: bytes | None = None) -> None:
+        """
+        Queue a sysex message.
+
+        ### Args:
+        * `message` (`bytes`): sysex data, including the leading `0xF0` and
+          trailing `0xF7`.
+
+        * `address` (`bytes`, optional): identifies the part of the device
+          that the message updates, such that only the latest message for
+          each address needs to be sent. Defaults to `None`, meaning the
+          whole message.
+        """
+        message = bytes(message)
+        self.__queued += 1
+        self.__bytes_queued += len(message)
+        key = message if address is None else bytes(address)
+        pending = self.__pending_sysex
+        if pending.pop(key, None) is not None:
+            self.__coalesced += 1
+        if self.__shadow_sysex.get(key) == message:
+            self.__redundant += 1
+        else:
+            pending[key] = message
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of messages waiting to be flushed.
+        """
+        return (
+            len(self.__pending)
+            + len(self.__pending_sysex)
+            + len(self.__unaddressed)
+        )
+
+    def flush(self) -> int:
+        """
+        Send the queued messages. Standard messages are sent before sysex
+        messages.
+
+        ### Returns:
+        * `int`: number of messages sent.
+        """
+        sent = 0
+        send_bytes = 0
+
+        if self.__unaddressed:
+            send_msg = self.__send_msg
+            for message in self.__unaddressed:
+                send_msg(message)
+                send_bytes += _SIZES[message & 0xFF]
+            sent += len(self.__unaddressed)
+            self.__unaddressed = []
+
+        if self.__pending:
+            send_msg = self.__send_msg
+            shadow = self.__shadow
+            for address, message in self.__pending.items():
+                send_msg(message)
+                shadow[address] = message
+                sent += 1
+                send_bytes += _SIZES[message & 0xFF]
+            self.__pending = {}
+
+        if self.__pending_sysex:
+            send_sysex = self.__send_sysex
+            shadow_sysex = self.__shadow_sysex
+            for key, data in self.__pending_sysex.items():
+                send_sysex(data)
+                shadow_sysex[key] = data
+                sent += 1
+                send_bytes += len(data)
+            self.__pending_sysex = {}
+
+        self.__sent += sent
+        self.__bytes_sent += send_bytes
+        return sent
+
+    def invalidate(self) -> None:
+        """
+        Forget the values that the device is showing, so that every value
+        queued from now on is sent, even if it matches the last message sent.
+        """
+        self.__shadow.clear()
+        self.__shadow_sysex.clear()
+
+    def clear(self) -> None:
+        """
+        Discard any messages waiting to be flushed.
+        """
+        self.__pending = {}
+        self.__pending_sysex = {}
+        self.__unaddressed = []
+
+    @property
+    def stats(self) -> MidiOutStats:
+        """
+        Statistics for the messages passed through the queue.
+        """
+        return MidiOutStats(
+            self.__queued,
+            self.__sent,
+            self.__coalesced,
+            self.__redundant,
+            self.__bytes_queued,
+            self.__bytes_sent,
+        )
+
+    def resetStats(self) -> None:
+        """
+        Reset all statistics to zero.
+        """
+        self.__queued = 0
+        self.__sent = 0
+        self.__coalesced = 0
+        self.__redundant = 0
+        self.__bytes_queued = 0
+        self.__bytes_sent = 0
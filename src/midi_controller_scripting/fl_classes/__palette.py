@@ -0,0 +1,228 @@
+"""
+FL Classes > Palette
+
+Nearest-color lookup for devices with a fixed palette of colors.
+"""
+from collections.abc import Iterable, Mapping, Sequence
+from functools import lru_cache
+from typing import NamedTuple
+
+
+class PaletteCacheInfo(NamedTuple):
+    """
+    Statistics for the cache of a `PaletteQuantizer`.
+    """
+
+    hits: int
+    """
+    Number of lookups that were found in the cache.
+    """
+
+    misses: int
+    """
+    Number of lookups that required a search of the palette.
+    """
+
+    maxsize: int | None
+    """
+    Maximum number of cached colors, or `None` if there is no limit.
+    """
+
+    currsize: int
+    """
+    Number of colors currently cached.
+    """
+
+
+class PaletteQuantizer:
+    """
+    Maps arbitrary colors to the nearest color in a device's fixed palette.
+
+    Many pad controllers can only show a fixed palette of colors, selected
+    using the velocity of a note message. A `PaletteQuantizer` finds the
+    palette index of the color closest to an FL Studio color (such as the
+    result of `channels.getChannelColor` or `mixer.getTrackColor`), using the
+    squared distance between their RGB components. This is the same result as
+    searching through every color in the palette, with ties going to the
+    lowest index.
+
+    The palette is stored in a k-d tree, so each search only needs to check a
+    few palette colors, and the results of recent searches are kept in a
+    least-recently-used cache, so that colors which are seen again (as most
+    colors in a project are) are found in constant time.
+
+    This type is not available inside FL Studio. It can be used to generate
+    lookup tables for a script ahead of time, or to check the colors that a
+    script sends in a simulation using `fl_sim`.
+
+    ### Example Usage
+
+    ```py
+    # Generate a table mapping FL Studio's default channel colors to pad
+    # velocities, to include in a script
+    quantizer = PaletteQuantizer(PAD_PALETTE)
+    velocities = dict(zip(
+        DEFAULT_COLORS,
+        quantizer.nearestMany(DEFAULT_COLORS),
+    ))
+    ```
+    """
+
+    def __init__(
+        self,
+        palette: Sequence[int] | Mapping[int, int],
+        cacheSize: int | None = 4096,
+    ) -> None:
+        """
+        Create a `PaletteQuantizer`.
+
+        ### Args:
+        * `palette` (`Sequence[int] | Mapping[int, int]`): colors of the
+          palette, as integers (`0x--RRGGBB`). This is either a sequence of
+          colors, where each color's index is its position, or a mapping
+          from index to color, for palettes where some indexes are unused.
+
+        * `cacheSize` (`int`, optional): maximum number of colors to cache
+          the results for. Defaults to `4096`. `None` means no limit.
+        """
+        if isinstance(palette, Mapping):
+            entries = list(palette.items())
+        else:
+            entries = list(enumerate(palette))
+        if not entries:
+            raise ValueError("The palette must contain at least one color")
+        self.__colors = {index: color for index, color in entries}
+        # The k-d tree is stored as parallel lists, where each node is an
+        # index into them, and -1 means no node
+        self.__points: list[tuple[int, int, int]] = []
+        self.__indexes: list[int] = []
+        self.__axes: list[int] = []
+        self.__left: list[int] = []
+        self.__right: list[int] = []
+        self.__root = self.__build(
+            [
+                (
+                    ((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF),
+                    index,
+                )
+                for index, color in entries
+            ],
+            0,
+        )
+        self.__lookup = lru_cache(maxsize=cacheSize)(self.__search)
+
+    def __build(
+        self,
+        entries: list[tuple[tuple[int, int, int], int]],
+        depth: int,
+    ) -> int:
+        if not entries:
+            return -1
+        axis = depth % 3
+        entries.sort(key=lambda entry: entry[0][axis])
+        median = len(entries) // 2
+        point, index = entries[median]
+        node = len(self.__points)
+        self.__points.append(point)
+        self.__indexes.append(index)
+        self.__axes.append(axis)
+        self.__left.append(-1)
+        self.__right.append(-1)
+        self.__left[node] = self.__build(entries[:median], depth + 1)
+        self.__right[node] = self.__build(entries[median + 1:], depth + 1)
+        return node
+
+    def __search(self, color: int) -> int:
+        query = ((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF)
+        r, g, b = query
+        points = self.__points
+        indexes = self.__indexes
+        axes = self.__axes
+        left = self.__left
+        right = self.__right
+        best_distance = 3 * 256 * 256
+        best_index = -1
+        # Nodes to visit, along with a lower bound on their distance
+        stack = [(self.__root, 0)]
+        while stack:
+            node, bound = stack.pop()
+            # Equal distances are still searched, so that ties can go to the
+            # lowest index
+            if node < 0 or bound > best_distance:
+                continue
+            point = points[node]
+            distance = (
+                (point[0] - r) ** 2
+                + (point[1] - g) ** 2
+                + (point[2] - b) ** 2
+            )
+            index = indexes[node]
+            if distance < best_distance or (
+                distance == best_distance and index < best_index
+            ):
+                best_distance = distance
+                best_index = index
+            axis = axes[node]
+            diff = query[axis] - point[axis]
+            if diff < 0:
+                stack.append((right[node], diff * diff))
+                stack.append((left[node], 0))
+            else:
+                stack.append((left[node], diff * diff))
+                stack.append((right[node], 0))
+        return best_index
+
+    def nearest(self, color: int) -> int:
+        """
+        Returns the index of the palette color nearest to the given color.
+
+        ### Args:
+        * `color` (`int`): color as integer (`0x--RRGGBB`). The upper bits
+          are ignored.
+
+        ### Returns:
+        * `int`: palette index.
+        """
+        return self.__lookup(color & 0xFFFFFF)
+
+    def nearestMany(self, colors: Iterable[int]) -> list[int]:
+        """
+        Returns the indexes of the palette colors nearest to each of the
+        given colors, for example to update a whole grid of pads.
+
+        ### Args:
+        * `colors` (`Iterable[int]`): colors as integers (`0x--RRGGBB`).
+
+        ### Returns:
+        * `list[int]`: palette indexes.
+        """
+        lookup = self.__lookup
+        return [lookup(color & 0xFFFFFF) for color in colors]
+
+    def color(self, index: int) -> int:
+        """
+        Returns the color of the palette entry at the given index.
+
+        ### Args:
+        * `index` (`int`): palette index.
+
+        ### Returns:
+        * `int`: color as integer (`0x--RRGGBB`).
+        """
+        return self.__colors[index]
+
+    def __len__(self) -> int:
+        return len(self.__colors)
+
+    def cacheInfo(self) -> PaletteCacheInfo:
+        """
+        Returns the number of hits and misses of the cache, as well as its
+        maximum and current size.
+        """
+        return PaletteCacheInfo(*self.__lookup.cache_info())
+
+    def clearCache(self) -> None:
+        """
+        Discard all cached results.
+        """
+        self.__lookup.cache_clear()
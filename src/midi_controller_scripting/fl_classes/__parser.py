@@ -0,0 +1,182 @@
+"""
+FL Classes > Parser
+
+An incremental parser for turning a raw MIDI byte stream into `FlMidiMsg`
+objects.
+"""
+import re
+from collections.abc import Iterator
+
+from .__midi_msg import FlMidiMsg
+
+_STATUS_BYTE = re.compile(rb'[\x80-\xFF]')
+"""
+Matches any status byte. Used to skip over sysex data quickly.
+"""
+
+_SYSTEM_COMMON_LENGTHS = {
+    0xF1: 1,  # MTC quarter frame
+    0xF2: 2,  # Song position pointer
+    0xF3: 1,  # Song select
+    0xF4: 0,  # Undefined
+    0xF5: 0,  # Undefined
+    0xF6: 0,  # Tune request
+}
+"""
+Number of data bytes expected after each system common status byte.
+"""
+
+
+class FlMidiMsgParser:
+    """
+    Incremental parser for raw MIDI data.
+
+    Data can be given to the parser in chunks of any size, and messages that
+    are split across chunks are reassembled. The parser handles:
+
+    * Running status, where the status byte is omitted for consecutive channel
+      messages with the same status.
+
+    * Real-time messages (`0xF8` - `0xFF`), which may appear at any point in
+      the stream, including in the middle of other messages. These are
+      returned immediately, with `data1` and `data2` set to `0`.
+
+    * System-exclusive messages, which may span any number of chunks. If a
+      sysex message is interrupted by a non-real-time status byte, it is
+      discarded.
+
+    System common messages (`0xF1` - `0xF6`) are returned with any missing data
+    bytes set to `0`. Data bytes that can't be associated with a status byte
+    are ignored.
+
+    ### Example Usage
+
+    ```py
+    parser = FlMidiMsgParser()
+
+    with open("capture.mid.raw", "rb") as f:
+        while chunk := f.read(65536):
+            for msg in parser.feed(chunk):
+                OnMidiIn(msg)
+    ```
+    """
+
+    def __init__(self) -> None:
+        """
+        Create an `FlMidiMsgParser` object, with no running status.
+        """
+        self.__status = 0
+        self.__expected = 0
+        self.__data: list[int] = []
+        self.__sysex: bytearray | None = None
+
+    def reset(self) -> None:
+        """
+        Reset the state of the parser, discarding any partially-received
+        message and the running status.
+        """
+        self.__status = 0
+        self.__expected = 0
+        self.__data = []
+        self.__sysex = None
+
+    def feed(
+        self,
+        data: 'bytes | bytearray | memoryview',
+    ) -> Iterator[FlMidiMsg]:
+        """
+        Feed a chunk of raw MIDI data into the parser, returning each message
+        that is completed by it.
+
+        This is not a streaming generator. The whole chunk is parsed
+        immediately, and the messages it completes are collected into a list
+        before being returned. This keeps the parser's state up to date even
+        if the returned iterator is never used, or is only used after the
+        next chunk has been fed in. The cost is one list per chunk, holding
+        at most one message per 1-3 bytes of input, so very large chunks
+        should be split up if memory is a concern.
+
+        ### Args:
+        * `data` (`bytes | bytearray | memoryview`): chunk of MIDI data
+
+        ### Returns:
+        * `Iterator[FlMidiMsg]`: each message completed by this chunk
+        """
+        return iter(list(self.__parse(bytes(data))))
+
+    def __parse(self, buf: bytes) -> Iterator[FlMidiMsg]:
+        """
+        Parse a chunk of data, yielding each message completed by it.
+        """
+        length = len(buf)
+        i = 0
+        while i < length:
+            if self.__sysex is not None:
+                # Skip straight to the next status byte, since all the bytes
+                # before it are part of the sysex message
+                match = _STATUS_BYTE.search(buf, i)
+                if match is None:
+                    self.__sysex += buf[i:]
+                    return
+                end = match.start()
+                self.__sysex += buf[i:end]
+                i = end
+
+            byte = buf[i]
+            i += 1
+
+            if byte < 0x80:
+                # Data byte
+                if self.__expected == 0:
+                    # No status to attach it to
+                    continue
+                self.__data.append(byte)
+                if len(self.__data) == self.__expected:
+                    yield self.__complete()
+            elif byte >= 0xF8:
+                # Real-time messages don't affect any other state
+                yield FlMidiMsg(byte, 0, 0)
+            elif byte == 0xF0:
+                self.__sysex = bytearray(b'\xF0')
+                self.__status = 0
+                self.__expected = 0
+            elif byte == 0xF7:
+                if self.__sysex is not None:
+                    self.__sysex.append(0xF7)
+                    sysex = self.__sysex
+                    self.__sysex = None
+                    yield FlMidiMsg(bytes(sysex))
+            elif byte >= 0xF0:
+                # System common messages cancel running status and any
+                # incomplete sysex message
+                self.__sysex = None
+                self.__status = byte
+                self.__expected = _SYSTEM_COMMON_LENGTHS[byte]
+                self.__data = []
+                if self.__expected == 0:
+                    yield self.__complete()
+            else:
+                # Channel message
+                self.__sysex = None
+                self.__status = byte
+                self.__expected = 1 if 0xC0 <= byte < 0xE0 else 2
+                self.__data = []
+
+    def __complete(self) -> FlMidiMsg:
+        """
+        Create a message from the current status and data bytes, then update
+        the state for the next message.
+        """
+        status = self.__status
+        data = self.__data
+        msg = FlMidiMsg(
+            status,
+            data[0] if len(data) > 0 else 0,
+            data[1] if len(data) > 1 else 0,
+        )
+        self.__data = []
+        if status >= 0xF0:
+            # System common messages don't support running status
+            self.__status = 0
+            self.__expected = 0
+        return msg
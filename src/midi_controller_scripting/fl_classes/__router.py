@@ -0,0 +1,198 @@
+"""
+FL Classes > Router
+
+A dispatch table for routing incoming MIDI messages to handler functions in
+constant time.
+"""
+from collections.abc import Callable
+
+import midi
+
+from .__midi_msg import FlMidiMsg, eventToRawData
+
+FlMidiMsgHandler = Callable[[FlMidiMsg], object]
+"""
+A function that handles a MIDI message.
+"""
+
+_Table = list['list[FlMidiMsgHandler | None] | None']
+"""
+Compiled lookup table. The outer list is indexed by status byte, and the inner
+lists are indexed by data1 byte. Inner lists are `None` if no handlers are
+registered for that status.
+"""
+
+
+class FlMidiMsgRouter:
+    """
+    Routes MIDI messages to handler functions.
+
+    Handlers are registered against a pattern of status, channel, data1 and
+    port values. Before messages are dispatched, the patterns are compiled
+    into lookup tables indexed by the status and data1 bytes of the packed
+    message data (as given by `eventToRawData`), so finding the handler for a
+    message takes the same amount of time no matter how many handlers are
+    registered.
+
+    If a message matches more than one pattern, the handler that was
+    registered first is used.
+
+    This type is not available inside FL Studio. It is intended for tests and
+    tools that process MIDI messages outside of FL Studio, such as when
+    analysing a recording made with `fl_sim.MidiRecorder`.
+
+    ### Example Usage
+
+    ```py
+    import midi
+    from fl_sim import MidiReplayer
+
+    router = FlMidiMsgRouter()
+    router.register(onFader, midi.MIDI_CONTROLCHANGE, data1=0x07)
+    router.register(onPad, midi.MIDI_NOTEON, channel=9)
+    router.register(onAnyNote, midi.MIDI_NOTEON)
+
+    with MidiReplayer('session.bin') as replayer:
+        for record in replayer:
+            router.dispatch(record.toMessage())
+    ```
+    """
+
+    def __init__(self) -> None:
+        """
+        Create an `FlMidiMsgRouter` with no handlers registered.
+        """
+        self.__patterns: list[
+            tuple[int, int | None, int | None, int | None, FlMidiMsgHandler]
+        ] = []
+        self.__table: _Table | None = None
+        self.__port_tables: dict[int, _Table] = {}
+
+    def register(
+        self,
+        handler: FlMidiMsgHandler,
+        status: int,
+        channel: int | None = None,
+        data1: int | None = None,
+        port: int | None = None,
+    ) -> None:
+        """
+        Register a handler function for messages matching the given pattern.
+
+        ### Args:
+        * `handler` (`Callable[[FlMidiMsg], object]`): function to call for
+          matching messages.
+
+        * `status` (`int`): type of message to match, for example
+          `midi.MIDI_NOTEON`. For channel messages, the channel nibble is
+          ignored; use the `channel` argument instead.
+
+        * `channel` (`int`, optional): channel to match (`0` - `15`), or
+          `None` to match all channels. Ignored for system messages. Defaults
+          to `None`.
+
+        * `data1` (`int`, optional): data1 byte to match (such as the CC or
+          note number), or `None` to match any value. For sysex messages,
+          this matches the first byte after `0xF0`. Defaults to `None`.
+
+        * `port` (`int`, optional): port to match, or `None` to match any
+          port. Defaults to `None`.
+        """
+        if not 0x80 <= status <= 0xFF:
+            raise ValueError(f"Invalid status byte {status:#X}")
+        if status < midi.MIDI_BEGINSYSEX:
+            status &= 0xF0
+            if channel is not None and not 0 <= channel <= 0xF:
+                raise ValueError(f"Invalid channel {channel}")
+        else:
+            channel = None
+        if data1 is not None and not 0 <= data1 <= 0xFF:
+            raise ValueError(f"Invalid data1 byte {data1:#X}")
+
+        self.__patterns.append((status, channel, data1, port, handler))
+        # Recompile next time we dispatch an event
+        self.__table = None
+
+    def __compile(self) -> _Table:
+        """
+        Compile the registered patterns into lookup tables.
+        """
+        ports = {
+            port
+            for _, _, _, port, _ in self.__patterns
+            if port is not None
+        }
+
+        def build(port: int | None) -> _Table:
+            table: _Table = [None] * 256
+            # Iterate in reverse so that earlier registrations overwrite
+            # later ones
+            for status, channel, data1, pat_port, handler in reversed(
+                self.__patterns
+            ):
+                if pat_port is not None and pat_port != port:
+                    continue
+                if status >= midi.MIDI_BEGINSYSEX:
+                    statuses = [status]
+                elif channel is None:
+                    statuses = [status | chan for chan in range(16)]
+                else:
+                    statuses = [status | channel]
+                for s in statuses:
+                    row = table[s]
+                    if row is None:
+                        row = table[s] = [None] * 256
+                    if data1 is None:
+                        row[:] = [handler] * 256
+                    else:
+                        row[data1] = handler
+            return table
+
+        self.__port_tables = {port: build(port) for port in ports}
+        return build(None)
+
+    def lookup(self, msg: FlMidiMsg) -> FlMidiMsgHandler | None:
+        """
+        Returns the handler that a message would be routed to, or `None` if
+        no registered patterns match it.
+
+        ### Args:
+        * `msg` (`FlMidiMsg`): message to look up.
+
+        ### Returns:
+        * `Callable[[FlMidiMsg], object] | None`: handler function.
+        """
+        table = self.__table
+        if table is None:
+            table = self.__table = self.__compile()
+        if self.__port_tables:
+            table = self.__port_tables.get(msg.port, table)
+
+        raw = eventToRawData(msg)
+        if isinstance(raw, bytes):
+            # Sysex messages are matched using their first data byte, which
+            # is generally the manufacturer ID
+            row = table[midi.MIDI_BEGINSYSEX]
+            data1 = raw[1] if len(raw) > 1 else 0
+        else:
+            row = table[raw & 0xFF]
+            data1 = (raw >> 8) & 0xFF
+        if row is None:
+            return None
+        return row[data1]
+
+    def dispatch(self, msg: FlMidiMsg) -> bool:
+        """
+        Route a message to the matching handler.
+
+        ### Args:
+        * `msg` (`FlMidiMsg`): message to dispatch.
+
+        ### Returns:
+        * `bool`: whether a matching handler was found.
+        """
+        handler = self.lookup(msg)
+        if handler is None:
+            return False
+        handler(msg)
+        return True
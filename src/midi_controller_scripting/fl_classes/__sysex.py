@@ -0,0 +1,156 @@
+"""
+FL Classes > Sysex
+
+Helpers for efficiently inspecting system-exclusive messages.
+"""
+from collections.abc import Iterable
+from typing import Generic, TypeVar
+
+from .__midi_msg import SysexMidiMsg
+
+T = TypeVar('T')
+
+
+def sysexView(event: SysexMidiMsg) -> memoryview:
+    """
+    Returns a read-only `memoryview` of the data of a sysex event.
+
+    Slicing a `memoryview` doesn't copy the underlying data, so this can be
+    used to parse large sysex messages (such as patch dumps) without creating
+    a new `bytes` object for each field.
+
+    ### Args:
+    * `event` (`SysexMidiMsg`): sysex event, which should be type narrowed
+      using `isMidiMsgSysex`.
+
+    ### Returns:
+    * `memoryview`: view of the event's data, including the leading `0xF0`.
+
+    ### Example Usage
+
+    ```py
+    if isMidiMsgSysex(msg):
+        data = sysexView(msg)
+        header = data[1:5]
+        payload = data[5:-1]
+    ```
+    """
+    return memoryview(event.sysex).toreadonly()
+
+
+class _SysexTrieNode(Generic[T]):
+    """
+    A node within a `SysexPrefixMatcher`.
+    """
+    __slots__ = ('children', 'wildcard', 'value', 'hasValue')
+
+    def __init__(self) -> None:
+        self.children: dict[int, _SysexTrieNode[T]] = {}
+        self.wildcard: _SysexTrieNode[T] | None = None
+        self.value: T | None = None
+        self.hasValue = False
+
+
+class SysexPrefixMatcher(Generic[T]):
+    """
+    Matches sysex messages against a collection of header patterns.
+
+    Patterns are stored in a prefix trie, so matching a message only requires
+    a single walk over the start of its data, no matter how many patterns are
+    registered. Patterns may contain wildcard bytes (given as `None`), which
+    match any value, such as a device ID.
+
+    If a message matches multiple patterns, the longest pattern is used. For
+    patterns of the same length, exact bytes take priority over wildcards,
+    starting from the first byte.
+
+    ### Example Usage
+
+    ```py
+    matcher: SysexPrefixMatcher[Callable[[memoryview], None]]
+    matcher = SysexPrefixMatcher()
+    # Universal device enquiry response, from any device ID
+    matcher.register([0xF0, 0x7E, None, 0x06, 0x02], onDeviceEnquiry)
+    # Screen buffer dump from our device
+    matcher.register([0xF0, 0x00, 0x20, 0x29, 0x02, 0x10], onScreenDump)
+
+    def OnSysEx(msg):
+        handler = matcher.match(msg.sysex)
+        if handler is not None:
+            handler(sysexView(msg))
+            msg.handled = True
+    ```
+    """
+
+    def __init__(self) -> None:
+        """
+        Create a `SysexPrefixMatcher` with no patterns registered.
+        """
+        self.__root: _SysexTrieNode[T] = _SysexTrieNode()
+        self.__max_depth = 0
+
+    def register(self, pattern: Iterable[int | None], value: T) -> None:
+        """
+        Register a header pattern.
+
+        If the pattern has already been registered, its value is replaced.
+
+        ### Args:
+        * `pattern` (`Iterable[int | None]`): bytes to match at the start of
+          the message, where `None` matches any byte.
+
+        * `value` (`T`): value to return when the pattern matches, such as a
+          handler function.
+        """
+        node = self.__root
+        depth = 0
+        for byte in pattern:
+            if byte is None:
+                if node.wildcard is None:
+                    node.wildcard = _SysexTrieNode()
+                node = node.wildcard
+            else:
+                if not 0 <= byte <= 0xFF:
+                    raise ValueError(f"Invalid byte in pattern: {byte}")
+                child = node.children.get(byte)
+                if child is None:
+                    child = node.children[byte] = _SysexTrieNode()
+                node = child
+            depth += 1
+        node.value = value
+        node.hasValue = True
+        self.__max_depth = max(self.__max_depth, depth)
+
+    def match(self, data: 'bytes | memoryview') -> T | None:
+        """
+        Returns the value of the best pattern matching the start of `data`,
+        or `None` if no patterns match.
+
+        ### Args:
+        * `data` (`bytes | memoryview`): sysex data to match, including the
+          leading `0xF0`.
+
+        ### Returns:
+        * `T | None`: value registered with the matching pattern.
+        """
+        root = self.__root
+        best: T | None = root.value if root.hasValue else None
+        active = [root]
+        # Only the start of the data needs to be inspected, so avoid copying
+        # the rest of it
+        for byte in memoryview(data)[:self.__max_depth]:
+            following: list[_SysexTrieNode[T]] = []
+            for node in active:
+                child = node.children.get(byte)
+                if child is not None:
+                    following.append(child)
+                if node.wildcard is not None:
+                    following.append(node.wildcard)
+            if not following:
+                break
+            for node in following:
+                if node.hasValue:
+                    best = node.value
+                    break
+            active = following
+        return best
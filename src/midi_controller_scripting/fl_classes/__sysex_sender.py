@@ -0,0 +1,279 @@
+"""
+FL Classes > Sysex sender
+
+A rate-limited sender for large sysex transfers.
+"""
+import time
+from collections import deque
+from collections.abc import Callable
+
+
+def _midi_out_sysex(message: bytes) -> None:
+    # Looked up on each call, so that it can be replaced, eg by a simulation
+    import device
+    device.midiOutSysex(message)
+
+
+def _now_us() -> int:
+    return time.perf_counter_ns() // 1000
+
+
+class SysexSender:
+    """
+    Sends sysex messages to a device at a limited rate, so that large
+    transfers (such as screen bitmaps or patch dumps) don't overflow the
+    buffers of cheap USB-MIDI interfaces.
+
+    Messages are queued, then sent by calling `tick` regularly, for example
+    from a timer. Each tick sends as many whole packets as the byte rate
+    allows, based on the time since the previous tick, with at most
+    `burstSize` bytes sent at once. The only exception is a packet larger
+    than `burstSize`, which is sent on its own once the sender has been idle
+    for long enough. Large payloads can be split into several packets with
+    `sendChunked`.
+
+    The queue can be limited in size. The `backpressure` property indicates
+    when the queue is filling up, so that the sender can stop generating new
+    data (for example by skipping screen redraws) until it drains.
+
+    This type is not available inside FL Studio. By default it sends using
+    `device.midiOutSysex`, so it can be used with a simulation from `fl_sim`
+    to check how a device's transfers would be paced. Tools that talk to a
+    device from outside FL Studio can pass their own `send` function.
+
+    ### Example Usage
+
+    ```py
+    # Upload a patch dump from a tool running outside FL Studio
+    sender = SysexSender(bytesPerSecond=3000, send=port.send_sysex)
+    sender.sendChunked(PATCH_HEADER, patch_data)
+
+    while sender.queuedPackets:
+        sender.tick()
+        time.sleep(0.01)
+    ```
+    """
+
+    def __init__(
+        self,
+        bytesPerSecond: int = 3000,
+        packetSize: int = 256,
+        burstSize: int | None = None,
+        maxQueuedBytes: int | None = None,
+        highWaterMark: int | None = None,
+        send: Callable[[bytes], object] | None = None,
+        clock: Callable[[], int] | None = None,
+    ) -> None:
+        """
+        Create a `SysexSender`.
+
+        ### Args:
+        * `bytesPerSecond` (`int`, optional): maximum average rate to send
+          data at. Defaults to `3000`, a little below the 3125 bytes per
+          second of a 5-pin DIN MIDI connection.
+
+        * `packetSize` (`int`, optional): maximum size of each packet sent by
+          `sendChunked`, including the header and trailing `0xF7`. Defaults
+          to `256`.
+
+        * `burstSize` (`int`, optional): maximum number of bytes to send at
+          once, after the sender has been idle. This should be no larger than
+          the device's input buffer. Since only whole packets are sent, it
+          should also be at least the size of the largest packet plus the
+          number of bytes allowed between ticks (60 bytes at 3000 bytes per
+          second with `OnIdle`'s 20 ms interval), or the full rate can't be
+          reached. Defaults to `None`, meaning `packetSize`.
+
+        * `maxQueuedBytes` (`int`, optional): maximum number of bytes that
+          can be queued. Messages that would exceed this are rejected.
+          Defaults to `None`, meaning no limit.
+
+        * `highWaterMark` (`int`, optional): number of queued bytes above
+          which `backpressure` is `True`. Defaults to `None`, meaning half of
+          `maxQueuedBytes`, or four seconds of data if that isn't set.
+
+        * `send` (`Callable[[bytes], object]`, optional): function used to
+          send each packet. Defaults to `None`, meaning
+          `device.midiOutSysex`.
+
+        * `clock` (`Callable[[], int]`, optional): function returning the
+          current time in microseconds. Defaults to `None`, meaning the real
+          time.
+        """
+        if bytesPerSecond <= 0:
+            raise ValueError("bytesPerSecond must be positive")
+        if packetSize < 3:
+            raise ValueError("packetSize must be at least 3")
+        self.__rate = bytesPerSecond
+        self.__packet_size = packetSize
+        self.__burst = burstSize if burstSize is not None else packetSize
+        self.__max_queued = maxQueuedBytes
+        if highWaterMark is None:
+            highWaterMark = (
+                maxQueuedBytes // 2
+                if maxQueuedBytes is not None
+                else 4 * bytesPerSecond
+            )
+        self.__high_water = highWaterMark
+        self.__send = send if send is not None else _midi_out_sysex
+        self.__clock = clock if clock is not None else _now_us
+        self.__queue: deque[bytes] = deque()
+        self.__queued_bytes = 0
+        # Number of bytes that can be sent now, multiplied by 1,000,000 so
+        # that the time since the last tick can be added without rounding
+        self.__allowance = self.__burst * 1_000_000
+        self.__last_tick: int | None = None
+        self.__packets_sent = 0
+        self.__bytes_sent = 0
+        self.__rejected = 0
+
+    def __enqueue(self, packets: list[bytes]) -> bool:
+        size = sum(map(len, packets))
+        if (
+            self.__max_queued is not None
+            and self.__queued_bytes + size > self.__max_queued
+        ):
+            self.__rejected += 1
+            return False
+        self.__queue.extend(packets)
+        self.__queued_bytes += size
+        return True
+
+    def send(self, message: bytes) -> bool:
+        """
+        Queue a complete sysex message, to be sent as a single packet.
+
+        ### Args:
+        * `message` (`bytes`): sysex data, including the leading `0xF0` and
+          trailing `0xF7`.
+
+        ### Returns:
+        * `bool`: whether the message was queued, or `False` if the queue is
+          full.
+        """
+        return self.__enqueue([bytes(message)])
+
+    def sendChunked(self, header: bytes, payload: bytes) -> bool:
+        """
+        Queue a payload, split into as many packets as needed. Each packet
+        consists of the header, followed by the next part of the payload,
+        followed by `0xF7`.
+
+        Either all of the packets are queued, or none of them are.
+
+        ### Args:
+        * `header` (`bytes`): start of each packet, including the leading
+          `0xF0`.
+
+        * `payload` (`bytes`): data to send, which must not contain any bytes
+          above `0x7F`.
+
+        ### Returns:
+        * `bool`: whether the payload was queued, or `False` if the queue is
+          full.
+        """
+        header = bytes(header)
+        chunk_size = self.__packet_size - len(header) - 1
+        if chunk_size <= 0:
+            raise ValueError("Header is too long for the packet size")
+        payload = bytes(payload)
+        return self.__enqueue([
+            header + payload[i:i + chunk_size] + b'\xF7'
+            for i in range(0, len(payload), chunk_size)
+        ])
+
+    def tick(self) -> int:
+        """
+        Send as many queued packets as the rate limit allows. This should be
+        called regularly, for example from a timer.
+
+        ### Returns:
+        * `int`: number of packets sent.
+        """
+        now = self.__clock()
+        if self.__last_tick is not None:
+            elapsed = max(0, now - self.__last_tick)
+        else:
+            elapsed = 0
+        self.__last_tick = now
+        full = self.__burst * 1_000_000
+        allowance = min(self.__allowance + elapsed * self.__rate, full)
+        queue = self.__queue
+        send = self.__send
+        sent = 0
+        sent_bytes = 0
+        while queue:
+            cost = len(queue[0]) * 1_000_000
+            # A packet larger than the burst size can never fit within the
+            # allowance, so it is sent on its own once the allowance is full.
+            # The allowance then goes negative, delaying the next packet.
+            if cost > allowance and allowance < full:
+                break
+            packet = queue.popleft()
+            send(packet)
+            allowance -= cost
+            sent += 1
+            sent_bytes += len(packet)
+        self.__allowance = allowance
+        self.__queued_bytes -= sent_bytes
+        self.__packets_sent += sent
+        self.__bytes_sent += sent_bytes
+        return sent
+
+    def clear(self) -> None:
+        """
+        Discard all queued packets.
+        """
+        self.__queue.clear()
+        self.__queued_bytes = 0
+
+    @property
+    def queuedPackets(self) -> int:
+        """
+        Number of packets waiting to be sent.
+        """
+        return len(self.__queue)
+
+    @property
+    def queuedBytes(self) -> int:
+        """
+        Number of bytes waiting to be sent.
+        """
+        return self.__queued_bytes
+
+    @property
+    def backpressure(self) -> bool:
+        """
+        Whether the number of queued bytes is above the high water mark, in
+        which case the caller should avoid queuing more data.
+        """
+        return self.__queued_bytes > self.__high_water
+
+    @property
+    def drainTime(self) -> int:
+        """
+        Estimated time until all queued packets have been sent, in
+        microseconds.
+        """
+        return self.__queued_bytes * 1_000_000 // self.__rate
+
+    @property
+    def packetsSent(self) -> int:
+        """
+        Number of packets sent.
+        """
+        return self.__packets_sent
+
+    @property
+    def bytesSent(self) -> int:
+        """
+        Number of bytes sent.
+        """
+        return self.__bytes_sent
+
+    @property
+    def rejected(self) -> int:
+        """
+        Number of messages or payloads rejected because the queue was full.
+        """
+        return self.__rejected
@@ -0,0 +1,436 @@
+"""
+FL Sim > API profiler
+
+Counting of the calls a script makes to FL Studio's API modules.
+"""
+import json
+import sys
+import time
+from collections.abc import Callable, Iterable
+from importlib import import_module
+from types import ModuleType, TracebackType
+from typing import Any, NamedTuple, Self
+
+DEFAULT_MODULES = (
+    'mixer',
+    'channels',
+    'playlist',
+    'patterns',
+    'plugins',
+    'transport',
+    'ui',
+    'device',
+    'general',
+)
+"""
+Modules profiled by `ApiProfiler` by default.
+"""
+
+_NO_CALLBACK = '<none>'
+"""
+Name used for calls made outside of any callback, such as at import time.
+"""
+
+
+_READS = frozenset({
+    'channels.selectedChannel',
+    'device.findEventID',
+    'general.safeToEdit',
+    'patterns.patternMax',
+    'playlist.liveBlockNumToTime',
+    'playlist.liveTimeToBlockNum',
+})
+"""
+API functions that only read FL Studio's state, but whose names don't start
+with `get` or `is`.
+"""
+
+_OUTPUTS = frozenset({
+    'device.directFeedback',
+    'device.dispatch',
+    'device.midiOutMsg',
+    'device.midiOutNewMsg',
+    'device.midiOutSysex',
+    'device.sendMsgGeneric',
+    'ui.crDisplayRect',
+    'ui.miDisplayDockRect',
+    'ui.miDisplayRect',
+    'ui.setHintMsg',
+    'ui.showNotification',
+})
+"""
+API functions that produce output (such as MIDI messages sent to a device,
+or hints shown in FL Studio's interface), but don't change any state that
+can be read back through the API. They are neither reads nor writes, so
+they don't make earlier reads stale.
+
+Any API calls made by callbacks that these trigger (such as a script's
+`OnSysEx` receiving a dispatched message) are still counted separately.
+"""
+
+
+def _is_read(function: str) -> bool:
+    """
+    Returns whether the API function with the given name (eg
+    `'mixer.getTrackName'`) only reads FL Studio's state, so that calling it
+    twice in a row with the same arguments gives the same result.
+    """
+    if function in _READS:
+        return True
+    name = function.rpartition('.')[2]
+    if name.startswith(('get', 'is')):
+        return True
+    return (
+        name.endswith(('Count', 'Number'))
+        and not name.startswith('set')
+    )
+
+
+def _is_write(function: str) -> bool:
+    """
+    Returns whether the API function with the given name could change FL
+    Studio's state, making earlier reads stale.
+    """
+    return function not in _OUTPUTS and not _is_read(function)
+
+
+def _public_functions(module: ModuleType) -> list[str]:
+    names = getattr(module, '__all__', None)
+    if names is None:
+        names = [name for name in dir(module) if not name.startswith('_')]
+    return [
+        name for name in names
+        if callable(fn := getattr(module, name))
+        and not isinstance(fn, (type, ModuleType))
+    ]
+
+
+class ApiCallStats(NamedTuple):
+    """
+    Statistics for the calls to one API function from one callback.
+    """
+
+    calls: int
+    """
+    Number of calls.
+    """
+
+    redundant: int
+    """
+    Number of calls that repeated an earlier read with the same arguments,
+    within the same callback invocation, with no API calls that could have
+    changed the result in between.
+    """
+
+    time: int
+    """
+    Total time spent in the function, in nanoseconds.
+    """
+
+
+class ApiProfiler:
+    """
+    Counts the calls that a script makes to FL Studio's API modules, grouped
+    by the callback that made them.
+
+    When the profiler is installed, every public function of the profiled
+    modules is replaced by a wrapper which counts and times the call, and
+    records the call site (the file and line that called it). Any simulation
+    backends should be installed first, so that their functions are the ones
+    that are profiled.
+
+    The profiler also wraps a script, and should be used in place of it (for
+    example when creating an `EventLoop`), so that it knows which callback is
+    running. It can wrap another wrapper, such as a `CallbackProfiler`.
+
+    Reads (functions such as `mixer.getTrackName` or `channels.channelCount`)
+    that repeat an earlier read with the same arguments during the same
+    callback invocation are counted as redundant, unless a function that
+    could have changed FL Studio's state was called in between. Functions
+    that only produce output, such as `device.midiOutMsg` or
+    `ui.setHintMsg`, don't count as changes. Redundant reads are good
+    candidates for caching or for a batch call.
+
+    As with simulation backends, scripts must access functions through the
+    module (`import mixer`) for their calls to be profiled.
+
+    ### Example Usage
+
+    ```py
+    profiler = ApiProfiler(script)
+    loop = EventLoop(profiler)
+    with MixerSim(loop.notifier), profiler:
+        loop.start()
+        loop.runFor(60 * 1_000_000)
+        loop.stop()
+    for (callback, function), stats in profiler.stats.items():
+        print(callback, function, stats.calls, stats.redundant)
+    ```
+    """
+
+    def __init__(
+        self,
+        script: object,
+        modules: Iterable[str] = DEFAULT_MODULES,
+        callSites: bool = True,
+    ) -> None:
+        """
+        Create an `ApiProfiler`.
+
+        ### Args:
+        * `script` (`object`): script to profile, usually its entrypoint
+          module.
+
+        * `modules` (`Iterable[str]`, optional): names of the API modules to
+          profile. Defaults to `DEFAULT_MODULES`.
+
+        * `callSites` (`bool`, optional): whether to record the call site of
+          each call, which roughly doubles the overhead of the profiler.
+          Defaults to `True`.
+        """
+        self.__script = script
+        self.__modules = tuple(modules)
+        self.__call_sites = callSites
+        self.__saved: dict[tuple[str, str], object] | None = None
+        self.__wrapped_callbacks: dict[str, Callable[..., Any]] = {}
+        self.__callback = _NO_CALLBACK
+        self.__seen: dict[tuple[str, tuple[Any, ...]], int] = {}
+        self.__writes = 0
+        self.__invocations: dict[str, int] = {}
+        self.__stats: dict[tuple[str, str], list[int]] = {}
+        self.__sites: dict[tuple[str, str, int], int] = {}
+
+    # Script wrapper
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        # Only called for attributes that aren't found normally, so only
+        # callbacks are wrapped
+        if not name.startswith('On'):
+            raise AttributeError(name)
+        wrapped = self.__wrapped_callbacks.get(name)
+        if wrapped is None:
+            fn = getattr(self.__script, name)
+            wrapped = self.__wrap_callback(name, fn)
+            self.__wrapped_callbacks[name] = wrapped
+        return wrapped
+
+    def __wrap_callback(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+    ) -> Callable[..., Any]:
+        invocations = self.__invocations
+        invocations.setdefault(name, 0)
+
+        def wrapped(*args: Any) -> Any:
+            invocations[name] += 1
+            # Callbacks can be nested (eg `OnDirtyMixerTrack` is called while
+            # `OnControlChange` sets a volume), so save the outer state
+            outer = self.__callback, self.__seen
+            self.__callback = name
+            self.__seen = {}
+            try:
+                return fn(*args)
+            finally:
+                self.__callback, self.__seen = outer
+
+        return wrapped
+
+    # Installation
+
+    @property
+    def installed(self) -> bool:
+        """
+        Whether the profiler is currently installed.
+        """
+        return self.__saved is not None
+
+    def install(self) -> None:
+        """
+        Replace the public functions of the profiled modules with profiling
+        wrappers.
+        """
+        if self.__saved is not None:
+            raise RuntimeError("ApiProfiler is already installed")
+        saved: dict[tuple[str, str], object] = {}
+        for module_name in self.__modules:
+            module = import_module(module_name)
+            for name in _public_functions(module):
+                fn = getattr(module, name)
+                saved[module_name, name] = fn
+                setattr(
+                    module,
+                    name,
+                    self.__wrap_function(f"{module_name}.{name}", fn),
+                )
+        self.__saved = saved
+
+    def uninstall(self) -> None:
+        """
+        Restore the original functions of the profiled modules.
+        """
+        if self.__saved is None:
+            raise RuntimeError("ApiProfiler is not installed")
+        for (module_name, name), fn in self.__saved.items():
+            setattr(import_module(module_name), name, fn)
+        self.__saved = None
+
+    def __enter__(self) -> Self:
+        self.install()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.uninstall()
+
+    def __wrap_function(
+        self,
+        key: str,
+        fn: Callable[..., Any],
+    ) -> Callable[..., Any]:
+        is_read = _is_read(key)
+        is_write = _is_write(key)
+        all_stats = self.__stats
+        sites = self.__sites if self.__call_sites else None
+        clock = time.perf_counter_ns
+        get_frame = sys._getframe
+
+        def wrapped(*args: Any, **kwargs: Any) -> Any:
+            callback = self.__callback
+            stats = all_stats.get((callback, key))
+            if stats is None:
+                stats = all_stats[callback, key] = [0, 0, 0]
+            stats[0] += 1
+            if is_read:
+                # Map each read to the number of writes made before it, so
+                # that any write (even from a nested callback) makes earlier
+                # reads stale
+                seen = self.__seen
+                call = (key, args + tuple(kwargs.items()) if kwargs else args)
+                try:
+                    if seen.get(call) == self.__writes:
+                        stats[1] += 1
+                    else:
+                        seen[call] = self.__writes
+                except TypeError:
+                    # Unhashable arguments
+                    pass
+            elif is_write:
+                self.__writes += 1
+            if sites is not None:
+                frame = get_frame(1)
+                site = (key, frame.f_code.co_filename, frame.f_lineno)
+                sites[site] = sites.get(site, 0) + 1
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stats[2] += clock() - start
+
+        return wrapped
+
+    # Results
+
+    def reset(self) -> None:
+        """
+        Discard all of the statistics that have been collected.
+        """
+        for name in self.__invocations:
+            self.__invocations[name] = 0
+        self.__stats.clear()
+        self.__sites.clear()
+
+    @property
+    def invocations(self) -> dict[str, int]:
+        """
+        Number of times each callback has been invoked.
+        """
+        return dict(self.__invocations)
+
+    @property
+    def stats(self) -> dict[tuple[str, str], ApiCallStats]:
+        """
+        Statistics for each API function, keyed by `(callback, function)`,
+        where `function` is a qualified name, such as
+        `"mixer.getTrackName"`. Calls made outside of a callback use the
+        callback name `"<none>"`.
+        """
+        return {
+            key: ApiCallStats(*stats)
+            for key, stats in self.__stats.items()
+        }
+
+    def callSites(self, function: str) -> dict[tuple[str, int], int]:
+        """
+        Returns the number of calls made to an API function from each call
+        site.
+
+        ### Args:
+        * `function` (`str`): qualified name of the function, such as
+          `"mixer.getTrackName"`.
+
+        ### Returns:
+        * `dict[tuple[str, int], int]`: mapping from `(filename, line)` to
+          number of calls, from most to fewest calls.
+        """
+        sites = [
+            ((filename, line), count)
+            for (key, filename, line), count in self.__sites.items()
+            if key == function
+        ]
+        sites.sort(key=lambda site: site[1], reverse=True)
+        return dict(sites)
+
+    def report(self) -> dict[str, Any]:
+        """
+        Returns a summary of the calls made, suitable for converting to JSON.
+
+        ### Returns:
+        * `dict[str, Any]`: summary, with the following keys:
+
+              * `invocations`: the number of times each callback was invoked.
+              * `callbacks`: for each callback, the `calls`, `redundant`
+                calls, `perInvocation` (mean calls per invocation) and `time`
+                (in nanoseconds) of each function it called, from most to
+                fewest calls.
+              * `sites`: for each function, the number of calls from each
+                call site, as `"filename:line"`.
+        """
+        callbacks: dict[str, dict[str, dict[str, float]]] = {}
+        ordered = sorted(
+            self.__stats.items(), key=lambda item: item[1][0], reverse=True)
+        for (callback, function), (calls, redundant, ns) in ordered:
+            invocations = self.__invocations.get(callback, 0)
+            callbacks.setdefault(callback, {})[function] = {
+                'calls': calls,
+                'redundant': redundant,
+                'perInvocation': calls / invocations if invocations else 0.0,
+                'time': ns,
+            }
+        sites: dict[str, dict[str, int]] = {}
+        for (function, filename, line), count in sorted(
+            self.__sites.items(), key=lambda item: item[1], reverse=True,
+        ):
+            sites.setdefault(function, {})[f"{filename}:{line}"] = count
+        return {
+            'invocations': dict(sorted(self.__invocations.items())),
+            'callbacks': dict(sorted(callbacks.items())),
+            'sites': dict(sorted(sites.items())),
+        }
+
+    def toJson(self, indent: int | None = None) -> str:
+        """
+        Returns the summary given by `report` as JSON.
+
+        ### Args:
+        * `indent` (`int`, optional): indentation, as used by `json.dumps`.
+          Defaults to `None`, for compact output.
+
+        ### Returns:
+        * `str`: JSON summary.
+        """
+        return json.dumps(self.report(), indent=indent)
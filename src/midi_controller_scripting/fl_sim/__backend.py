@@ -0,0 +1,91 @@
+"""
+FL Sim > Backend
+
+Base class for simulations of FL Studio's API modules.
+"""
+from importlib import import_module
+from types import TracebackType
+from typing import Self
+
+
+class SimBackend:
+    """
+    Base class for a simulation of one of FL Studio's API modules.
+
+    Subclasses set `MODULE` to the name of the module they simulate, and
+    `FUNCTIONS` to the names of the functions they implement, each of which
+    must be a method of the subclass with the same name and signature.
+
+    When the backend is installed, those functions are replaced within the
+    module by the backend's methods, so scripts that call them (for example
+    `mixer.getTrackVolume(0)`) use the simulated state. Functions that the
+    backend doesn't implement keep their stub behavior.
+
+    Since functions are replaced on the module object, scripts must access
+    them through the module (`import mixer`) rather than importing them
+    directly (`from mixer import getTrackVolume`).
+
+    Backends can be used as context managers, which install them on entry
+    and uninstall them on exit.
+
+    ```py
+    with MixerSim(notifier):
+        script.OnInit()
+    ```
+    """
+
+    MODULE: str = ''
+    """
+    Name of the module that this backend simulates.
+    """
+
+    FUNCTIONS: tuple[str, ...] = ()
+    """
+    Names of the module functions that this backend implements.
+    """
+
+    def __init__(self) -> None:
+        self.__saved: dict[str, object] | None = None
+
+    @property
+    def installed(self) -> bool:
+        """
+        Whether the backend is currently installed.
+        """
+        return self.__saved is not None
+
+    def install(self) -> None:
+        """
+        Replace the module's functions with this backend's methods.
+        """
+        if self.__saved is not None:
+            raise RuntimeError(f"{type(self).__name__} is already installed")
+        module = import_module(self.MODULE)
+        self.__saved = {
+            name: getattr(module, name) for name in self.FUNCTIONS
+        }
+        for name in self.FUNCTIONS:
+            setattr(module, name, getattr(self, name))
+
+    def uninstall(self) -> None:
+        """
+        Restore the module's original functions.
+        """
+        if self.__saved is None:
+            raise RuntimeError(f"{type(self).__name__} is not installed")
+        module = import_module(self.MODULE)
+        for name, fn in self.__saved.items():
+            setattr(module, name, fn)
+        self.__saved = None
+
+    def __enter__(self) -> Self:
+        self.install()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.uninstall()
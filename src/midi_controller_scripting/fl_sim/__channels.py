@@ -0,0 +1,735 @@
+"""
+FL Sim > Channels
+
+Simulated state for the `channels` module, including the step sequencer.
+"""
+from array import array
+from collections.abc import Iterable
+
+import midi
+import utils
+
+from .__backend import SimBackend
+from .__notifier import ScriptNotifier
+
+_STEP_PARAM_DEFAULTS = (
+    60,  # pPitch
+    100,  # pVelocity
+    64,  # pRelease
+    120,  # pFinePitch
+    64,  # pPan
+    64,  # pModX
+    64,  # pModY
+    0,  # pShift
+)
+_STEP_PARAMS = len(_STEP_PARAM_DEFAULTS)
+_DEFAULT_PATTERN_LENGTH = 16
+
+_CHANNEL = midi.HW_ChannelEvent
+_PATTERNS = midi.HW_Dirty_Patterns
+
+
+class ChannelsSim(SimBackend):
+    """
+    Simulated state of FL Studio's channel rack and step sequencer.
+
+    Channel properties are stored in columns (one `array` or `bytearray` per
+    property, indexed by channel). The step sequencer grid is stored as one
+    packed bitset (a Python `int`, where bit `n` is step `n`) per channel and
+    pattern, and step parameters are stored in a typed array per channel and
+    pattern, which is only allocated once a parameter is changed.
+
+    When installed, the functions of the {{docs_url_mod[channels]}} module
+    read and write this state. Changes notify the script using
+    `OnDirtyChannel` (with a flag such as {{docs_url_attr[midi.CE_Select]}})
+    and `OnRefresh`. Grid changes are reported with
+    {{docs_url_attr[midi.HW_Dirty_Patterns]}}.
+
+    As well as the functions of the `channels` module, the simulation
+    provides bulk operations on whole rows of the grid, such as
+    `getGridRows` and `fillGridRow`, so that test code can set up or check
+    the state of the step sequencer in a single call.
+
+    Channel groups aren't simulated, so group indexes and global indexes are
+    the same, and `useGlobalIndex` arguments are ignored.
+
+    ### Example Usage
+
+    ```py
+    import channels
+
+    with ChannelsSim(notifier) as sim:
+        sim.fillGridRow(0, 4)  # Four-on-the-floor kick
+        assert channels.getGridBit(0, 4)
+        # Bits for the first 16 steps of channels 0 - 3
+        rows = sim.getGridRows(range(4), 0, 16)
+    ```
+    """
+
+    MODULE = 'channels'
+    FUNCTIONS = (
+        'channelCount',
+        'getChannelIndex',
+        'getChannelName',
+        'setChannelName',
+        'getChannelColor',
+        'setChannelColor',
+        'isChannelMuted',
+        'muteChannel',
+        'isChannelSolo',
+        'soloChannel',
+        'getChannelVolume',
+        'setChannelVolume',
+        'getChannelPan',
+        'setChannelPan',
+        'getTargetFxTrack',
+        'setTargetFxTrack',
+        'getRecEventId',
+        'selectedChannel',
+        'channelNumber',
+        'isChannelSelected',
+        'selectOneChannel',
+        'selectChannel',
+        'selectAll',
+        'deselectAll',
+        'getGridBit',
+        'getGridBitWithLoop',
+        'setGridBit',
+        'getStepParam',
+        'getCurrentStepParam',
+        'setStepParameterByIndex',
+    )
+
+    def __init__(
+        self,
+        notifier: ScriptNotifier | None = None,
+        channelCount: int = 16,
+        patternCount: int = 999,
+        stepCount: int = 128,
+    ) -> None:
+        """
+        Create a `ChannelsSim`, with all channels in their default state and
+        an empty step sequencer.
+
+        ### Args:
+        * `notifier` (`ScriptNotifier`, optional): notifier used to send
+          change notifications to the script. Defaults to `None`, meaning
+          that notifications are discarded.
+
+        * `channelCount` (`int`, optional): number of channels on the channel
+          rack. Defaults to `16`.
+
+        * `patternCount` (`int`, optional): number of patterns. Defaults to
+          `999`, which is the maximum in FL Studio.
+
+        * `stepCount` (`int`, optional): maximum number of steps in each
+          pattern. Defaults to `128`.
+        """
+        super().__init__()
+        n = channelCount
+        self.__count = n
+        self.__pattern_count = patternCount
+        self.__step_count = stepCount
+        self.__notifier = (
+            notifier if notifier is not None else ScriptNotifier(None)
+        )
+        self.__names = [f'Channel {i + 1}' for i in range(n)]
+        self.__color = array('q', bytes(8 * n))
+        self.__volume = array('d', [midi.ChannelDefaultVolume]) * n
+        self.__pan = array('d', bytes(8 * n))
+        self.__target_fx = array('i', bytes(4 * n))
+        self.__muted = bytearray(n)
+        self.__solo = bytearray(n)
+        self.__selected = bytearray(n)
+        # Grid rows, indexed by `(pattern - 1) * channelCount + channel`
+        self.__grid = [0] * (patternCount * n)
+        self.__step_params: dict[int, array[int]] = {}
+        self.__pattern_length = (
+            array('H', [_DEFAULT_PATTERN_LENGTH]) * patternCount)
+        self.__pattern = 1
+
+    def __check(self, index: int) -> None:
+        if not 0 <= index < self.__count:
+            raise IndexError(f"Channel index {index} out of range")
+
+    def __pattern_number(self, pattern: int) -> int:
+        """
+        Returns the given pattern number, where `-1` is the current pattern.
+        """
+        if pattern == -1:
+            return self.__pattern
+        if not 1 <= pattern <= self.__pattern_count:
+            raise IndexError(f"Pattern number {pattern} out of range")
+        return pattern
+
+    def __row(self, index: int, pattern: int) -> int:
+        """
+        Returns the position of a grid row, where a `pattern` of `-1` is the
+        current pattern.
+        """
+        self.__check(index)
+        return (self.__pattern_number(pattern) - 1) * self.__count + index
+
+    def __check_step(self, step: int, param: int = 0) -> None:
+        if not 0 <= step < self.__step_count:
+            raise IndexError(f"Step {step} out of range")
+        if not 0 <= param < _STEP_PARAMS:
+            raise IndexError(f"Step parameter {param} out of range")
+
+    def __check_window(self, start: int, count: int) -> None:
+        if start < 0 or count < 0 or start + count > self.__step_count:
+            raise IndexError("Grid window out of range")
+
+    def __set_channel_value(
+        self,
+        column: 'array[float]',
+        index: int,
+        value: float,
+    ) -> None:
+        self.__check(index)
+        if column[index] != value:
+            column[index] = value
+            self.__notifier.refresh(_CHANNEL)
+
+    def __set_row(self, position: int, bits: int) -> None:
+        if self.__grid[position] != bits:
+            self.__grid[position] = bits
+            self.__notifier.refresh(_PATTERNS)
+
+    # Simulation controls
+
+    @property
+    def pattern(self) -> int:
+        """
+        The current pattern number (1-indexed), which grid functions of the
+        `channels` module operate on.
+        """
+        return self.__pattern
+
+    @pattern.setter
+    def pattern(self, pattern: int) -> None:
+        if not 1 <= pattern <= self.__pattern_count:
+            raise IndexError(f"Pattern number {pattern} out of range")
+        if pattern != self.__pattern:
+            self.__pattern = pattern
+            self.__notifier.refresh(_PATTERNS)
+
+    def getPatternLength(self, pattern: int = -1) -> int:
+        """
+        Returns the length of a pattern in steps, which is used by
+        `getGridBitWithLoop`.
+
+        ### Args:
+        * `pattern` (`int`, optional): pattern number. Defaults to `-1`,
+          meaning the current pattern.
+
+        ### Returns:
+        * `int`: pattern length.
+        """
+        return self.__pattern_length[self.__pattern_number(pattern) - 1]
+
+    def setPatternLength(self, length: int, pattern: int = -1) -> None:
+        """
+        Sets the length of a pattern in steps.
+
+        ### Args:
+        * `length` (`int`): pattern length.
+
+        * `pattern` (`int`, optional): pattern number. Defaults to `-1`,
+          meaning the current pattern.
+        """
+        if not 1 <= length <= self.__step_count:
+            raise ValueError(f"Invalid pattern length {length}")
+        self.__pattern_length[self.__pattern_number(pattern) - 1] = length
+        self.__notifier.refresh(_PATTERNS)
+
+    # Bulk grid operations
+
+    def getGridRow(self, index: int, pattern: int = -1) -> int:
+        """
+        Returns all of the grid bits of a channel as a bitset, where bit `n`
+        is set if step `n` is enabled.
+
+        ### Args:
+        * `index` (`int`): channel index.
+
+        * `pattern` (`int`, optional): pattern number. Defaults to `-1`,
+          meaning the current pattern.
+
+        ### Returns:
+        * `int`: grid bits.
+        """
+        return self.__grid[self.__row(index, pattern)]
+
+    def setGridRow(self, index: int, bits: int, pattern: int = -1) -> None:
+        """
+        Replaces all of the grid bits of a channel.
+
+        ### Args:
+        * `index` (`int`): channel index.
+
+        * `bits` (`int`): grid bits, where bit `n` enables step `n`.
+
+        * `pattern` (`int`, optional): pattern number. Defaults to `-1`,
+          meaning the current pattern.
+        """
+        if bits < 0 or bits >> self.__step_count:
+            raise ValueError("Grid bits out of range")
+        self.__set_row(self.__row(index, pattern), bits)
+
+    def getGridRows(
+        self,
+        indexes: Iterable[int],
+        start: int,
+        count: int,
+        pattern: int = -1,
+    ) -> list[int]:
+        """
+        Returns a window of the grid for many channels at once, such as the
+        steps shown on a controller's pad grid.
+
+        ### Args:
+        * `indexes` (`Iterable[int]`): channel indexes.
+
+        * `start` (`int`): first step in the window.
+
+        * `count` (`int`): number of steps in the window.
+
+        * `pattern` (`int`, optional): pattern number. Defaults to `-1`,
+          meaning the current pattern.
+
+        ### Returns:
+        * `list[int]`: grid bits for each channel, where bit `n` is step
+          `start + n`.
+        """
+        self.__check_window(start, count)
+        grid = self.__grid
+        mask = (1 << count) - 1
+        return [
+            (grid[self.__row(index, pattern)] >> start) & mask
+            for index in indexes
+        ]
+
+    def setGridRows(
+        self,
+        indexes: Iterable[int],
+        start: int,
+        count: int,
+        rows: Iterable[int],
+        pattern: int = -1,
+    ) -> None:
+        """
+        Replaces a window of the grid for many channels at once. Steps
+        outside the window are unchanged.
+
+        ### Args:
+        * `indexes` (`Iterable[int]`): channel indexes.
+
+        * `start` (`int`): first step in the window.
+
+        * `count` (`int`): number of steps in the window.
+
+        * `rows` (`Iterable[int]`): grid bits for each channel, where bit `n`
+          is step `start + n`.
+
+        * `pattern` (`int`, optional): pattern number. Defaults to `-1`,
+          meaning the current pattern.
+        """
+        self.__check_window(start, count)
+        mask = ((1 << count) - 1) << start
+        grid = self.__grid
+        for index, bits in zip(indexes, rows, strict=True):
+            position = self.__row(index, pattern)
+            self.__set_row(
+                position,
+                (grid[position] & ~mask) | ((bits << start) & mask),
+            )
+
+    def fillGridRow(
+        self,
+        index: int,
+        interval: int,
+        offset: int = 0,
+        length: int = -1,
+        pattern: int = -1,
+    ) -> None:
+        """
+        Sets every `interval`th step of a channel, starting at `offset`, and
+        clears all other steps.
+
+        ### Args:
+        * `index` (`int`): channel index.
+
+        * `interval` (`int`): number of steps between each enabled step.
+
+        * `offset` (`int`, optional): first enabled step. Defaults to `0`.
+
+        * `length` (`int`, optional): number of steps to fill. Defaults to
+          `-1`, meaning the length of the pattern.
+
+        * `pattern` (`int`, optional): pattern number. Defaults to `-1`,
+          meaning the current pattern.
+        """
+        if interval < 1:
+            raise ValueError(f"Invalid interval {interval}")
+        if length == -1:
+            length = self.getPatternLength(pattern)
+        bits = 0
+        for step in range(offset, length, interval):
+            bits |= 1 << step
+        self.setGridRow(index, bits, pattern)
+
+    def getStepParamRow(
+        self,
+        index: int,
+        param: int,
+        pattern: int = -1,
+    ) -> 'array[int]':
+        """
+        Returns the value of a step parameter for every step of a channel.
+
+        ### Args:
+        * `index` (`int`): channel index.
+
+        * `param` (`int`): step parameter, such as
+          {{docs_url_attr[midi.pVelocity]}}.
+
+        * `pattern` (`int`, optional): pattern number. Defaults to `-1`,
+          meaning the current pattern.
+
+        ### Returns:
+        * `array[int]`: parameter value for each step.
+        """
+        self.__check_step(0, param)
+        params = self.__step_params.get(self.__row(index, pattern))
+        if params is None:
+            return array('H', [_STEP_PARAM_DEFAULTS[param]]) * (
+                self.__step_count)
+        return params[param::_STEP_PARAMS]
+
+    def setStepParamRow(
+        self,
+        index: int,
+        param: int,
+        values: Iterable[int],
+        pattern: int = -1,
+    ) -> None:
+        """
+        Sets the value of a step parameter for every step of a channel,
+        starting from the first step.
+
+        ### Args:
+        * `index` (`int`): channel index.
+
+        * `param` (`int`): step parameter, such as
+          {{docs_url_attr[midi.pVelocity]}}.
+
+        * `values` (`Iterable[int]`): parameter value for each step. If
+          fewer values than steps are given, the remaining steps are
+          unchanged.
+
+        * `pattern` (`int`, optional): pattern number. Defaults to `-1`,
+          meaning the current pattern.
+        """
+        self.__check_step(0, param)
+        row = array('H', values)
+        if len(row) > self.__step_count:
+            raise IndexError("Too many step parameter values")
+        params = self.__step_params_for(self.__row(index, pattern))
+        params[param:param + len(row) * _STEP_PARAMS:_STEP_PARAMS] = row
+        self.__notifier.refresh(_PATTERNS)
+
+    def __step_params_for(self, position: int) -> 'array[int]':
+        params = self.__step_params.get(position)
+        if params is None:
+            params = self.__step_params[position] = (
+                array('H', _STEP_PARAM_DEFAULTS) * self.__step_count)
+        return params
+
+    # Channel properties
+
+    def channelCount(self, globalCount: bool = False) -> int:
+        """Simulates {{docs_url_fn[channels.channelCount]}}."""
+        return self.__count
+
+    def getChannelIndex(self, index: int) -> int:
+        """Simulates {{docs_url_fn[channels.getChannelIndex]}}."""
+        self.__check(index)
+        return index
+
+    def getChannelName(self, index: int, useGlobalIndex: bool = False) -> str:
+        """Simulates {{docs_url_fn[channels.getChannelName]}}."""
+        self.__check(index)
+        return self.__names[index]
+
+    def setChannelName(
+        self,
+        index: int,
+        name: str,
+        useGlobalIndex: bool = False,
+    ) -> None:
+        """Simulates {{docs_url_fn[channels.setChannelName]}}."""
+        self.__check(index)
+        if self.__names[index] != name:
+            self.__names[index] = name
+            self.__notifier.dirtyChannel(
+                index, midi.CE_Rename, _CHANNEL | midi.HW_Dirty_Names)
+
+    def getChannelColor(self, index: int, useGlobalIndex: bool = False) -> int:
+        """Simulates {{docs_url_fn[channels.getChannelColor]}}."""
+        self.__check(index)
+        return self.__color[index]
+
+    def setChannelColor(
+        self,
+        index: int,
+        color: int,
+        useGlobalIndex: bool = False,
+    ) -> None:
+        """Simulates {{docs_url_fn[channels.setChannelColor]}}."""
+        self.__check(index)
+        if self.__color[index] != color:
+            self.__color[index] = color
+            self.__notifier.refresh(_CHANNEL | midi.HW_Dirty_Colors)
+
+    def isChannelMuted(self, index: int, useGlobalIndex: bool = False) -> bool:
+        """Simulates {{docs_url_fn[channels.isChannelMuted]}}."""
+        self.__check(index)
+        return bool(self.__muted[index])
+
+    def muteChannel(
+        self,
+        index: int,
+        value: int = -1,
+        useGlobalIndex: bool = False,
+    ) -> None:
+        """Simulates {{docs_url_fn[channels.muteChannel]}}."""
+        self.__check(index)
+        new = (not self.__muted[index]) if value < 0 else bool(value)
+        if new != self.__muted[index]:
+            self.__muted[index] = new
+            self.__notifier.refresh(_CHANNEL)
+
+    def isChannelSolo(self, index: int, useGlobalIndex: bool = False) -> bool:
+        """Simulates {{docs_url_fn[channels.isChannelSolo]}}."""
+        self.__check(index)
+        return bool(self.__solo[index])
+
+    def soloChannel(self, index: int, useGlobalIndex: bool = False) -> None:
+        """Simulates {{docs_url_fn[channels.soloChannel]}}."""
+        self.__check(index)
+        self.__solo[index] = not self.__solo[index]
+        self.__notifier.refresh(_CHANNEL)
+
+    def getChannelVolume(
+        self,
+        index: int,
+        mode: bool = False,
+        useGlobalIndex: bool = False,
+    ) -> float:
+        """Simulates {{docs_url_fn[channels.getChannelVolume]}}."""
+        self.__check(index)
+        if mode:
+            return utils.FaderTodB(self.__volume[index])
+        return self.__volume[index]
+
+    def setChannelVolume(
+        self,
+        index: int,
+        volume: float,
+        pickupMode: int = midi.PIM_None,
+        useGlobalIndex: bool = False,
+    ) -> None:
+        """Simulates {{docs_url_fn[channels.setChannelVolume]}}."""
+        self.__set_channel_value(
+            self.__volume, index, min(max(volume, 0.0), 1.0))
+
+    def getChannelPan(self, index: int, useGlobalIndex: bool = False) -> float:
+        """Simulates {{docs_url_fn[channels.getChannelPan]}}."""
+        self.__check(index)
+        return self.__pan[index]
+
+    def setChannelPan(
+        self,
+        index: int,
+        pan: float,
+        pickupMode: int = midi.PIM_None,
+        useGlobalIndex: bool = False,
+    ) -> None:
+        """Simulates {{docs_url_fn[channels.setChannelPan]}}."""
+        self.__set_channel_value(self.__pan, index, min(max(pan, -1.0), 1.0))
+
+    def getTargetFxTrack(
+        self,
+        index: int,
+        useGlobalIndex: bool = False,
+    ) -> int:
+        """Simulates {{docs_url_fn[channels.getTargetFxTrack]}}."""
+        self.__check(index)
+        return self.__target_fx[index]
+
+    def setTargetFxTrack(
+        self,
+        channelIndex: int,
+        mixerIndex: int,
+        useGlobalIndex: bool = False,
+    ) -> None:
+        """Simulates {{docs_url_fn[channels.setTargetFxTrack]}}."""
+        self.__check(channelIndex)
+        if self.__target_fx[channelIndex] != mixerIndex:
+            self.__target_fx[channelIndex] = mixerIndex
+            self.__notifier.refresh(_CHANNEL)
+
+    def getRecEventId(self, index: int, useGlobalIndex: bool = False) -> int:
+        """Simulates {{docs_url_fn[channels.getRecEventId]}}."""
+        self.__check(index)
+        return midi.EncodeRecEventID(midi.RecKind_Channel, index, 0, 0)
+
+    # Selection
+
+    def selectedChannel(
+        self,
+        canBeNone: bool = False,
+        offset: int = 0,
+        indexGlobal: bool = False,
+    ) -> int:
+        """Simulates {{docs_url_fn[channels.selectedChannel]}}."""
+        last = -1
+        for index, selected in enumerate(self.__selected):
+            if selected:
+                last = index
+                if offset == 0:
+                    return index
+                offset -= 1
+        if last == -1 and not canBeNone:
+            return 0
+        return last
+
+    def channelNumber(self, canBeNone: bool = False, offset: int = 0) -> int:
+        """Simulates {{docs_url_fn[channels.channelNumber]}}."""
+        return self.selectedChannel(canBeNone, offset, True)
+
+    def isChannelSelected(
+        self,
+        index: int,
+        useGlobalIndex: bool = False,
+    ) -> bool:
+        """Simulates {{docs_url_fn[channels.isChannelSelected]}}."""
+        self.__check(index)
+        return bool(self.__selected[index])
+
+    def selectOneChannel(
+        self,
+        index: int,
+        useGlobalIndex: bool = False,
+    ) -> None:
+        """Simulates {{docs_url_fn[channels.selectOneChannel]}}."""
+        self.__check(index)
+        self.__selected[:] = bytes(self.__count)
+        self.__selected[index] = 1
+        self.__notifier.dirtyChannel(-1, midi.CE_Select, _CHANNEL)
+
+    def selectChannel(
+        self,
+        index: int,
+        value: int = -1,
+        useGlobalIndex: bool = False,
+    ) -> None:
+        """Simulates {{docs_url_fn[channels.selectChannel]}}."""
+        self.__check(index)
+        new = (not self.__selected[index]) if value < 0 else bool(value)
+        if new != self.__selected[index]:
+            self.__selected[index] = new
+            self.__notifier.dirtyChannel(index, midi.CE_Select, _CHANNEL)
+
+    def selectAll(self) -> None:
+        """Simulates {{docs_url_fn[channels.selectAll]}}."""
+        self.__selected[:] = b'\x01' * self.__count
+        self.__notifier.dirtyChannel(-1, midi.CE_Select, _CHANNEL)
+
+    def deselectAll(self) -> None:
+        """Simulates {{docs_url_fn[channels.deselectAll]}}."""
+        self.__selected[:] = bytes(self.__count)
+        self.__notifier.dirtyChannel(-1, midi.CE_Select, _CHANNEL)
+
+    # Step sequencer
+
+    def getGridBit(
+        self,
+        index: int,
+        position: int,
+        useGlobalIndex: bool = False,
+    ) -> bool:
+        """Simulates {{docs_url_fn[channels.getGridBit]}}."""
+        self.__check_step(position)
+        return bool(self.__grid[self.__row(index, -1)] >> position & 1)
+
+    def getGridBitWithLoop(
+        self,
+        index: int,
+        position: int,
+        useGlobalIndex: bool = False,
+    ) -> bool:
+        """Simulates {{docs_url_fn[channels.getGridBitWithLoop]}}."""
+        position %= self.getPatternLength()
+        return bool(self.__grid[self.__row(index, -1)] >> position & 1)
+
+    def setGridBit(
+        self,
+        index: int,
+        position: int,
+        value: bool,
+        useGlobalIndex: bool = False,
+    ) -> None:
+        """Simulates {{docs_url_fn[channels.setGridBit]}}."""
+        self.__check_step(position)
+        row = self.__row(index, -1)
+        bits = self.__grid[row]
+        if value:
+            bits |= 1 << position
+        else:
+            bits &= ~(1 << position)
+        self.__set_row(row, bits)
+
+    def getStepParam(
+        self,
+        step: int,
+        param: int,
+        index: int,
+        startPos: int,
+        padsStride: int = 16,
+        useGlobalIndex: bool = False,
+    ) -> int:
+        """Simulates {{docs_url_fn[channels.getStepParam]}}."""
+        return self.getCurrentStepParam(index, step + startPos, param)
+
+    def getCurrentStepParam(
+        self,
+        index: int,
+        step: int,
+        param: int,
+        useGlobalIndex: bool = False,
+    ) -> int:
+        """Simulates {{docs_url_fn[channels.getCurrentStepParam]}}."""
+        self.__check_step(step, param)
+        params = self.__step_params.get(self.__row(index, -1))
+        if params is None:
+            return _STEP_PARAM_DEFAULTS[param]
+        return params[step * _STEP_PARAMS + param]
+
+    def setStepParameterByIndex(
+        self,
+        index: int,
+        patNum: int,
+        step: int,
+        param: int,
+        value: int,
+        useGlobalIndex: bool = False,
+    ) -> None:
+        """Simulates {{docs_url_fn[channels.setStepParameterByIndex]}}."""
+        self.__check_step(step, param)
+        params = self.__step_params_for(self.__row(index, patNum))
+        position = step * _STEP_PARAMS + param
+        if params[position] != value:
+            params[position] = value
+            self.__notifier.refresh(_PATTERNS)
@@ -0,0 +1,468 @@
+"""
+FL Sim > Dispatch
+
+A harness for testing scripts which communicate using `device.dispatch`,
+with each script running in its own process.
+"""
+import multiprocessing
+import time
+from collections.abc import Mapping, Sequence
+from importlib import import_module
+from multiprocessing.connection import Connection, wait
+from types import TracebackType
+from typing import Any, NamedTuple, Self
+
+from fl_classes import FlMidiMsg
+
+from .__backend import SimBackend
+from .__event_loop import EventLoop
+from .__latency import LatencyHistogram
+
+_HARDWARE = -1
+"""
+Source index used for messages sent by the harness itself, as if from a MIDI
+device.
+"""
+
+
+def _load_script(spec: str) -> object:
+    """
+    Load a script given as `"module"` or `"module:attribute"`. If the
+    attribute is a class, an instance of it is used.
+    """
+    module_name, _, attribute = spec.partition(':')
+    script: object = import_module(module_name)
+    if attribute:
+        script = getattr(script, attribute)
+        if isinstance(script, type):
+            script = script()
+    return script
+
+
+class _DispatchBackend(SimBackend):
+    """
+    Replaces the dispatch functions of the `device` module within a worker
+    process, sending dispatched messages to the harness.
+    """
+
+    MODULE = 'device'
+
+    FUNCTIONS = (
+        'dispatch',
+        'dispatchReceiverCount',
+        'dispatchGetReceiverPortNumber',
+        'getPortNumber',
+    )
+
+    def __init__(
+        self,
+        conn: Connection,
+        port: int,
+        receiverPorts: list[int],
+    ) -> None:
+        super().__init__()
+        self.__conn = conn
+        self.__port = port
+        self.__receiver_ports = receiverPorts
+
+    def dispatch(
+        self,
+        ctrlIndex: int,
+        message: int,
+        sysex: bytes | None = None,
+    ) -> None:
+        if not 0 <= ctrlIndex < len(self.__receiver_ports):
+            raise IndexError(f"Receiver index {ctrlIndex} out of range")
+        status = message & 0xFF
+        if status == 0xF0:
+            if sysex is None:
+                raise TypeError("Sysex data is required for sysex messages")
+            data: tuple[int, int, int, bytes | None] = (
+                0xF0, 0, 0, bytes(sysex))
+        else:
+            data = (status, message >> 8 & 0xFF, message >> 16 & 0xFF, None)
+        self.__conn.send(
+            ('dispatch', time.perf_counter_ns(), ctrlIndex) + data)
+
+    def dispatchReceiverCount(self) -> int:
+        return len(self.__receiver_ports)
+
+    def dispatchGetReceiverPortNumber(self, ctrlIndex: int) -> int:
+        return self.__receiver_ports[ctrlIndex]
+
+    def getPortNumber(self) -> int:
+        return self.__port
+
+
+def _worker(
+    conn: Connection,
+    spec: str,
+    port: int,
+    receiverPorts: list[int],
+) -> None:
+    """
+    Main function of each worker process.
+    """
+    _DispatchBackend(conn, port, receiverPorts).install()
+    try:
+        script = _load_script(spec)
+        loop = EventLoop(script)
+        loop.start()
+    except Exception as e:
+        conn.send(('failed', repr(e)))
+        return
+    conn.send(('ready',))
+    clock = time.perf_counter_ns
+    while True:
+        request = conn.recv()
+        if request[0] == 'stop':
+            loop.stop()
+            conn.send(('stopped',))
+            return
+        _, sent, source, status, data1, data2, sysex = request
+        received = clock()
+        try:
+            loop.receive(
+                FlMidiMsg(sysex) if sysex is not None
+                else FlMidiMsg(status, data1, data2)
+            )
+        except Exception as e:
+            conn.send(('error', repr(e)))
+        conn.send(('ack', sent, source, received, clock()))
+
+
+class DispatchStats(NamedTuple):
+    """
+    Statistics for the messages dispatched to one receiver script.
+    """
+
+    messages: int
+    """
+    Number of dispatched messages handled by the receiver.
+    """
+
+    latency: LatencyHistogram
+    """
+    Time from each call to `device.dispatch` until the receiver finished
+    handling the message, in nanoseconds.
+    """
+
+    throughput: float
+    """
+    Messages handled per second, from when the first message was dispatched
+    until the last message was handled.
+    """
+
+
+class DispatchHarness:
+    """
+    Runs several scripts, each in its own worker process, and routes the
+    messages they send using `device.dispatch` between them.
+
+    Each script is given as the name of a module, such as
+    `"device_MyController"`, or as `"module:attribute"` to use an object
+    within a module (if the attribute is a class, an instance of it is
+    created). Scripts must be importable by the worker processes.
+
+    `routes` maps the index of each sending script to the indexes of the
+    scripts it can dispatch to, replacing FL Studio's `receiveFrom`
+    comments. In the sending script, `device.dispatch(i, ...)` sends to the
+    `i`th receiver in its route, and `device.dispatchReceiverCount` and
+    `device.dispatchGetReceiverPortNumber` describe its route.
+
+    Messages are sent to the scripts as if from their MIDI devices using
+    `send` and `sendSysex`. Each script handles one message at a time, passing
+    it through its chain of MIDI callbacks as in an `EventLoop`. The harness
+    measures the time from each call to `device.dispatch` until the receiver
+    has finished handling the message. Since the processes share the system's
+    monotonic clock, these times are comparable across processes.
+
+    ### Example Usage
+
+    ```py
+    with DispatchHarness(
+        ['device_MyController', 'device_MyExtender', 'device_MyExtender'],
+        routes={0: [1, 2]},
+    ) as harness:
+        for i in range(1000):
+            harness.send(0, 0xB0, 7, i % 128)
+        harness.settle()
+        for receiver, stats in harness.stats().items():
+            print(receiver, stats.latency.percentile(99), stats.throughput)
+    ```
+    """
+
+    def __init__(
+        self,
+        scripts: Sequence[str],
+        routes: Mapping[int, Sequence[int]],
+        ports: Sequence[int] | None = None,
+        maxInFlight: int = 64,
+        startMethod: str | None = None,
+    ) -> None:
+        """
+        Create a `DispatchHarness`. The worker processes are started by
+        `start`.
+
+        ### Args:
+        * `scripts` (`Sequence[str]`): scripts to load.
+
+        * `routes` (`Mapping[int, Sequence[int]]`): mapping from the index
+          of each sending script to the indexes of its receivers.
+
+        * `ports` (`Sequence[int]`, optional): MIDI port number of each
+          script. Defaults to `None`, meaning each script's index.
+
+        * `maxInFlight` (`int`, optional): maximum number of messages sent
+          using `send` or `sendSysex` that can be waiting to be handled
+          before sending blocks. This keeps the pipes between processes from
+          filling up. Defaults to `64`.
+
+        * `startMethod` (`str`, optional): `multiprocessing` start method to
+          use. Defaults to `None`, meaning the platform's default.
+        """
+        count = len(scripts)
+        if ports is None:
+            ports = range(count)
+        if len(ports) != count:
+            raise ValueError("There must be one port for each script")
+        for sender, receivers in routes.items():
+            for index in (sender, *receivers):
+                if not 0 <= index < count:
+                    raise ValueError(f"Script index {index} out of range")
+        self.__scripts = list(scripts)
+        self.__routes = {
+            sender: list(receivers) for sender, receivers in routes.items()
+        }
+        self.__ports = list(ports)
+        self.__max_in_flight = maxInFlight
+        # Typeshed's BaseContext doesn't include the Process type
+        self.__context: Any = multiprocessing.get_context(startMethod)
+        self.__conns: list[Connection] = []
+        self.__processes: list[Any] = []
+        self.__outstanding = 0
+        self.__errors: list[tuple[int, str]] = []
+        self.__latency: dict[int, LatencyHistogram] = {}
+        self.__first_sent: dict[int, int] = {}
+        self.__last_done: dict[int, int] = {}
+
+    # Lifecycle
+
+    def start(self) -> None:
+        """
+        Start a worker process for each script, and wait for them to be
+        initialized.
+        """
+        if self.__processes:
+            raise RuntimeError("The harness is already running")
+        for index, spec in enumerate(self.__scripts):
+            conn, child_conn = self.__context.Pipe()
+            receiver_ports = [
+                self.__ports[receiver]
+                for receiver in self.__routes.get(index, ())
+            ]
+            process = self.__context.Process(
+                target=_worker,
+                args=(child_conn, spec, self.__ports[index], receiver_ports),
+                name=f"DispatchHarness-{index}",
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self.__conns.append(conn)
+            self.__processes.append(process)
+        for index in range(len(self.__conns)):
+            try:
+                reply = self.__recv(index)
+            except RuntimeError:
+                self.__terminate()
+                raise
+            if reply[0] != 'ready':
+                self.__terminate()
+                raise RuntimeError(
+                    f"Failed to load {self.__scripts[index]!r}: {reply[1]}")
+
+    def stop(self) -> None:
+        """
+        De-initialize each script, then wait for the worker processes to
+        exit.
+        """
+        if not self.__processes:
+            raise RuntimeError("The harness isn't running")
+        self.settle()
+        for conn in self.__conns:
+            conn.send(('stop',))
+        for index in range(len(self.__conns)):
+            while (reply := self.__recv(index))[0] != 'stopped':
+                self.__handle(index, reply)
+        for process in self.__processes:
+            process.join()
+        self.__close()
+
+    def __recv(self, index: int) -> tuple[Any, ...]:
+        try:
+            return self.__conns[index].recv()
+        except EOFError:
+            raise RuntimeError(
+                f"Worker process for {self.__scripts[index]!r} exited"
+            ) from None
+
+    def __terminate(self) -> None:
+        for process in self.__processes:
+            process.terminate()
+            process.join()
+        self.__close()
+
+    def __close(self) -> None:
+        for conn in self.__conns:
+            conn.close()
+        self.__conns = []
+        self.__processes = []
+        self.__outstanding = 0
+
+    def __enter__(self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.stop()
+        elif self.__processes:
+            self.__terminate()
+
+    # Sending
+
+    def __deliver(
+        self,
+        index: int,
+        sent: int,
+        source: int,
+        status: int,
+        data1: int,
+        data2: int,
+        sysex: bytes | None,
+    ) -> None:
+        self.__conns[index].send(
+            ('midi', sent, source, status, data1, data2, sysex))
+        self.__outstanding += 1
+
+    def send(self, index: int, status: int, data1: int, data2: int) -> None:
+        """
+        Send a standard MIDI message to a script, as if from its device.
+
+        ### Args:
+        * `index` (`int`): index of script.
+
+        * `status` (`int`): status byte.
+
+        * `data1` (`int`): data1 byte.
+
+        * `data2` (`int`): data2 byte.
+        """
+        while self.__outstanding >= self.__max_in_flight:
+            self.__pump()
+        self.__deliver(
+            index, time.perf_counter_ns(), _HARDWARE,
+            status, data1, data2, None,
+        )
+
+    def sendSysex(self, index: int, data: bytes) -> None:
+        """
+        Send a sysex message to a script, as if from its device.
+
+        ### Args:
+        * `index` (`int`): index of script.
+
+        * `data` (`bytes`): sysex data, including the leading `0xF0` and
+          trailing `0xF7`.
+        """
+        while self.__outstanding >= self.__max_in_flight:
+            self.__pump()
+        self.__deliver(
+            index, time.perf_counter_ns(), _HARDWARE,
+            0xF0, 0, 0, bytes(data),
+        )
+
+    # Routing
+
+    def __handle(self, index: int, reply: tuple[Any, ...]) -> None:
+        kind = reply[0]
+        if kind == 'dispatch':
+            _, sent, ctrl_index, status, data1, data2, sysex = reply
+            target = self.__routes[index][ctrl_index]
+            self.__deliver(
+                target, sent, index, status, data1, data2, sysex)
+        elif kind == 'ack':
+            _, sent, source, _, done = reply
+            self.__outstanding -= 1
+            if source != _HARDWARE:
+                latency = self.__latency.get(index)
+                if latency is None:
+                    latency = self.__latency[index] = LatencyHistogram()
+                    self.__first_sent[index] = sent
+                latency.record(done - sent)
+                self.__last_done[index] = done
+        elif kind == 'error':
+            self.__errors.append((index, reply[1]))
+
+    def __pump(self, timeout: float | None = None) -> None:
+        ready = wait(self.__conns, timeout)
+        if not ready:
+            raise TimeoutError("Timed out waiting for scripts")
+        for conn in ready:
+            assert isinstance(conn, Connection)
+            index = self.__conns.index(conn)
+            self.__handle(index, self.__recv(index))
+
+    def settle(self, timeout: float = 10.0) -> None:
+        """
+        Wait until every message (including any messages dispatched as a
+        result) has been handled.
+
+        ### Args:
+        * `timeout` (`float`, optional): maximum time to wait for each reply
+          from a script, in seconds. Defaults to `10.0`.
+        """
+        while self.__outstanding:
+            self.__pump(timeout)
+
+    # Results
+
+    @property
+    def errors(self) -> list[tuple[int, str]]:
+        """
+        Exceptions raised by the scripts' callbacks, as the index of the
+        script and a description of the exception.
+        """
+        return list(self.__errors)
+
+    def stats(self) -> dict[int, DispatchStats]:
+        """
+        Returns statistics for the messages dispatched to each receiver.
+
+        ### Returns:
+        * `dict[int, DispatchStats]`: mapping from index of receiver script
+          to statistics.
+        """
+        result = {}
+        for index, latency in sorted(self.__latency.items()):
+            elapsed = self.__last_done[index] - self.__first_sent[index]
+            result[index] = DispatchStats(
+                latency.count,
+                latency,
+                latency.count * 1e9 / elapsed if elapsed > 0 else 0.0,
+            )
+        return result
+
+    def resetStats(self) -> None:
+        """
+        Discard the statistics that have been collected.
+        """
+        self.__latency.clear()
+        self.__first_sent.clear()
+        self.__last_done.clear()
@@ -0,0 +1,448 @@
+"""
+FL Sim > Event loop
+
+A headless event loop which calls a script's callbacks on a virtual clock.
+"""
+import heapq
+from collections.abc import Callable, Iterable
+from functools import partial
+
+import midi
+from fl_classes import FlMidiMsg
+
+from .__notifier import ScriptNotifier
+
+_PRIORITY_ACTION = 0
+_PRIORITY_MIDI = 1
+_PRIORITY_IDLE = 2
+_PRIORITY_METERS = 3
+_PRIORITY_BEAT = 4
+
+_MS = 1_000
+"""
+Number of microseconds in a millisecond.
+"""
+
+_CHANNEL_CALLBACKS = {
+    midi.MIDI_NOTEOFF: 'OnNoteOff',
+    midi.MIDI_NOTEON: 'OnNoteOn',
+    midi.MIDI_KEYAFTERTOUCH: 'OnKeyPressure',
+    midi.MIDI_CONTROLCHANGE: 'OnControlChange',
+    midi.MIDI_PROGRAMCHANGE: 'OnProgramChange',
+    midi.MIDI_CHANAFTERTOUCH: 'OnChannelPressure',
+    midi.MIDI_PITCHBEND: 'OnPitchBend',
+}
+"""
+Callbacks for each kind of channel message, called if `OnMidiMsg` doesn't
+handle the message.
+"""
+
+
+class EventLoop:
+    """
+    Calls a script's callbacks in the same way that FL Studio does, but on a
+    virtual clock, so that hours of activity can be simulated in seconds.
+
+    Time is measured in whole microseconds from when the loop was created,
+    so runs are exactly reproducible. Events are processed in order of time.
+    Events scheduled for the same time are processed in this order, with
+    ties broken by the order they were scheduled in:
+
+    1. Actions scheduled with `schedule`.
+    2. Incoming MIDI messages.
+    3. `OnRefresh` (for any changes that have been made), then `OnIdle`.
+    4. `OnUpdateMeters`.
+    5. `OnUpdateBeatIndicator`.
+
+    Incoming MIDI messages pass through `OnMidiIn`, then `OnMidiMsg`, then
+    `OnSysEx` or the callback for their type (such as `OnNoteOn`), stopping
+    once a callback sets `msg.handled`.
+
+    Callbacks that the script doesn't define are skipped.
+
+    ### Example Usage
+
+    ```py
+    import device_MyController as script
+
+    loop = EventLoop(script)
+    loop.start()
+    # Press a pad every second for an hour
+    for second in range(3600):
+        loop.scheduleMidi(second * 1_000_000, 0x99, 36, 127)
+    loop.runFor(3600 * 1_000_000)
+    loop.stop()
+    ```
+    """
+
+    def __init__(
+        self,
+        script: object,
+        notifier: ScriptNotifier | None = None,
+        idleInterval: int = 20 * _MS,
+        meterInterval: int = 50 * _MS,
+    ) -> None:
+        """
+        Create an `EventLoop`.
+
+        ### Args:
+        * `script` (`object`): script to run, usually its entrypoint module.
+
+        * `notifier` (`ScriptNotifier`, optional): notifier shared with any
+          simulation backends, which is flushed before each call to
+          `OnIdle`. Defaults to `None`, meaning that a new notifier is
+          created for the script.
+
+        * `idleInterval` (`int`, optional): time between calls to `OnIdle`,
+          in microseconds. Defaults to 20 ms.
+
+        * `meterInterval` (`int`, optional): time between calls to
+          `OnUpdateMeters`, in microseconds. Defaults to 50 ms.
+        """
+        if idleInterval <= 0 or meterInterval <= 0:
+            raise ValueError("Intervals must be positive")
+        self.__notifier = (
+            notifier if notifier is not None else ScriptNotifier(script)
+        )
+        self.__idle_interval = idleInterval
+        self.__meter_interval = meterInterval
+        self.__now = 0
+        self.__seq = 0
+        self.__queue: list[tuple[int, int, int, Callable[[], object]]] = []
+        self.__running = False
+        self.__tempo = 120.0
+        self.__beats_per_bar = 4
+        self.__beat = 0
+        self.__beat_start = 0
+        self.__beat_generation = 0
+
+    @property
+    def notifier(self) -> ScriptNotifier:
+        """
+        The notifier used to deliver `OnRefresh` to the script.
+        """
+        return self.__notifier
+
+    @property
+    def now(self) -> int:
+        """
+        The current virtual time, in microseconds.
+        """
+        return self.__now
+
+    @property
+    def running(self) -> bool:
+        """
+        Whether the script has been initialized with `start`, and not yet
+        de-initialized with `stop`.
+        """
+        return self.__running
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of events waiting in the queue, including the next periodic
+        callbacks.
+        """
+        return len(self.__queue)
+
+    def call(self, name: str, *args: object) -> bool:
+        """
+        Call one of the script's callbacks, if it is defined.
+
+        ### Args:
+        * `name` (`str`): name of callback, such as `"OnIdle"`.
+
+        * `*args` (`object`): arguments to the callback.
+
+        ### Returns:
+        * `bool`: whether the callback was defined.
+        """
+        fn = self.__notifier.callback(name)
+        if fn is None:
+            return False
+        fn(*args)
+        return True
+
+    def __push(
+        self,
+        time: int,
+        priority: int,
+        action: Callable[[], object],
+    ) -> None:
+        if time < self.__now:
+            raise ValueError(
+                f"Can't schedule an event in the past ({time} < {self.__now})"
+            )
+        heapq.heappush(self.__queue, (time, priority, self.__seq, action))
+        self.__seq += 1
+
+    # Lifecycle
+
+    def start(self) -> None:
+        """
+        Initialize the script by calling `OnInit`, then start calling the
+        periodic callbacks.
+        """
+        if self.__running:
+            raise RuntimeError("The script is already running")
+        self.__running = True
+        self.call('OnInit')
+        self.__notifier.flush()
+        self.__push(
+            self.__now + self.__idle_interval, _PRIORITY_IDLE, self.__idle)
+        self.__push(
+            self.__now + self.__meter_interval,
+            _PRIORITY_METERS,
+            self.__meters,
+        )
+
+    def stop(self) -> None:
+        """
+        De-initialize the script by calling `OnDeInit`. Any events that are
+        still queued are discarded.
+        """
+        if not self.__running:
+            raise RuntimeError("The script isn't running")
+        self.__running = False
+        self.__queue.clear()
+        self.call('OnDeInit')
+
+    # Scheduling
+
+    def schedule(self, time: int, action: Callable[[], object]) -> None:
+        """
+        Schedule a function to be called at the given time, for example to
+        change the state of a simulation backend as if the user had done so.
+
+        ### Args:
+        * `time` (`int`): virtual time, in microseconds.
+
+        * `action` (`Callable[[], object]`): function to call.
+        """
+        self.__push(time, _PRIORITY_ACTION, action)
+
+    def scheduleMidi(
+        self,
+        time: int,
+        status: int,
+        data1: int,
+        data2: int,
+    ) -> None:
+        """
+        Schedule a MIDI message to be received at the given time.
+
+        ### Args:
+        * `time` (`int`): virtual time, in microseconds.
+
+        * `status` (`int`): status byte.
+
+        * `data1` (`int`): data1 byte.
+
+        * `data2` (`int`): data2 byte.
+        """
+        self.__push(
+            time,
+            _PRIORITY_MIDI,
+            partial(self.__receive_standard, status, data1, data2),
+        )
+
+    def scheduleSysex(self, time: int, data: 'bytes | list[int]') -> None:
+        """
+        Schedule a system-exclusive message to be received at the given time.
+
+        ### Args:
+        * `time` (`int`): virtual time, in microseconds.
+
+        * `data` (`bytes | list[int]`): sysex data, including the leading
+          `0xF0` and trailing `0xF7`.
+        """
+        self.__push(
+            time,
+            _PRIORITY_MIDI,
+            partial(self.__receive_sysex, bytes(data)),
+        )
+
+    def scheduleMidiMany(
+        self,
+        events: Iterable[tuple[int, int, int, int]],
+    ) -> None:
+        """
+        Schedule many MIDI messages at once.
+
+        ### Args:
+        * `events` (`Iterable[tuple[int, int, int, int]]`): events, as
+          `(time, status, data1, data2)` tuples.
+        """
+        for time, status, data1, data2 in events:
+            self.scheduleMidi(time, status, data1, data2)
+
+    def scheduleMessages(
+        self,
+        events: Iterable[tuple[int, FlMidiMsg]],
+    ) -> None:
+        """
+        Schedule a stream of `FlMidiMsg` objects to be received at the given
+        times, for example to replay a recording.
+
+        Events are taken from `events` one at a time, as each message is
+        received, so it can be a generator over a recording that is too large
+        to fit in the loop's queue.
+
+        ### Args:
+        * `events` (`Iterable[tuple[int, FlMidiMsg]]`): events, as
+          `(time, msg)` tuples, in order of time.
+        """
+        events = iter(events)
+
+        def deliver(msg: FlMidiMsg) -> None:
+            self.receive(msg)
+            schedule_next()
+
+        def schedule_next() -> None:
+            event = next(events, None)
+            if event is not None:
+                time, msg = event
+                self.__push(time, _PRIORITY_MIDI, partial(deliver, msg))
+
+        schedule_next()
+
+    def __receive_standard(self, status: int, data1: int, data2: int) -> None:
+        self.receive(FlMidiMsg(status, data1, data2))
+
+    def __receive_sysex(self, data: bytes) -> None:
+        self.receive(FlMidiMsg(data))
+
+    def receive(self, msg: FlMidiMsg) -> None:
+        """
+        Deliver a MIDI message to the script immediately, passing it through
+        the chain of MIDI callbacks until one of them handles it.
+
+        ### Args:
+        * `msg` (`FlMidiMsg`): message to deliver.
+        """
+        call = self.call
+        call('OnMidiIn', msg)
+        if msg.handled:
+            return
+        call('OnMidiMsg', msg)
+        if msg.handled:
+            return
+        if msg.status == midi.MIDI_BEGINSYSEX:
+            call('OnSysEx', msg)
+        else:
+            name = _CHANNEL_CALLBACKS.get(msg.status & 0xF0)
+            if name is not None:
+                call(name, msg)
+
+    # Transport
+
+    def setPlaying(
+        self,
+        playing: bool,
+        tempo: float = 120.0,
+        beatsPerBar: int = 4,
+    ) -> None:
+        """
+        Start or stop the simulated transport. While playing, the beat
+        indicator is updated using `OnUpdateBeatIndicator`, with `1` at the
+        start of each bar, `2` at the start of each other beat, and `0` half
+        way through each beat.
+
+        ### Args:
+        * `playing` (`bool`): whether the transport is playing.
+
+        * `tempo` (`float`, optional): tempo, in beats per minute. Defaults
+          to `120.0`.
+
+        * `beatsPerBar` (`int`, optional): number of beats in each bar.
+          Defaults to `4`.
+        """
+        # Cancel any beat updates that were scheduled for the previous state
+        self.__beat_generation += 1
+        if not playing:
+            self.call('OnUpdateBeatIndicator', 0)
+            return
+        self.__tempo = tempo
+        self.__beats_per_bar = beatsPerBar
+        self.__beat = 0
+        self.__beat_start = self.__now
+        self.__push(self.__now, _PRIORITY_BEAT, self.__beat_action())
+
+    def __half_beat_time(self, half_beats: int) -> int:
+        return self.__beat_start + round(half_beats * 30_000_000 / self.__tempo)
+
+    def __beat_action(self) -> Callable[[], None]:
+        generation = self.__beat_generation
+
+        def action() -> None:
+            if generation != self.__beat_generation:
+                return
+            half_beat = self.__beat
+            if half_beat % 2:
+                value = 0
+            elif half_beat // 2 % self.__beats_per_bar == 0:
+                value = 1
+            else:
+                value = 2
+            self.call('OnUpdateBeatIndicator', value)
+            self.__beat += 1
+            self.__push(
+                self.__half_beat_time(self.__beat),
+                _PRIORITY_BEAT,
+                action,
+            )
+
+        return action
+
+    # Periodic callbacks
+
+    def __idle(self) -> None:
+        self.__notifier.flush()
+        self.call('OnIdle')
+        self.__push(
+            self.__now + self.__idle_interval, _PRIORITY_IDLE, self.__idle)
+
+    def __meters(self) -> None:
+        self.call('OnUpdateMeters')
+        self.__push(
+            self.__now + self.__meter_interval,
+            _PRIORITY_METERS,
+            self.__meters,
+        )
+
+    # Running
+
+    def runUntil(self, time: int) -> int:
+        """
+        Process all events up to and including the given time, then advance
+        the clock to it.
+
+        ### Args:
+        * `time` (`int`): virtual time to run until, in microseconds.
+
+        ### Returns:
+        * `int`: number of events processed.
+        """
+        queue = self.__queue
+        count = 0
+        while queue and queue[0][0] <= time:
+            event_time, _, _, action = heapq.heappop(queue)
+            self.__now = event_time
+            action()
+            count += 1
+        self.__now = max(self.__now, time)
+        return count
+
+    def runFor(self, duration: int) -> int:
+        """
+        Process all events in the given amount of time from now.
+
+        ### Args:
+        * `duration` (`int`): amount of virtual time to run for, in
+          microseconds.
+
+        ### Returns:
+        * `int`: number of events processed.
+        """
+        return self.runUntil(self.__now + duration)
@@ -0,0 +1,104 @@
+"""
+{{module_title[fl_sim]}}
+
+This module contains simulations of FL Studio's state, which can be used to
+run and load-test scripts outside of FL Studio.
+
+NOTE: This module is not included in FL Studio's runtime, and should only be
+used by test and benchmarking code, never by the script itself.
+
+Each simulation backend stores the state of one of FL Studio's API modules.
+When a backend is installed, the functions of that module read and write the
+simulated state instead of returning placeholder values, and changes are
+reported to the script through its callbacks.
+
+```py
+import mixer
+import device_MyController as script
+from fl_sim import MixerSim, ScriptNotifier
+
+notifier = ScriptNotifier(script)
+with MixerSim(notifier):
+    script.OnInit()
+    mixer.setTrackVolume(1, 0.5)
+    notifier.flush()
+```
+
+## Contents
+
+* {{docs_url_page("Notifier", "midi_controller_scripting/fl_sim/notifier")}}:
+  the `ScriptNotifier` type, which delivers change notifications to scripts.
+
+* {{docs_url_page("Backend", "midi_controller_scripting/fl_sim/backend")}}:
+  the `SimBackend` base type, which installs simulations into API modules.
+
+* {{docs_url_page("Mixer", "midi_controller_scripting/fl_sim/mixer")}}:
+  the `MixerSim` type, which simulates the mixer.
+
+* {{docs_url_page("Channels", "midi_controller_scripting/fl_sim/channels")}}:
+  the `ChannelsSim` type, which simulates the channel rack and step
+  sequencer.
+
+* {{docs_url_page("Event loop", "midi_controller_scripting/fl_sim/event loop")}}:
+  the `EventLoop` type, which runs a script's callbacks on a virtual clock.
+
+* {{docs_url_page("Latency", "midi_controller_scripting/fl_sim/latency")}}:
+  the `CallbackProfiler` type, which measures the time taken by a script's
+  callbacks.
+
+* {{docs_url_page("API profiler", "midi_controller_scripting/fl_sim/api profiler")}}:
+  the `ApiProfiler` type, which counts the calls a script makes to FL
+  Studio's API modules.
+
+* {{docs_url_page("Recording", "midi_controller_scripting/fl_sim/recording")}}:
+  the `MidiRecorder` and `MidiReplayer` types, which record the MIDI
+  messages delivered to a script, and replay them.
+
+* {{docs_url_page("Loopback", "midi_controller_scripting/fl_sim/loopback")}}:
+  the `MidiLoopback` type, which records the messages a script sends to its
+  device.
+
+* {{docs_url_page("Refresh thread", "midi_controller_scripting/fl_sim/refresh thread")}}:
+  the `RefreshThreadSim` type, which runs `OnRefresh` on a background
+  thread.
+
+* {{docs_url_page("Dispatch", "midi_controller_scripting/fl_sim/dispatch")}}:
+  the `DispatchHarness` type, which runs several scripts in separate
+  processes and routes `device.dispatch` messages between them.
+"""
+from .__api_profiler import ApiCallStats, ApiProfiler
+from .__backend import SimBackend
+from .__channels import ChannelsSim
+from .__dispatch import DispatchHarness, DispatchStats
+from .__event_loop import EventLoop
+from .__latency import (
+    BudgetViolation,
+    CallbackProfiler,
+    LatencyHistogram,
+)
+from .__loopback import LoopbackMessage, MidiLoopback
+from .__mixer import MixerSim
+from .__notifier import ScriptNotifier
+from .__recording import MidiRecord, MidiRecorder, MidiReplayer
+from .__refresh_thread import RefreshThreadSim
+
+__all__ = [
+    'ScriptNotifier',
+    'SimBackend',
+    'MixerSim',
+    'ChannelsSim',
+    'EventLoop',
+    'LatencyHistogram',
+    'BudgetViolation',
+    'CallbackProfiler',
+    'ApiCallStats',
+    'ApiProfiler',
+    'MidiRecord',
+    'MidiRecorder',
+    'MidiReplayer',
+    'LoopbackMessage',
+    'MidiLoopback',
+    'RefreshThreadSim',
+    'DispatchStats',
+    'DispatchHarness',
+]
@@ -0,0 +1,434 @@
+"""
+FL Sim > Latency
+
+Measurement of the time taken by a script's callbacks.
+"""
+import json
+import time
+from array import array
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+from fl_classes import FlMidiMsg
+
+_SUB_BUCKET_BITS = 6
+"""
+Number of bits of precision kept for each value in a histogram, giving a
+relative error of at most 1 / 2 ** (_SUB_BUCKET_BITS - 1), about 3%.
+"""
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+_HALF_SUB_BUCKETS = _SUB_BUCKETS >> 1
+_MAX_SHIFT = 64 - _SUB_BUCKET_BITS
+_BUCKET_COUNT = (_MAX_SHIFT + 2) * _HALF_SUB_BUCKETS
+
+_DEFAULT_BUDGETS = {
+    'OnIdle': 5_000_000,
+    'OnMidiIn': 1_000_000,
+}
+"""
+Default time budgets, in nanoseconds.
+"""
+
+_MSG_CALLBACKS = frozenset({
+    'OnMidiIn',
+    'OnMidiMsg',
+    'OnSysEx',
+    'OnNoteOn',
+    'OnNoteOff',
+    'OnControlChange',
+    'OnProgramChange',
+    'OnPitchBend',
+    'OnKeyPressure',
+    'OnChannelPressure',
+    'OnMidiOutMsg',
+})
+"""
+Callbacks which are given an `FlMidiMsg`.
+"""
+
+
+class LatencyHistogram:
+    """
+    A histogram of durations, in the style of an HDR histogram.
+
+    Values are stored in buckets whose width grows with the magnitude of the
+    value, so that every value is recorded with a relative error of about
+    3%, using a fixed amount of memory no matter how many values are
+    recorded or how large they are. Recording a value takes constant time.
+
+    The minimum, maximum and mean are tracked exactly.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create an empty `LatencyHistogram`.
+        """
+        self.__counts = array('Q', bytes(8 * _BUCKET_COUNT))
+        self.__count = 0
+        self.__total = 0
+        self.__min = 0
+        self.__max = 0
+
+    @staticmethod
+    def __bucket(value: int) -> int:
+        shift = value.bit_length() - _SUB_BUCKET_BITS
+        if shift <= 0:
+            return value
+        return shift * _HALF_SUB_BUCKETS + (value >> shift)
+
+    @staticmethod
+    def __bucket_value(bucket: int) -> int:
+        """
+        Returns the highest value that is recorded in the given bucket.
+        """
+        if bucket < _SUB_BUCKETS:
+            return bucket
+        shift, mantissa = divmod(bucket, _HALF_SUB_BUCKETS)
+        # Undo the offset applied in `__bucket`
+        shift -= 1
+        mantissa += _HALF_SUB_BUCKETS
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value: int) -> None:
+        """
+        Record a duration.
+
+        ### Args:
+        * `value` (`int`): duration, in nanoseconds. Negative values are
+          recorded as `0`.
+        """
+        if value < 0:
+            value = 0
+        self.__counts[self.__bucket(value)] += 1
+        if self.__count == 0 or value < self.__min:
+            self.__min = value
+        if value > self.__max:
+            self.__max = value
+        self.__count += 1
+        self.__total += value
+
+    @property
+    def count(self) -> int:
+        """
+        Number of values recorded.
+        """
+        return self.__count
+
+    @property
+    def min(self) -> int:
+        """
+        Smallest value recorded, or `0` if none have been recorded.
+        """
+        return self.__min
+
+    @property
+    def max(self) -> int:
+        """
+        Largest value recorded, or `0` if none have been recorded.
+        """
+        return self.__max
+
+    @property
+    def mean(self) -> float:
+        """
+        Mean of the values recorded, or `0.0` if none have been recorded.
+        """
+        return self.__total / self.__count if self.__count else 0.0
+
+    def percentile(self, percentile: float) -> int:
+        """
+        Returns the value at the given percentile.
+
+        ### Args:
+        * `percentile` (`float`): percentile, from `0` to `100`.
+
+        ### Returns:
+        * `int`: the highest value in the bucket containing the percentile,
+          capped at the largest value recorded.
+        """
+        if not 0 <= percentile <= 100:
+            raise ValueError(f"Invalid percentile {percentile}")
+        if self.__count == 0:
+            return 0
+        target = max(1, -(-self.__count * percentile // 100))
+        seen = 0
+        for bucket, count in enumerate(self.__counts):
+            seen += count
+            if seen >= target:
+                return min(self.__bucket_value(bucket), self.__max)
+        return self.__max
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """
+        Add all of the values recorded by another histogram to this one.
+
+        ### Args:
+        * `other` (`LatencyHistogram`): histogram to merge.
+        """
+        if other.__count == 0:
+            return
+        for bucket, count in enumerate(other.__counts):
+            if count:
+                self.__counts[bucket] += count
+        if self.__count == 0 or other.__min < self.__min:
+            self.__min = other.__min
+        self.__max = max(self.__max, other.__max)
+        self.__count += other.__count
+        self.__total += other.__total
+
+    def summary(self) -> dict[str, int]:
+        """
+        Returns a summary of the histogram, in nanoseconds.
+
+        ### Returns:
+        * `dict[str, int]`: the `count`, `p50`, `p99` and `max` of the
+          histogram.
+        """
+        return {
+            'count': self.__count,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'max': self.__max,
+        }
+
+
+class BudgetViolation(NamedTuple):
+    """
+    A callback invocation which took longer than its budget.
+    """
+
+    callback: str
+    """
+    Name of the callback.
+    """
+
+    invocation: int
+    """
+    Number of times the callback had been called before this invocation.
+    """
+
+    duration: int
+    """
+    Time taken by the invocation, in nanoseconds.
+    """
+
+    budget: int
+    """
+    Budget for the callback, in nanoseconds.
+    """
+
+
+class CallbackProfiler:
+    """
+    Measures the time taken by a script's callbacks.
+
+    The profiler wraps a script, and can be used anywhere that the script
+    can, for example when creating a `ScriptNotifier` or `EventLoop`. Each
+    `On*` callback accessed through the profiler is timed, and recorded in a
+    `LatencyHistogram` for that callback. Callbacks that receive MIDI
+    messages are also recorded in a histogram for the type of message (the
+    status byte, ignoring the channel).
+
+    Invocations that take longer than the budget for their callback are
+    recorded as `BudgetViolation`s. By default, `OnIdle` has a budget of
+    5 ms, and `OnMidiIn` has a budget of 1 ms.
+
+    Durations are measured using the real (not virtual) time taken by each
+    call.
+
+    ### Example Usage
+
+    ```py
+    profiler = CallbackProfiler(script, budgets={'OnIdle': 2_000_000})
+    loop = EventLoop(profiler)
+    loop.start()
+    loop.runFor(60 * 1_000_000)
+    loop.stop()
+    with open('latency.json', 'w') as f:
+        f.write(profiler.toJson(indent=2))
+    assert not profiler.violations
+    ```
+    """
+
+    def __init__(
+        self,
+        script: object,
+        budgets: dict[str, int] | None = None,
+        maxViolations: int = 1000,
+    ) -> None:
+        """
+        Create a `CallbackProfiler`.
+
+        ### Args:
+        * `script` (`object`): script to profile, usually its entrypoint
+          module.
+
+        * `budgets` (`dict[str, int]`, optional): mapping from callback names
+          to time budgets, in nanoseconds. Defaults to `None`, meaning the
+          default budgets for `OnIdle` and `OnMidiIn`.
+
+        * `maxViolations` (`int`, optional): maximum number of budget
+          violations to keep. Later violations are only counted. Defaults to
+          `1000`.
+        """
+        self.__script = script
+        self.__budgets = dict(
+            _DEFAULT_BUDGETS if budgets is None else budgets)
+        self.__max_violations = maxViolations
+        self.__callbacks: dict[str, LatencyHistogram] = {}
+        self.__statuses: dict[str, dict[int, LatencyHistogram]] = {}
+        self.__violations: list[BudgetViolation] = []
+        self.__violation_counts: dict[str, int] = {}
+        self.__wrapped: dict[str, Callable[..., Any]] = {}
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        # Only called for attributes that aren't found normally, so only
+        # callbacks are wrapped
+        if not name.startswith('On'):
+            raise AttributeError(name)
+        wrapped = self.__wrapped.get(name)
+        if wrapped is None:
+            fn = getattr(self.__script, name)
+            wrapped = self.__wrapped[name] = self.__wrap(name, fn)
+        return wrapped
+
+    def __wrap(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+    ) -> Callable[..., Any]:
+        histogram = self.__callbacks.setdefault(name, LatencyHistogram())
+        statuses = (
+            self.__statuses.setdefault(name, {})
+            if name in _MSG_CALLBACKS
+            else None
+        )
+        budget = self.__budgets.get(name)
+        clock = time.perf_counter_ns
+
+        def wrapped(*args: Any) -> Any:
+            start = clock()
+            try:
+                return fn(*args)
+            finally:
+                elapsed = clock() - start
+                histogram.record(elapsed)
+                if statuses is not None and args:
+                    self.__record_status(statuses, args[0], elapsed)
+                if budget is not None and elapsed > budget:
+                    self.__violation(
+                        name, histogram.count - 1, elapsed, budget)
+
+        return wrapped
+
+    @staticmethod
+    def __record_status(
+        statuses: dict[int, LatencyHistogram],
+        msg: FlMidiMsg,
+        elapsed: int,
+    ) -> None:
+        status = msg.status
+        if status < 0xF0:
+            status &= 0xF0
+        histogram = statuses.get(status)
+        if histogram is None:
+            histogram = statuses[status] = LatencyHistogram()
+        histogram.record(elapsed)
+
+    def __violation(
+        self,
+        name: str,
+        invocation: int,
+        elapsed: int,
+        budget: int,
+    ) -> None:
+        self.__violation_counts[name] = (
+            self.__violation_counts.get(name, 0) + 1)
+        if len(self.__violations) < self.__max_violations:
+            self.__violations.append(
+                BudgetViolation(name, invocation, elapsed, budget))
+
+    @property
+    def histograms(self) -> dict[str, LatencyHistogram]:
+        """
+        Histogram of durations for each callback that has been accessed.
+        """
+        return dict(self.__callbacks)
+
+    def statusHistograms(self, callback: str) -> dict[int, LatencyHistogram]:
+        """
+        Returns the histograms of durations for each type of MIDI message
+        given to a callback.
+
+        ### Args:
+        * `callback` (`str`): name of callback, such as `"OnMidiIn"`.
+
+        ### Returns:
+        * `dict[int, LatencyHistogram]`: mapping from status byte (with the
+          channel removed) to histogram.
+        """
+        return dict(self.__statuses.get(callback, {}))
+
+    @property
+    def violations(self) -> list[BudgetViolation]:
+        """
+        Invocations that exceeded their budget, up to the maximum number of
+        violations kept.
+        """
+        return list(self.__violations)
+
+    @property
+    def violationCounts(self) -> dict[str, int]:
+        """
+        Total number of budget violations for each callback.
+        """
+        return dict(self.__violation_counts)
+
+    def report(self) -> dict[str, Any]:
+        """
+        Returns a summary of the measurements, suitable for converting to
+        JSON. All durations are in nanoseconds.
+
+        ### Returns:
+        * `dict[str, Any]`: summary, with the following keys:
+
+              * `callbacks`: summary of each callback's histogram.
+              * `statuses`: summary of each MIDI callback's histograms, keyed
+                by status byte as a hex string (eg `"0x90"`).
+              * `budgets`: the budget for each callback.
+              * `violations`: the number of budget violations for each
+                callback.
+        """
+        return {
+            'callbacks': {
+                name: histogram.summary()
+                for name, histogram in sorted(self.__callbacks.items())
+                if histogram.count
+            },
+            'statuses': {
+                name: {
+                    f'0x{status:02X}': histogram.summary()
+                    for status, histogram in sorted(statuses.items())
+                }
+                for name, statuses in sorted(self.__statuses.items())
+                if statuses
+            },
+            'budgets': dict(sorted(self.__budgets.items())),
+            'violations': {
+                name: self.__violation_counts.get(name, 0)
+                for name in sorted(self.__budgets)
+            },
+        }
+
+    def toJson(self, indent: int | None = None) -> str:
+        """
+        Returns the summary given by `report` as JSON.
+
+        ### Args:
+        * `indent` (`int`, optional): indentation, as used by `json.dumps`.
+          Defaults to `None`, for compact output.
+
+        ### Returns:
+        * `str`: JSON summary.
+        """
+        return json.dumps(self.report(), indent=indent)
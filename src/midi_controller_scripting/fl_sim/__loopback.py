@@ -0,0 +1,203 @@
+"""
+FL Sim > Loopback
+
+An in-process sink for the MIDI messages a script sends to its device.
+"""
+import time
+from collections.abc import Callable
+from typing import NamedTuple
+
+from .__backend import SimBackend
+
+
+class LoopbackMessage(NamedTuple):
+    """
+    A message received by a `MidiLoopback`.
+    """
+
+    time: int
+    """
+    Time at which the message was sent, in microseconds.
+    """
+
+    data: bytes
+    """
+    Bytes of the message.
+    """
+
+    dropped: bool
+    """
+    Whether the message overflowed the simulated output buffer, and so would
+    have been lost by a real device.
+    """
+
+
+def _now_us() -> int:
+    return time.perf_counter_ns() // 1000
+
+
+class MidiLoopback(SimBackend):
+    """
+    Records the MIDI messages that a script sends to its device, along with
+    the time each was sent.
+
+    When installed, `device.midiOutMsg` and `device.midiOutSysex` send their
+    messages to the loopback instead of discarding them.
+
+    The loopback can also model the output buffer of a MIDI interface, which
+    is drained at a fixed rate (by default the 3125 bytes per second of a
+    5-pin DIN MIDI connection). Messages which don't fit in the buffer are
+    marked as dropped, which makes it possible to test whether a script sends
+    data faster than a device can accept it.
+
+    ### Example Usage
+
+    ```py
+    loop = EventLoop(script)
+    with MidiLoopback(clock=lambda: loop.now, bufferSize=256) as out:
+        loop.start()
+        loop.runFor(10_000_000)
+        loop.stop()
+    assert out.dropped == 0
+    ```
+    """
+
+    MODULE = 'device'
+
+    FUNCTIONS = (
+        'midiOutMsg',
+        'midiOutSysex',
+    )
+
+    def __init__(
+        self,
+        clock: Callable[[], int] | None = None,
+        bufferSize: int | None = None,
+        drainRate: int = 3125,
+    ) -> None:
+        """
+        Create a `MidiLoopback`.
+
+        ### Args:
+        * `clock` (`Callable[[], int]`, optional): function returning the
+          current time in microseconds, such as `lambda: loop.now` for an
+          `EventLoop`. Defaults to `None`, meaning the real time.
+
+        * `bufferSize` (`int`, optional): size of the simulated output
+          buffer, in bytes. Defaults to `None`, meaning that the buffer is
+          unlimited.
+
+        * `drainRate` (`int`, optional): rate at which the output buffer is
+          drained, in bytes per second. Defaults to `3125`.
+        """
+        super().__init__()
+        if drainRate <= 0:
+            raise ValueError("drainRate must be positive")
+        self.__clock = clock if clock is not None else _now_us
+        self.__buffer_size = bufferSize
+        self.__drain_rate = drainRate
+        self.__messages: list[LoopbackMessage] = []
+        # Fill level of the buffer, in bytes multiplied by 1,000,000
+        self.__level = 0
+        self.__peak_level = 0
+        self.__last_time = 0
+        self.__dropped = 0
+
+    def __receive(self, data: bytes) -> None:
+        now = self.__clock()
+        size = len(data)
+        dropped = False
+        if self.__buffer_size is not None:
+            drained = max(0, now - self.__last_time) * self.__drain_rate
+            level = max(0, self.__level - drained)
+            if level + size * 1_000_000 > self.__buffer_size * 1_000_000:
+                dropped = True
+                self.__dropped += 1
+            else:
+                level += size * 1_000_000
+                self.__peak_level = max(self.__peak_level, level)
+            self.__level = level
+        self.__last_time = now
+        self.__messages.append(LoopbackMessage(now, data, dropped))
+
+    @property
+    def messages(self) -> list[LoopbackMessage]:
+        """
+        Messages that have been sent, in the order they were sent.
+        """
+        return list(self.__messages)
+
+    @property
+    def dropped(self) -> int:
+        """
+        Number of messages that overflowed the simulated output buffer.
+        """
+        return self.__dropped
+
+    @property
+    def peakBufferLevel(self) -> int:
+        """
+        Largest number of bytes held in the simulated output buffer.
+        """
+        return -(-self.__peak_level // 1_000_000)
+
+    @property
+    def bytesReceived(self) -> int:
+        """
+        Total number of bytes sent.
+        """
+        return sum(len(message.data) for message in self.__messages)
+
+    def peakRate(self, window: int = 1_000_000) -> int:
+        """
+        Returns the largest number of bytes sent within any period of the
+        given length.
+
+        ### Args:
+        * `window` (`int`, optional): length of period, in microseconds.
+          Defaults to one second.
+
+        ### Returns:
+        * `int`: number of bytes.
+        """
+        messages = self.__messages
+        peak = 0
+        total = 0
+        start = 0
+        for message in messages:
+            total += len(message.data)
+            while message.time - messages[start].time >= window:
+                total -= len(messages[start].data)
+                start += 1
+            peak = max(peak, total)
+        return peak
+
+    def clear(self) -> None:
+        """
+        Discard the recorded messages, and empty the simulated output buffer.
+        """
+        self.__messages.clear()
+        self.__level = 0
+        self.__peak_level = 0
+        self.__dropped = 0
+
+    # device module
+
+    def midiOutMsg(
+        self,
+        message: int,
+        channel: int = -1,
+        data1: int = -1,
+        data2: int = -1,
+    ) -> None:
+        """Simulates {{docs_url_fn[device.midiOutMsg]}}."""
+        if channel != -1:
+            # Message given as components
+            message = (message << 4 | channel) | data1 << 8 | data2 << 16
+        status = message & 0xFF
+        size = 2 if status & 0xF0 in (0xC0, 0xD0) else 3
+        self.__receive(message.to_bytes(3, 'little')[:size])
+
+    def midiOutSysex(self, message: bytes) -> None:
+        """Simulates {{docs_url_fn[device.midiOutSysex]}}."""
+        self.__receive(bytes(message))
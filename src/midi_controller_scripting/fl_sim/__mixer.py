@@ -0,0 +1,580 @@
+"""
+FL Sim > Mixer
+
+Simulated state for the `mixer` module.
+"""
+from array import array
+
+import midi
+import utils
+
+from .__backend import SimBackend
+from .__notifier import ScriptNotifier
+
+_DEFAULT_VOLUME = 0.8
+_DEFAULT_ROUTE_LEVEL = 0.8
+_DEFAULT_EQ_GAIN = 0.5
+_DEFAULT_EQ_FREQUENCIES = (0.25, 0.5, 0.75)
+_DEFAULT_EQ_BANDWIDTH = 0.5
+_EQ_BANDS = len(_DEFAULT_EQ_FREQUENCIES)
+_SLOTS = 10
+
+_EQ_GAIN_RANGE_DB = 36.0
+"""
+Range of the EQ gain knobs (-18 dB to +18 dB).
+"""
+_EQ_MIN_FREQ_HZ = 10.0
+_EQ_MAX_FREQ_HZ = 16000.0
+
+_CONTROLS = midi.HW_Dirty_Mixer_Controls
+_DISPLAY = midi.HW_Dirty_Mixer_Display
+_SELECTION = midi.HW_Dirty_Mixer_Sel
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    return low if value < low else high if value > high else value
+
+
+class MixerSim(SimBackend):
+    """
+    Simulated state of FL Studio's mixer.
+
+    The properties of all tracks are stored in columns (one `array` or
+    `bytearray` per property, indexed by track), rather than one object per
+    track, so reading a property is a single index operation, and the
+    simulation uses a few kilobytes no matter how many tracks there are.
+
+    When installed, the functions of the {{docs_url_mod[mixer]}} module read
+    and write this state. Changes made through setters notify the script
+    using `OnDirtyMixerTrack`, and collect the matching `OnRefresh` flags in
+    the `ScriptNotifier`. Setting a property to its current value doesn't
+    send a notification.
+
+    This is a model of FL Studio's behavior, not an exact copy of it. For
+    example, soloing a track doesn't mute other tracks, and pickup modes are
+    ignored.
+
+    ### Example Usage
+
+    ```py
+    import mixer
+
+    notifier = ScriptNotifier(script)
+    with MixerSim(notifier) as sim:
+        mixer.setTrackVolume(1, 0.5)  # Calls script.OnDirtyMixerTrack(1)
+        notifier.flush()  # Calls script.OnRefresh(HW_Dirty_Mixer_Controls)
+    ```
+    """
+
+    MODULE = 'mixer'
+    FUNCTIONS = (
+        'trackCount',
+        'getTrackInfo',
+        'getTrackName',
+        'setTrackName',
+        'getTrackColor',
+        'setTrackColor',
+        'getSlotColor',
+        'setSlotColor',
+        'isTrackArmed',
+        'armTrack',
+        'isTrackSolo',
+        'soloTrack',
+        'isTrackEnabled',
+        'enableTrack',
+        'isTrackMuted',
+        'muteTrack',
+        'isTrackMuteLock',
+        'getTrackVolume',
+        'setTrackVolume',
+        'getTrackPan',
+        'setTrackPan',
+        'getTrackStereoSep',
+        'setTrackStereoSep',
+        'setRouteTo',
+        'setRouteToLevel',
+        'getRouteToLevel',
+        'getRouteSendActive',
+        'afterRoutingChanged',
+        'getTrackPeaks',
+        'isTrackSlotsEnabled',
+        'enableTrackSlots',
+        'isTrackRevPolarity',
+        'revTrackPolarity',
+        'isTrackSwapChannels',
+        'swapTrackChannels',
+        'getEqBandCount',
+        'getEqGain',
+        'setEqGain',
+        'getEqFrequency',
+        'setEqFrequency',
+        'getEqBandwidth',
+        'setEqBandwidth',
+        'trackNumber',
+        'setTrackNumber',
+        'isTrackSelected',
+        'selectTrack',
+        'selectAll',
+        'deselectAll',
+        'setActiveTrack',
+    )
+
+    def __init__(
+        self,
+        notifier: ScriptNotifier | None = None,
+        trackCount: int = 127,
+    ) -> None:
+        """
+        Create a `MixerSim`, with all tracks in their default state.
+
+        ### Args:
+        * `notifier` (`ScriptNotifier`, optional): notifier used to send
+          change notifications to the script. Defaults to `None`, meaning
+          that notifications are discarded.
+
+        * `trackCount` (`int`, optional): number of mixer tracks, including
+          the master and "current" tracks. Defaults to `127`.
+        """
+        super().__init__()
+        if trackCount < 3:
+            raise ValueError("The mixer needs at least 3 tracks")
+        n = trackCount
+        self.__count = n
+        self.__notifier = (
+            notifier if notifier is not None else ScriptNotifier(None)
+        )
+        self.__names = [''] * n
+        self.__color = array('q', bytes(8 * n))
+        self.__slot_color = array('q', bytes(8 * n * _SLOTS))
+        self.__volume = array('d', [_DEFAULT_VOLUME]) * n
+        self.__pan = array('d', bytes(8 * n))
+        self.__sep = array('d', bytes(8 * n))
+        self.__peaks = array('d', bytes(8 * 2 * n))
+        self.__eq_gain = array('d', [_DEFAULT_EQ_GAIN]) * (n * _EQ_BANDS)
+        self.__eq_freq = array('d', _DEFAULT_EQ_FREQUENCIES) * n
+        self.__eq_bandwidth = (
+            array('d', [_DEFAULT_EQ_BANDWIDTH]) * (n * _EQ_BANDS))
+        self.__muted = bytearray(n)
+        self.__solo = bytearray(n)
+        self.__armed = bytearray(n)
+        self.__mute_lock = bytearray(n)
+        self.__slots_enabled = bytearray(b'\x01') * n
+        self.__rev_polarity = bytearray(n)
+        self.__swap_channels = bytearray(n)
+        self.__selected = bytearray(n)
+        # Routing matrix, indexed by `source * n + dest`
+        self.__route = bytearray(n * n)
+        self.__route_level = array('d', [_DEFAULT_ROUTE_LEVEL]) * (n * n)
+        self.__routing_changed = False
+        self.__active = 0
+
+    def __check(self, index: int) -> None:
+        if not 0 <= index < self.__count:
+            raise IndexError(f"Mixer track index {index} out of range")
+
+    def __check_band(self, index: int, band: int) -> int:
+        self.__check(index)
+        if not 0 <= band < _EQ_BANDS:
+            raise IndexError(f"EQ band {band} out of range")
+        return index * _EQ_BANDS + band
+
+    def __check_slot(self, index: int, slot: int) -> int:
+        self.__check(index)
+        if not 0 <= slot < _SLOTS:
+            raise IndexError(f"Mixer slot {slot} out of range")
+        return index * _SLOTS + slot
+
+    def __set_value(
+        self,
+        column: 'array[float]',
+        position: int,
+        index: int,
+        value: float,
+    ) -> None:
+        if column[position] != value:
+            column[position] = value
+            self.__notifier.dirtyMixerTrack(index, _CONTROLS)
+
+    def __set_flag(
+        self,
+        column: bytearray,
+        index: int,
+        value: int,
+        flags: int = _CONTROLS,
+    ) -> None:
+        """
+        Set a flag, where negative values toggle it.
+        """
+        self.__check(index)
+        old = column[index]
+        new = (not old) if value < 0 else bool(value)
+        if new != old:
+            column[index] = new
+            self.__notifier.dirtyMixerTrack(index, flags)
+
+    def markAllDirty(
+        self,
+        flags: int = _CONTROLS | _DISPLAY | _SELECTION,
+    ) -> None:
+        """
+        Notify the script that all tracks have changed, as FL Studio does
+        when a project is loaded.
+
+        ### Args:
+        * `flags` (`int`, optional): `OnRefresh` flags to send. Defaults to
+          all mixer flags.
+        """
+        self.__notifier.dirtyMixerTrack(-1, flags)
+
+    def setTrackPeaks(self, index: int, left: float, right: float) -> None:
+        """
+        Set the peak levels of a track, as returned by `getTrackPeaks`. This
+        doesn't notify the script, since FL Studio reports peaks using
+        `OnUpdateMeters` instead.
+
+        ### Args:
+        * `index` (`int`): track index.
+
+        * `left` (`float`): peak of left channel.
+
+        * `right` (`float`): peak of right channel.
+        """
+        self.__check(index)
+        self.__peaks[2 * index] = left
+        self.__peaks[2 * index + 1] = right
+
+    # Properties
+
+    def trackCount(self) -> int:
+        """Simulates {{docs_url_fn[mixer.trackCount]}}."""
+        return self.__count
+
+    def getTrackInfo(self, mode: int) -> int:
+        """Simulates {{docs_url_fn[mixer.getTrackInfo]}}."""
+        if mode == midi.TN_Master:
+            return 0
+        if mode == midi.TN_FirstIns:
+            return 1
+        if mode == midi.TN_LastIns:
+            return self.__count - 2
+        if mode == midi.TN_Sel:
+            return self.__count - 1
+        raise ValueError(f"Invalid track info mode {mode}")
+
+    # Names and colors
+
+    def getTrackName(self, index: int) -> str:
+        """Simulates {{docs_url_fn[mixer.getTrackName]}}."""
+        self.__check(index)
+        name = self.__names[index]
+        if name:
+            return name
+        if index == 0:
+            return 'Master'
+        if index == self.__count - 1:
+            return 'Current'
+        return f'Insert {index}'
+
+    def setTrackName(self, index: int, name: str) -> None:
+        """Simulates {{docs_url_fn[mixer.setTrackName]}}."""
+        self.__check(index)
+        if self.__names[index] != name:
+            self.__names[index] = name
+            self.__notifier.dirtyMixerTrack(index, _DISPLAY)
+
+    def getTrackColor(self, index: int) -> int:
+        """Simulates {{docs_url_fn[mixer.getTrackColor]}}."""
+        self.__check(index)
+        return self.__color[index]
+
+    def setTrackColor(self, index: int, color: int) -> None:
+        """Simulates {{docs_url_fn[mixer.setTrackColor]}}."""
+        self.__check(index)
+        if self.__color[index] != color:
+            self.__color[index] = color
+            self.__notifier.dirtyMixerTrack(index, _DISPLAY)
+
+    def getSlotColor(self, index: int, slot: int) -> int:
+        """Simulates {{docs_url_fn[mixer.getSlotColor]}}."""
+        return self.__slot_color[self.__check_slot(index, slot)]
+
+    def setSlotColor(self, index: int, slot: int, color: int) -> None:
+        """Simulates {{docs_url_fn[mixer.setSlotColor]}}."""
+        position = self.__check_slot(index, slot)
+        if self.__slot_color[position] != color:
+            self.__slot_color[position] = color
+            self.__notifier.dirtyMixerTrack(index, _DISPLAY)
+
+    # Track state
+
+    def isTrackArmed(self, index: int) -> bool:
+        """Simulates {{docs_url_fn[mixer.isTrackArmed]}}."""
+        self.__check(index)
+        return bool(self.__armed[index])
+
+    def armTrack(self, index: int) -> None:
+        """Simulates {{docs_url_fn[mixer.armTrack]}}."""
+        self.__set_flag(self.__armed, index, -1)
+
+    def isTrackSolo(self, index: int) -> bool:
+        """Simulates {{docs_url_fn[mixer.isTrackSolo]}}."""
+        self.__check(index)
+        return bool(self.__solo[index])
+
+    def soloTrack(self, index: int, value: int = -1, mode: int = -1) -> None:
+        """Simulates {{docs_url_fn[mixer.soloTrack]}}."""
+        self.__set_flag(self.__solo, index, value)
+
+    def isTrackEnabled(self, index: int) -> bool:
+        """Simulates {{docs_url_fn[mixer.isTrackEnabled]}}."""
+        self.__check(index)
+        return not self.__muted[index]
+
+    def enableTrack(self, index: int) -> None:
+        """Simulates {{docs_url_fn[mixer.enableTrack]}}."""
+        self.__set_flag(self.__muted, index, -1)
+
+    def isTrackMuted(self, index: int) -> bool:
+        """Simulates {{docs_url_fn[mixer.isTrackMuted]}}."""
+        self.__check(index)
+        return bool(self.__muted[index])
+
+    def muteTrack(self, index: int, value: int = -1) -> None:
+        """Simulates {{docs_url_fn[mixer.muteTrack]}}."""
+        self.__set_flag(self.__muted, index, value)
+
+    def isTrackMuteLock(self, index: int) -> bool:
+        """Simulates {{docs_url_fn[mixer.isTrackMuteLock]}}."""
+        self.__check(index)
+        return bool(self.__mute_lock[index])
+
+    def isTrackSlotsEnabled(self, index: int) -> bool:
+        """Simulates {{docs_url_fn[mixer.isTrackSlotsEnabled]}}."""
+        self.__check(index)
+        return bool(self.__slots_enabled[index])
+
+    def enableTrackSlots(self, index: int, value: bool = False) -> None:
+        """Simulates {{docs_url_fn[mixer.enableTrackSlots]}}."""
+        self.__set_flag(self.__slots_enabled, index, value)
+
+    def isTrackRevPolarity(self, index: int) -> bool:
+        """Simulates {{docs_url_fn[mixer.isTrackRevPolarity]}}."""
+        self.__check(index)
+        return bool(self.__rev_polarity[index])
+
+    def revTrackPolarity(self, index: int, value: bool = False) -> None:
+        """Simulates {{docs_url_fn[mixer.revTrackPolarity]}}."""
+        self.__set_flag(self.__rev_polarity, index, value)
+
+    def isTrackSwapChannels(self, index: int) -> bool:
+        """Simulates {{docs_url_fn[mixer.isTrackSwapChannels]}}."""
+        self.__check(index)
+        return bool(self.__swap_channels[index])
+
+    def swapTrackChannels(self, index: int, value: bool = False) -> None:
+        """Simulates {{docs_url_fn[mixer.swapTrackChannels]}}."""
+        self.__set_flag(self.__swap_channels, index, value)
+
+    # Levels
+
+    def getTrackVolume(self, index: int, mode: int = 0) -> float:
+        """Simulates {{docs_url_fn[mixer.getTrackVolume]}}."""
+        self.__check(index)
+        if mode:
+            return utils.FaderTodB(self.__volume[index])
+        return self.__volume[index]
+
+    def setTrackVolume(
+        self,
+        index: int,
+        volume: float,
+        pickupMode: int = midi.PIM_None,
+    ) -> None:
+        """Simulates {{docs_url_fn[mixer.setTrackVolume]}}."""
+        self.__check(index)
+        self.__set_value(
+            self.__volume, index, index, _clamp(volume, 0.0, 1.0))
+
+    def getTrackPan(self, index: int) -> float:
+        """Simulates {{docs_url_fn[mixer.getTrackPan]}}."""
+        self.__check(index)
+        return self.__pan[index]
+
+    def setTrackPan(
+        self,
+        index: int,
+        pan: float,
+        pickupMode: int = midi.PIM_None,
+    ) -> None:
+        """Simulates {{docs_url_fn[mixer.setTrackPan]}}."""
+        self.__check(index)
+        self.__set_value(self.__pan, index, index, _clamp(pan, -1.0, 1.0))
+
+    def getTrackStereoSep(self, index: int) -> float:
+        """Simulates {{docs_url_fn[mixer.getTrackStereoSep]}}."""
+        self.__check(index)
+        return self.__sep[index]
+
+    def setTrackStereoSep(
+        self,
+        index: int,
+        pan: float,
+        pickupMode: int = midi.PIM_None,
+    ) -> None:
+        """Simulates {{docs_url_fn[mixer.setTrackStereoSep]}}."""
+        self.__check(index)
+        self.__set_value(self.__sep, index, index, _clamp(pan, -1.0, 1.0))
+
+    def getTrackPeaks(self, index: int, mode: int) -> float:
+        """Simulates {{docs_url_fn[mixer.getTrackPeaks]}}."""
+        self.__check(index)
+        left = self.__peaks[2 * index]
+        right = self.__peaks[2 * index + 1]
+        if mode == 0:
+            return left
+        if mode == 1:
+            return right
+        return max(left, right)
+
+    # Routing
+
+    def setRouteTo(
+        self,
+        index: int,
+        destIndex: int,
+        value: bool,
+        updateUI: bool = False,
+    ) -> None:
+        """Simulates {{docs_url_fn[mixer.setRouteTo]}}."""
+        self.__check(index)
+        self.__check(destIndex)
+        position = index * self.__count + destIndex
+        if self.__route[position] != bool(value):
+            self.__route[position] = bool(value)
+            self.__routing_changed = True
+        if updateUI:
+            self.afterRoutingChanged()
+
+    def setRouteToLevel(
+        self,
+        index: int,
+        destIndex: int,
+        level: float,
+    ) -> None:
+        """Simulates {{docs_url_fn[mixer.setRouteToLevel]}}."""
+        self.__check(index)
+        self.__check(destIndex)
+        self.__set_value(
+            self.__route_level,
+            index * self.__count + destIndex,
+            index,
+            _clamp(level, 0.0, 1.0),
+        )
+
+    def getRouteToLevel(self, index: int, destIndex: int) -> float:
+        """Simulates {{docs_url_fn[mixer.getRouteToLevel]}}."""
+        self.__check(index)
+        self.__check(destIndex)
+        return self.__route_level[index * self.__count + destIndex]
+
+    def getRouteSendActive(self, index: int, destIndex: int) -> bool:
+        """Simulates {{docs_url_fn[mixer.getRouteSendActive]}}."""
+        self.__check(index)
+        self.__check(destIndex)
+        return bool(self.__route[index * self.__count + destIndex])
+
+    def afterRoutingChanged(self) -> None:
+        """Simulates {{docs_url_fn[mixer.afterRoutingChanged]}}."""
+        if self.__routing_changed:
+            self.__routing_changed = False
+            self.__notifier.dirtyMixerTrack(-1, _DISPLAY)
+
+    # EQ
+
+    def getEqBandCount(self) -> int:
+        """Simulates {{docs_url_fn[mixer.getEqBandCount]}}."""
+        return _EQ_BANDS
+
+    def getEqGain(self, index: int, band: int, mode: int = 0) -> float:
+        """Simulates {{docs_url_fn[mixer.getEqGain]}}."""
+        value = self.__eq_gain[self.__check_band(index, band)]
+        if mode:
+            return (value - 0.5) * _EQ_GAIN_RANGE_DB
+        return value
+
+    def setEqGain(self, index: int, band: int, value: float) -> None:
+        """Simulates {{docs_url_fn[mixer.setEqGain]}}."""
+        self.__set_value(
+            self.__eq_gain,
+            self.__check_band(index, band),
+            index,
+            _clamp(value, 0.0, 1.0),
+        )
+
+    def getEqFrequency(self, index: int, band: int, mode: int = 0) -> float:
+        """Simulates {{docs_url_fn[mixer.getEqFrequency]}}."""
+        value = self.__eq_freq[self.__check_band(index, band)]
+        if mode:
+            return _EQ_MIN_FREQ_HZ * (
+                (_EQ_MAX_FREQ_HZ / _EQ_MIN_FREQ_HZ) ** value)
+        return value
+
+    def setEqFrequency(self, index: int, band: int, value: float) -> None:
+        """Simulates {{docs_url_fn[mixer.setEqFrequency]}}."""
+        self.__set_value(
+            self.__eq_freq,
+            self.__check_band(index, band),
+            index,
+            _clamp(value, 0.0, 1.0),
+        )
+
+    def getEqBandwidth(self, index: int, band: int) -> float:
+        """Simulates {{docs_url_fn[mixer.getEqBandwidth]}}."""
+        return self.__eq_bandwidth[self.__check_band(index, band)]
+
+    def setEqBandwidth(self, index: int, band: int, value: float) -> None:
+        """Simulates {{docs_url_fn[mixer.setEqBandwidth]}}."""
+        self.__set_value(
+            self.__eq_bandwidth,
+            self.__check_band(index, band),
+            index,
+            _clamp(value, 0.0, 1.0),
+        )
+
+    # Selection
+
+    def trackNumber(self) -> int:
+        """Simulates {{docs_url_fn[mixer.trackNumber]}}."""
+        return self.__active
+
+    def setTrackNumber(self, trackNumber: int, flags: int = 0) -> None:
+        """Simulates {{docs_url_fn[mixer.setTrackNumber]}}."""
+        self.__check(trackNumber)
+        if not flags & midi.curfxNoDeselectAll:
+            self.__selected[:] = bytes(self.__count)
+        self.__selected[trackNumber] = 1
+        self.__active = trackNumber
+        self.__notifier.dirtyMixerTrack(-1, _SELECTION)
+
+    def isTrackSelected(self, index: int) -> bool:
+        """Simulates {{docs_url_fn[mixer.isTrackSelected]}}."""
+        self.__check(index)
+        return bool(self.__selected[index])
+
+    def selectTrack(self, index: int) -> None:
+        """Simulates {{docs_url_fn[mixer.selectTrack]}}."""
+        self.__set_flag(self.__selected, index, -1, _SELECTION)
+
+    def selectAll(self) -> None:
+        """Simulates {{docs_url_fn[mixer.selectAll]}}."""
+        self.__selected[:] = b'\x01' * self.__count
+        self.__notifier.dirtyMixerTrack(-1, _SELECTION)
+
+    def deselectAll(self) -> None:
+        """Simulates {{docs_url_fn[mixer.deselectAll]}}."""
+        self.__selected[:] = bytes(self.__count)
+        self.__notifier.dirtyMixerTrack(-1, _SELECTION)
+
+    def setActiveTrack(self, index: int) -> None:
+        """Simulates {{docs_url_fn[mixer.setActiveTrack]}}."""
+        self.setTrackNumber(index)
@@ -0,0 +1,133 @@
+"""
+FL Sim > Notifier
+
+Delivery of change notifications from simulated FL Studio state to a script.
+"""
+from collections.abc import Callable
+
+
+class ScriptNotifier:
+    """
+    Delivers change notifications to a script's callback functions.
+
+    `OnDirty*` callbacks are called as soon as a change is made, since FL
+    Studio uses them to tell a script what changed. The flags for
+    `OnRefresh` are collected until `flush` is called, so that many changes
+    can be handled by a single refresh, matching FL Studio's behavior.
+
+    Callbacks that the script doesn't define are skipped.
+
+    ### Example Usage
+
+    ```py
+    import device_MyController as script
+
+    notifier = ScriptNotifier(script)
+    mixer_sim = MixerSim(notifier)
+    ```
+    """
+
+    def __init__(self, script: object, autoFlush: bool = False) -> None:
+        """
+        Create a `ScriptNotifier`.
+
+        ### Args:
+        * `script` (`object`): script to notify, usually its entrypoint
+          module. Any object with callback functions as attributes can be
+          used.
+
+        * `autoFlush` (`bool`, optional): whether to call `OnRefresh`
+          immediately for each change, rather than waiting for `flush` to be
+          called. Defaults to `False`.
+        """
+        self.__script = script
+        self.__auto_flush = autoFlush
+        self.__pending = 0
+
+    @property
+    def script(self) -> object:
+        """
+        The script that notifications are delivered to.
+        """
+        return self.__script
+
+    @property
+    def pendingFlags(self) -> int:
+        """
+        `OnRefresh` flags that have been collected, but not yet delivered.
+        """
+        return self.__pending
+
+    def callback(self, name: str) -> Callable[..., object] | None:
+        """
+        Returns the script's callback function with the given name, or `None`
+        if the script doesn't define it.
+
+        ### Args:
+        * `name` (`str`): name of callback, such as `"OnIdle"`.
+
+        ### Returns:
+        * `Callable | None`: callback function.
+        """
+        fn = getattr(self.__script, name, None)
+        return fn if callable(fn) else None
+
+    def dirtyMixerTrack(self, index: int, flags: int) -> None:
+        """
+        Notify the script that a mixer track changed.
+
+        ### Args:
+        * `index` (`int`): index of the mixer track, or `-1` for all tracks.
+
+        * `flags` (`int`): `OnRefresh` flags describing the change.
+        """
+        fn = self.callback('OnDirtyMixerTrack')
+        if fn is not None:
+            fn(index)
+        self.refresh(flags)
+
+    def dirtyChannel(self, index: int, flag: int, flags: int) -> None:
+        """
+        Notify the script that a channel changed.
+
+        ### Args:
+        * `index` (`int`): index of the channel, or `-1` for all channels.
+
+        * `flag` (`int`): kind of change, for example
+          {{docs_url_attr[midi.CE_Select]}}.
+
+        * `flags` (`int`): `OnRefresh` flags describing the change.
+        """
+        fn = self.callback('OnDirtyChannel')
+        if fn is not None:
+            fn(index, flag)
+        self.refresh(flags)
+
+    def refresh(self, flags: int) -> None:
+        """
+        Collect `OnRefresh` flags, to be delivered by the next call to
+        `flush`.
+
+        ### Args:
+        * `flags` (`int`): `OnRefresh` flags describing a change.
+        """
+        self.__pending |= flags
+        if self.__auto_flush:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Call the script's `OnRefresh` callback with all of the flags that have
+        been collected since it was last called. If no changes have been made,
+        the callback isn't called.
+
+        ### Returns:
+        * `int`: the flags that were delivered.
+        """
+        flags = self.__pending
+        if flags:
+            self.__pending = 0
+            fn = self.callback('OnRefresh')
+            if fn is not None:
+                fn(flags)
+        return flags
@@ -0,0 +1,467 @@
+"""
+FL Sim > Recording
+
+Recording of the MIDI messages delivered to a script, and replay of those
+recordings.
+"""
+import mmap
+import struct
+import time
+from collections.abc import Callable, Iterator
+from functools import partial
+from types import TracebackType
+from typing import Any, NamedTuple, Self
+
+from fl_classes import FlMidiMsg
+
+from .__event_loop import EventLoop
+
+_MAGIC = b'FLMIDREC'
+_VERSION = 1
+
+_HEADER = struct.Struct('<8sHH4x')
+"""
+File header: magic number, version and size of each record.
+"""
+
+_RECORD = struct.Struct('<QQIiiBBBx')
+"""
+Fixed-size record for each message: time, offset and length of sysex data in
+the heap, pmeFlags, port, status, data1 and data2.
+"""
+
+_TIME = struct.Struct('<Q')
+
+_CHUNK = 4096
+"""
+Number of records read from the log at a time when iterating over it.
+"""
+
+HEAP_SUFFIX = '.sysex'
+"""
+Suffix added to the path of a recording to get the path of its sysex heap.
+"""
+
+
+def _elapsed_us(start: int) -> int:
+    return (time.perf_counter_ns() - start) // 1000
+
+
+class MidiRecord(NamedTuple):
+    """
+    A MIDI message stored in a recording.
+    """
+
+    time: int
+    """
+    Time at which the message was delivered, in microseconds.
+    """
+
+    status: int
+    """
+    Status byte (`0xF0` for sysex messages).
+    """
+
+    data1: int
+    """
+    Data1 byte (`0` for sysex messages).
+    """
+
+    data2: int
+    """
+    Data2 byte (`0` for sysex messages).
+    """
+
+    port: int
+    """
+    Port that the message was received on.
+    """
+
+    pmeFlags: int
+    """
+    PME flags of the message.
+    """
+
+    sysex: bytes | None
+    """
+    Sysex data, or `None` for standard messages.
+    """
+
+    def toMessage(self) -> FlMidiMsg:
+        """
+        Returns a new `FlMidiMsg` containing the recorded message.
+
+        Note that the `port` of the message is always `0`, since it can't be
+        set.
+        """
+        if self.sysex is not None:
+            return FlMidiMsg(self.sysex, pmeFlags=self.pmeFlags)
+        return FlMidiMsg(self.status, self.data1, self.data2, self.pmeFlags)
+
+
+class MidiRecorder:
+    """
+    Records every MIDI message delivered to a script to a binary log.
+
+    The recorder wraps a script, and should be used in place of it (for
+    example when creating an `EventLoop`). Each message passed to its
+    `OnMidiIn` callback is recorded before being passed on to the script,
+    even if the script doesn't define `OnMidiIn`. Messages can also be
+    recorded directly using `record`.
+
+    The log consists of a small header followed by a fixed-size record for
+    each message, so that it can be appended to cheaply, and read back at
+    any position without scanning it. The data of sysex messages is stored
+    in a separate heap file (the log's path followed by `.sysex`), which each
+    record refers to by offset and length.
+
+    ### Example Usage
+
+    ```py
+    with MidiRecorder(script, 'session.bin', clock=lambda: loop.now) as rec:
+        loop = EventLoop(rec)
+        loop.start()
+        ...
+        loop.stop()
+    ```
+    """
+
+    def __init__(
+        self,
+        script: object,
+        path: str,
+        clock: Callable[[], int] | None = None,
+    ) -> None:
+        """
+        Create a `MidiRecorder`, creating (or replacing) the log and its
+        heap.
+
+        ### Args:
+        * `script` (`object`): script whose messages are recorded, usually
+          its entrypoint module.
+
+        * `path` (`str`): path of the log.
+
+        * `clock` (`Callable[[], int]`, optional): function returning the
+          current time in microseconds, such as `lambda: loop.now` for an
+          `EventLoop`. Defaults to `None`, meaning the real time since the
+          recorder was created.
+        """
+        self.__script = script
+        # The files stay open until `close` is called
+        self.__log = open(path, 'wb')  # noqa: SIM115
+        self.__heap = open(path + HEAP_SUFFIX, 'wb')  # noqa: SIM115
+        self.__heap_size = 0
+        self.__count = 0
+        if clock is None:
+            start = time.perf_counter_ns()
+            clock = partial(_elapsed_us, start)
+        self.__clock = clock
+        self.__log.write(_HEADER.pack(_MAGIC, _VERSION, _RECORD.size))
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes that aren't found normally, so other
+        # callbacks are passed through to the script
+        if not name.startswith('On'):
+            raise AttributeError(name)
+        return getattr(self.__script, name)
+
+    def OnMidiIn(self, msg: FlMidiMsg) -> None:
+        """
+        Record a message, then pass it to the script's `OnMidiIn` callback,
+        if it defines one.
+        """
+        self.record(msg)
+        fn = getattr(self.__script, 'OnMidiIn', None)
+        if fn is not None:
+            fn(msg)
+
+    @property
+    def count(self) -> int:
+        """
+        Number of messages recorded.
+        """
+        return self.__count
+
+    def record(self, msg: FlMidiMsg, time: int | None = None) -> None:
+        """
+        Record a message.
+
+        ### Args:
+        * `msg` (`FlMidiMsg`): message to record.
+
+        * `time` (`int`, optional): time of the message, in microseconds.
+          Defaults to `None`, meaning the current time of the recorder's
+          clock.
+        """
+        if time is None:
+            time = self.__clock()
+        status = msg.status
+        if status == 0xF0:
+            sysex = msg.sysex
+            record = _RECORD.pack(
+                time, self.__heap_size, len(sysex), msg.pmeFlags, msg.port,
+                0xF0, 0, 0,
+            )
+            self.__heap.write(sysex)
+            self.__heap_size += len(sysex)
+        else:
+            record = _RECORD.pack(
+                time, 0, 0, msg.pmeFlags, msg.port,
+                status, msg.data1, msg.data2,
+            )
+        self.__log.write(record)
+        self.__count += 1
+
+    def flush(self) -> None:
+        """
+        Write any buffered records to disk.
+        """
+        self.__heap.flush()
+        self.__log.flush()
+
+    def close(self) -> None:
+        """
+        Finish recording, and close the log.
+        """
+        self.__heap.close()
+        self.__log.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def _map(path: str) -> mmap.mmap | None:
+    with open(path, 'rb') as f:
+        # Empty files can't be mapped
+        if f.seek(0, 2) == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class MidiReplayer:
+    """
+    Reads back a log written by a `MidiRecorder`.
+
+    The log and its sysex heap are memory-mapped rather than read into
+    memory, so recordings much larger than the available memory can be
+    replayed. Records can be accessed by index, searched by time, iterated
+    over, or streamed into a script or an `EventLoop`.
+
+    Reading a sysex message whose data is missing from the heap, for example
+    because the heap was truncated or not copied along with the log, raises
+    a `ValueError`.
+
+    ### Example Usage
+
+    ```py
+    with MidiReplayer('session.bin') as replayer:
+        loop = EventLoop(script)
+        loop.start()
+        replayer.schedule(loop)
+        loop.runUntil(replayer.duration)
+        loop.stop()
+    ```
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open a recording.
+
+        ### Args:
+        * `path` (`str`): path of the log.
+        """
+        log = _map(path)
+        if log is None:
+            raise ValueError(f"{path!r} is not a MIDI recording")
+        if len(log) < _HEADER.size:
+            log.close()
+            raise ValueError(f"{path!r} is not a MIDI recording")
+        magic, version, record_size = _HEADER.unpack_from(log)
+        if magic != _MAGIC or record_size != _RECORD.size:
+            log.close()
+            raise ValueError(f"{path!r} is not a MIDI recording")
+        if version != _VERSION:
+            log.close()
+            raise ValueError(f"Unsupported recording version {version}")
+        self.__path = path
+        self.__log = log
+        self.__heap = _map(path + HEAP_SUFFIX)
+        self.__count = (len(log) - _HEADER.size) // _RECORD.size
+
+    def close(self) -> None:
+        """
+        Close the recording.
+        """
+        self.__log.close()
+        if self.__heap is not None:
+            self.__heap.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __record(self, fields: tuple[int, ...]) -> MidiRecord:
+        time, offset, length, pme_flags, port, status, data1, data2 = fields
+        sysex = None
+        if status == 0xF0:
+            heap = self.__heap
+            if heap is None or offset + length > len(heap):
+                raise ValueError(
+                    f"The sysex data of the message at {time} us is missing "
+                    f"from {self.__path + HEAP_SUFFIX!r}"
+                )
+            sysex = heap[offset:offset + length]
+        return MidiRecord(time, status, data1, data2, port, pme_flags, sysex)
+
+    def __getitem__(self, index: int) -> MidiRecord:
+        if index < 0:
+            index += self.__count
+        if not 0 <= index < self.__count:
+            raise IndexError(index)
+        return self.__record(_RECORD.unpack_from(
+            self.__log, _HEADER.size + index * _RECORD.size))
+
+    def __iter__(self) -> Iterator[MidiRecord]:
+        return self.records()
+
+    @property
+    def duration(self) -> int:
+        """
+        Time of the last message in the recording, in microseconds.
+        """
+        return self[-1].time if self.__count else 0
+
+    def indexAt(self, time: int) -> int:
+        """
+        Returns the index of the first message recorded at or after the given
+        time, using a binary search.
+
+        ### Args:
+        * `time` (`int`): time, in microseconds.
+
+        ### Returns:
+        * `int`: index of message, or the number of messages if all of them
+          were recorded before `time`.
+        """
+        log = self.__log
+        low, high = 0, self.__count
+        while low < high:
+            mid = (low + high) // 2
+            (mid_time,) = _TIME.unpack_from(
+                log, _HEADER.size + mid * _RECORD.size)
+            if mid_time < time:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def records(
+        self,
+        start: int = 0,
+        stop: int | None = None,
+    ) -> Iterator[MidiRecord]:
+        """
+        Iterate over the records in the given range of indexes. Only a small
+        chunk of the log is read at a time.
+
+        ### Args:
+        * `start` (`int`, optional): index of first record. Defaults to `0`.
+
+        * `stop` (`int`, optional): index after the last record. Defaults to
+          `None`, meaning the end of the recording.
+
+        ### Yields:
+        * `MidiRecord`: records.
+        """
+        stop = self.__count if stop is None else min(stop, self.__count)
+        log = self.__log
+        make_record = self.__record
+        for chunk_start in range(start, stop, _CHUNK):
+            chunk_stop = min(chunk_start + _CHUNK, stop)
+            data = log[
+                _HEADER.size + chunk_start * _RECORD.size:
+                _HEADER.size + chunk_stop * _RECORD.size
+            ]
+            for fields in _RECORD.iter_unpack(data):
+                yield make_record(fields)
+
+    def replay(
+        self,
+        script: object,
+        start: int = 0,
+        stop: int | None = None,
+    ) -> int:
+        """
+        Pass each recorded message to the script's `OnMidiIn` callback
+        immediately, ignoring their times.
+
+        ### Args:
+        * `script` (`object`): script to deliver messages to.
+
+        * `start` (`int`, optional): index of first record. Defaults to `0`.
+
+        * `stop` (`int`, optional): index after the last record. Defaults to
+          `None`, meaning the end of the recording.
+
+        ### Returns:
+        * `int`: number of messages delivered.
+        """
+        on_midi_in = getattr(script, 'OnMidiIn', None)
+        count = 0
+        for record in self.records(start, stop):
+            if on_midi_in is not None:
+                on_midi_in(record.toMessage())
+            count += 1
+        return count
+
+    def schedule(
+        self,
+        loop: EventLoop,
+        offset: int = 0,
+        start: int = 0,
+        stop: int | None = None,
+    ) -> None:
+        """
+        Stream the recorded messages into an `EventLoop`, so that each is
+        received at its recorded time, passing through the loop's full chain
+        of MIDI callbacks. Messages are received in the same order as those
+        scheduled using `EventLoop.scheduleMidi`, after any actions scheduled
+        for the same time.
+
+        Only the next message is scheduled at any time, so that the whole
+        recording isn't loaded into the loop's queue.
+
+        ### Args:
+        * `loop` (`EventLoop`): event loop to deliver messages to.
+
+        * `offset` (`int`, optional): amount of time to add to the time of
+          each message, in microseconds. Defaults to `0`.
+
+        * `start` (`int`, optional): index of first record. Defaults to `0`.
+
+        * `stop` (`int`, optional): index after the last record. Defaults to
+          `None`, meaning the end of the recording.
+        """
+        loop.scheduleMessages(
+            (record.time + offset, record.toMessage())
+            for record in self.records(start, stop)
+        )
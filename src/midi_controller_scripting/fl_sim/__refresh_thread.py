@@ -0,0 +1,253 @@
+"""
+FL Sim > Refresh thread
+
+Simulation of the threaded refresh functions of the `device` module.
+"""
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import midi
+
+from .__backend import SimBackend
+from .__latency import LatencyHistogram
+from .__notifier import ScriptNotifier
+
+
+def _all_refresh_flags() -> int:
+    flags = 0
+    for name in dir(midi):
+        if name.startswith('HW_Dirty_'):
+            flags |= getattr(midi, name)
+    return flags
+
+
+_FULL_REFRESH = _all_refresh_flags()
+"""
+`OnRefresh` flags used for a full refresh: all of the `HW_Dirty_*` flags.
+"""
+
+
+class RefreshThreadSim(SimBackend):
+    """
+    Simulation of the refresh thread started by `device.createRefreshThread`.
+
+    When installed, `device.createRefreshThread` starts a real background
+    thread, which delivers `OnRefresh` every `interval` seconds (if any
+    changes have been collected by the `ScriptNotifier`), and
+    `device.destroyRefreshThread` stops it. `device.fullRefresh` makes the
+    thread deliver a refresh with every `HW_Dirty_*` flag as soon as possible,
+    or delivers it immediately if the thread isn't running.
+
+    Since FL Studio only runs one script callback at a time, the thread
+    holds the backend's `lock` while calling the script. Any other code that
+    calls the script or changes the simulated state while the thread is
+    running (such as a test delivering MIDI messages) must also hold the
+    lock, ideally using `locked`, which measures how long it had to wait.
+    These waits are how contention between the refresh thread and other
+    callbacks shows up.
+
+    ### Example Usage
+
+    ```py
+    notifier = ScriptNotifier(script)
+    with MixerSim(notifier), RefreshThreadSim(notifier) as refresh:
+        device.createRefreshThread()
+        for msg in messages:
+            with refresh.locked():
+                script.OnMidiIn(msg)
+        device.destroyRefreshThread()
+    print(refresh.lockWaits.percentile(99))
+    ```
+    """
+
+    MODULE = 'device'
+
+    FUNCTIONS = (
+        'createRefreshThread',
+        'destroyRefreshThread',
+        'fullRefresh',
+    )
+
+    def __init__(
+        self,
+        notifier: ScriptNotifier,
+        interval: float = 0.02,
+    ) -> None:
+        """
+        Create a `RefreshThreadSim`.
+
+        ### Args:
+        * `notifier` (`ScriptNotifier`): notifier used to deliver `OnRefresh`
+          to the script, shared with any other simulation backends.
+
+        * `interval` (`float`, optional): time between refreshes, in
+          seconds. Defaults to `0.02`.
+        """
+        super().__init__()
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.__notifier = notifier
+        self.__interval = interval
+        self.__lock = threading.RLock()
+        self.__wake = threading.Event()
+        # Each thread has its own stop event, so that a thread which is
+        # stopped and replaced during a refresh still sees that it must stop
+        self.__stopping = threading.Event()
+        self.__thread: threading.Thread | None = None
+        self.__full_requested = False
+        self.__refreshes = 0
+        self.__errors: list[BaseException] = []
+        self.__thread_waits = LatencyHistogram()
+        self.__lock_waits = LatencyHistogram()
+        self.__durations = LatencyHistogram()
+
+    @property
+    def lock(self) -> threading.RLock:
+        """
+        Lock held while the script or the simulated state is in use.
+        """
+        return self.__lock
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """
+        Context manager which holds the `lock`, recording how long it took to
+        acquire in `lockWaits`.
+        """
+        start = time.perf_counter_ns()
+        with self.__lock:
+            self.__lock_waits.record(time.perf_counter_ns() - start)
+            yield
+
+    @property
+    def running(self) -> bool:
+        """
+        Whether the refresh thread is running.
+        """
+        return self.__thread is not None
+
+    @property
+    def refreshes(self) -> int:
+        """
+        Number of times `OnRefresh` has been delivered.
+        """
+        return self.__refreshes
+
+    @property
+    def errors(self) -> list[BaseException]:
+        """
+        Exceptions raised by the script while being called from the refresh
+        thread.
+        """
+        return list(self.__errors)
+
+    @property
+    def threadWaits(self) -> LatencyHistogram:
+        """
+        Time the refresh thread waited to acquire the lock before each
+        refresh, in nanoseconds.
+        """
+        return self.__thread_waits
+
+    @property
+    def lockWaits(self) -> LatencyHistogram:
+        """
+        Time other code waited to acquire the lock using `locked`, in
+        nanoseconds.
+        """
+        return self.__lock_waits
+
+    @property
+    def refreshDurations(self) -> LatencyHistogram:
+        """
+        Time taken by each refresh, in nanoseconds.
+        """
+        return self.__durations
+
+    def __refresh(
+        self,
+        full: bool,
+        stopping: threading.Event | None,
+    ) -> None:
+        """
+        Deliver a refresh. `stopping` is the stop event of the refresh thread
+        making the call, or `None` if it is made from the caller's thread.
+        """
+        lock = self.__lock
+        start = time.perf_counter_ns()
+        if stopping is not None:
+            # Give up waiting if the thread is stopped, since the thread that
+            # stops it could be holding the lock
+            while not lock.acquire(timeout=self.__interval):
+                if stopping.is_set():
+                    return
+        else:
+            lock.acquire()
+        try:
+            acquired = time.perf_counter_ns()
+            if stopping is not None:
+                self.__thread_waits.record(acquired - start)
+            if full:
+                self.__notifier.refresh(_FULL_REFRESH)
+            if self.__notifier.flush():
+                self.__refreshes += 1
+                self.__durations.record(time.perf_counter_ns() - acquired)
+        finally:
+            lock.release()
+
+    def __run(self, stopping: threading.Event) -> None:
+        while True:
+            self.__wake.wait(self.__interval)
+            if stopping.is_set():
+                return
+            self.__wake.clear()
+            full = self.__full_requested
+            self.__full_requested = False
+            try:
+                self.__refresh(full, stopping)
+            except Exception as e:
+                self.__errors.append(e)
+
+    def uninstall(self) -> None:
+        """
+        Stop the refresh thread if it is running, then restore the module's
+        original functions.
+        """
+        if self.__thread is not None:
+            self.destroyRefreshThread()
+        super().uninstall()
+
+    # device module
+
+    def createRefreshThread(self) -> None:
+        if self.__thread is not None:
+            return
+        self.__stopping = threading.Event()
+        self.__wake.clear()
+        self.__thread = threading.Thread(
+            target=self.__run,
+            args=(self.__stopping,),
+            name='RefreshThreadSim',
+            daemon=True,
+        )
+        self.__thread.start()
+
+    def destroyRefreshThread(self) -> None:
+        thread = self.__thread
+        if thread is None:
+            return
+        self.__thread = None
+        self.__stopping.set()
+        self.__wake.set()
+        # The script may stop the thread from a refresh
+        if thread is not threading.current_thread():
+            thread.join()
+
+    def fullRefresh(self) -> None:
+        if self.__thread is not None:
+            self.__full_requested = True
+            self.__wake.set()
+        else:
+            self.__refresh(True, None)
@@ -0,0 +1,206 @@
+"""
+Functions for finding the names of constants given their values, which is
+useful when logging events or flags.
+
+NOTE: These functions are not included in FL Studio's version of this module,
+so they can't be used by scripts running inside FL Studio.
+
+Constants are grouped into families, based on the submodule of `midi` that
+defines them. For example, the `OnRefresh` flags are in the
+`"on_refresh_flags"` family, and the Rec event process flags are in the
+`"rec_events.process_flags"` family. The `"rec_events"` family contains all
+Rec event constants.
+
+```py
+>>> midi.DecomposeFlags(
+...     midi.HW_Dirty_Mixer_Sel | midi.HW_Dirty_Colors,
+...     "on_refresh_flags",
+... )
+(['HW_Dirty_Mixer_Sel', 'HW_Dirty_Colors'], 0)
+```
+"""
+from functools import cache
+from importlib import import_module
+
+from .__submodule_names import SUBMODULE_NAMES
+
+_REC_EVENT_FAMILIES = (
+    # Other submodules import constants from `ranges`, so it must be first in
+    # order for those constants to be assigned to it
+    'ranges',
+    'process_flags',
+    'global_properties',
+    'channel_properties',
+    'mixer_properties',
+    'playlist_properties',
+    'special',
+    'ts404',
+)
+"""
+Families within the Rec events submodule.
+"""
+
+
+def GetConstantFamilies() -> list[str]:
+    """
+    Returns the names of all constant families.
+
+    ## Returns
+
+    * `list[str]`: family names, for use with
+      {{docs_url_fn[midi.GetConstantNames]}} and
+      {{docs_url_fn[midi.DecomposeFlags]}}.
+    """
+    families = [
+        submodule.removeprefix('__')
+        for submodule in SUBMODULE_NAMES
+        if submodule != '__constant_names'
+    ]
+    families.extend(f'rec_events.{family}' for family in _REC_EVENT_FAMILIES)
+    return families
+
+
+@cache
+def _rec_event_constants() -> dict[str, dict[str, int]]:
+    """
+    Returns the constants in each Rec events family.
+    """
+    claimed: set[str] = set()
+    families: dict[str, dict[str, int]] = {}
+    for family in _REC_EVENT_FAMILIES:
+        module = import_module(f'midi.__rec_events.{family}')
+        constants: dict[str, int] = {}
+        for name in SUBMODULE_NAMES['__rec_events']:
+            value = getattr(module, name, None)
+            if name not in claimed and isinstance(value, int):
+                constants[name] = value
+                claimed.add(name)
+        families[family] = constants
+    return families
+
+
+def _family_constants(family: str) -> dict[str, int]:
+    """
+    Returns a mapping of names to values for the constants in the given
+    family. Submodules are only imported once they are needed.
+    """
+    if family.startswith('rec_events.'):
+        constants = _rec_event_constants().get(
+            family.removeprefix('rec_events.'))
+        if constants is None:
+            raise ValueError(f"Unknown constant family {family!r}")
+        return constants
+
+    submodule = f'__{family}'
+    if (
+        submodule not in SUBMODULE_NAMES
+        or submodule == '__constant_names'
+    ):
+        raise ValueError(f"Unknown constant family {family!r}")
+    module = import_module(f'midi.{submodule}')
+    constants = {}
+    for name in SUBMODULE_NAMES[submodule]:
+        value = getattr(module, name)
+        if isinstance(value, int) and not isinstance(value, bool):
+            constants[name] = value
+    return constants
+
+
+@cache
+def _family_index(
+    family: str,
+) -> tuple[dict[int, tuple[str, ...]], dict[int, str]]:
+    """
+    Build the reverse index for a family of constants.
+
+    Returns a mapping of values to the names with that value, and a mapping
+    of single-bit values to the first name with that value.
+    """
+    by_value: dict[int, list[str]] = {}
+    for name, value in _family_constants(family).items():
+        by_value.setdefault(value, []).append(name)
+
+    bits = {
+        value: names[0]
+        for value, names in by_value.items()
+        if value > 0 and value & (value - 1) == 0
+    }
+    return {value: tuple(names) for value, names in by_value.items()}, bits
+
+
+def GetConstantNames(value: int, family: str) -> tuple[str, ...]:
+    """
+    Returns the names of the constants in the given family that have the
+    given value.
+
+    The index for each family is built the first time it is used, and is
+    cached for future lookups.
+
+    ## Args
+
+    * `value` (`int`): value of the constant.
+
+    * `family` (`str`): family of constants to search, as listed by
+      {{docs_url_fn[midi.GetConstantFamilies]}}.
+
+    ## Returns
+
+    * `tuple[str, ...]`: names of matching constants. This is empty if no
+      constants match.
+
+    ## Example Usage
+
+    ```py
+    >>> midi.GetConstantNames(0xB0, "midi_codes")
+    ('MIDI_CONTROLCHANGE',)
+    ```
+    """
+    return _family_index(family)[0].get(value, ())
+
+
+def DecomposeFlags(value: int, family: str) -> tuple[list[str], int]:
+    """
+    Split a bit-mask into the names of the flags it contains.
+
+    Only constants with a single bit set are considered to be flags. The
+    time taken is proportional to the number of bits set in `value`.
+
+    ## Args
+
+    * `value` (`int`): bit-mask to decompose.
+
+    * `family` (`str`): family of flag constants, as listed by
+      {{docs_url_fn[midi.GetConstantFamilies]}}.
+
+    ## Returns
+
+    * `list[str]`: names of the flags that are set, from the lowest bit to
+      the highest.
+
+    * `int`: any bits that are set in `value` that don't have a name.
+
+    ## Example Usage
+
+    ```py
+    >>> midi.DecomposeFlags(
+    ...     midi.REC_UpdateValue | midi.REC_UpdateControl,
+    ...     "rec_events.process_flags",
+    ... )
+    (['REC_UpdateValue', 'REC_UpdateControl'], 0)
+    ```
+    """
+    if value < 0:
+        raise ValueError("Can't decompose negative flags")
+    bits = _family_index(family)[1]
+    names: list[str] = []
+    unknown = 0
+    while value:
+        # Isolate the lowest set bit
+        bit = value & -value
+        name = bits.get(bit)
+        if name is None:
+            unknown |= bit
+        else:
+            names.append(name)
+        value ^= bit
+    return names, unknown
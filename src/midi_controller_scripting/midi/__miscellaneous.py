@@ -1,6 +1,11 @@
 """
 Miscellaneous constants and functions defined within `midi.py`.
+
+`DecodeRemoteControlID` and `BuildRemoteControlIDTable` are additions which
+are not included in FL Studio's version of `midi.py`.
 """
+from array import array
+
 from .__midi_codes import MIDI_NOTEON
 
 
@@ -23,6 +28,81 @@ def EncodeRemoteControlID(PortNum: int, ChanNum: int, CCNum: int) -> int:
     return CCNum + (ChanNum << 16) + ((PortNum + 1) << 22)
 
 
+def DecodeRemoteControlID(controlId: int) -> tuple[int, int, int]:
+    """
+    Splits a `controlId` into the information about its event. This is the
+    inverse of {{docs_url_fn[midi.EncodeRemoteControlID]}}.
+
+    ## Args:
+    * `controlId` (`int`): `controlId`, as generated by
+      {{docs_url_fn[midi.EncodeRemoteControlID]}}
+
+    ## Returns:
+    * `int`: the port that the event was sent to
+
+    * `int`: the channel of the event
+
+    * `int`: the CC number of the event
+
+    ## Example usage
+
+    ```py
+    >>> midi.DecodeRemoteControlID(midi.EncodeRemoteControlID(2, 9, 64))
+    (2, 9, 64)
+    ```
+
+    NOTE: This function is not included in FL Studio's version of this
+    module, so it can't be used by scripts running inside FL Studio.
+    """
+    return (controlId >> 22) - 1, (controlId >> 16) & 0x3F, controlId & 0xFFFF
+
+
+def BuildRemoteControlIDTable(
+    PortNum: int,
+    channels: int = 16,
+    ccs: int = 128,
+) -> 'array[int]':
+    """
+    Generates the `controlId` of every channel and CC number on a port, so
+    that the `controlId` of an incoming event can be found with a single
+    lookup, rather than calling {{docs_url_fn[midi.EncodeRemoteControlID]}}
+    for each event.
+
+    The `controlId` for channel `ChanNum` and CC number `CCNum` is at index
+    `ChanNum * ccs + CCNum`. With the default arguments, this is
+    `(ChanNum << 7) | CCNum`.
+
+    ## Args:
+    * `PortNum` (`int`): the port of the device
+
+    * `channels` (`int`, optional): the number of channels to include.
+      Defaults to `16`.
+
+    * `ccs` (`int`, optional): the number of CC numbers to include for each
+      channel. Defaults to `128`.
+
+    ## Returns:
+    * `array[int]`: `controlId` values
+
+    ## Example usage
+
+    ```py
+    >>> control_ids = midi.BuildRemoteControlIDTable(2)
+    >>> control_ids[(9 << 7) | 64] == midi.EncodeRemoteControlID(2, 9, 64)
+    True
+    ```
+
+    NOTE: This function is not included in FL Studio's version of this
+    module, so it can't be used by scripts running inside FL Studio.
+    """
+    port_base = (PortNum + 1) << 22
+    return array('q', [
+        port_base + (chan << 16) + cc
+        for chan in range(channels)
+        for cc in range(ccs)
+    ])
+
+
 MaxInt = 2147483647
 """Maximum signed 32-bit integer."""
 
@@ -0,0 +1,325 @@
+"""
+Functions for building Rec event IDs from their components, and splitting
+event IDs back into their components.
+
+NOTE: These functions are not included in FL Studio's version of this module,
+so they can't be used by scripts running inside FL Studio. They are intended
+for tools and tests that work with the event IDs used by a script.
+
+Rather than calculating event IDs by hand from
+{{docs_url_attr[midi.REC_ItemRange]}}, {{docs_url_attr[midi.REC_PluginBase]}},
+etc, a tool can describe the event it wants to target, then encode it.
+
+```py
+>>> # Volume of mixer track 3
+>>> midi.EncodeRecEventID(midi.RecKind_Mixer, 3, 0, midi.REC_Mixer_Vol)
+549461952
+>>> # Parameter 12 of the plugin in slot 2 of mixer track 3
+>>> midi.EncodeRecEventID(midi.RecKind_EffectPlugin, 3, 2, 12)
+549617676
+```
+
+The batch functions {{docs_url_fn[midi.EncodeRecEventIDs]}} and
+{{docs_url_fn[midi.DecodeRecEventIDs]}} store their results in arrays, which
+use far less memory than a list of results when working with many event IDs.
+They are no faster than calling the scalar functions for each event ID.
+"""
+from array import array
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from .__rec_events.mixer_properties import (
+    REC_Mixer_First,
+    REC_Mixer_Last,
+    REC_Plug_First,
+)
+from .__rec_events.playlist_properties import REC_Pat_First, REC_PLTrack_First
+from .__rec_events.ranges import (
+    REC_Global_First,
+    REC_ItemMask,
+    REC_ItemRange,
+    REC_MaxChan,
+    REC_PluginBase,
+)
+
+RecKind_Other = 0
+"""
+An event ID that doesn't fall into any of the other categories, such as
+special events. The `param` is the full event ID.
+"""
+
+RecKind_Channel = 1
+"""
+A property of a channel. The `item` is the channel index, and the `param` is
+the event ID for channel 0, for example {{docs_url_attr[midi.REC_Chan_Vol]}}.
+"""
+
+RecKind_ChannelPlugin = 2
+"""
+A parameter of a channel's plugin. The `item` is the channel index, and the
+`param` is the plugin parameter index.
+"""
+
+RecKind_Mixer = 3
+"""
+A property of a mixer track. The `item` is the mixer track index, and the
+`param` is the event ID for track 0, for example
+{{docs_url_attr[midi.REC_Mixer_Vol]}}.
+"""
+
+RecKind_Effect = 4
+"""
+A general property of an effect slot on a mixer track. The `item` is the
+mixer track index, the `slot` is the effect slot index, and the `param` is the
+event ID for track 0 slot 0, for example {{docs_url_attr[midi.REC_Plug_Mute]}}.
+"""
+
+RecKind_EffectPlugin = 5
+"""
+A parameter of an effect plugin. The `item` is the mixer track index, the
+`slot` is the effect slot index, and the `param` is the plugin parameter
+index.
+"""
+
+RecKind_Global = 6
+"""
+A global property of the project. The `param` is the full event ID, for
+example {{docs_url_attr[midi.REC_Tempo]}}.
+"""
+
+RecKind_Pattern = 7
+"""
+A property of a pattern. The `item` is the pattern index, and the `param` is
+the offset of the event within the pattern's range.
+"""
+
+RecKind_PlaylistTrack = 8
+"""
+A property of a playlist track. The `item` is the playlist track index, and
+the `param` is the offset of the event within the track's range.
+"""
+
+_CHAN_ITEMS = REC_MaxChan
+_PLUG_FIRST_ITEM = REC_Plug_First // REC_ItemRange
+_GLOBAL_FIRST_ITEM = REC_Global_First // REC_ItemRange
+_PAT_FIRST_ITEM = REC_Pat_First // REC_ItemRange
+_PLTRACK_FIRST_ITEM = REC_PLTrack_First // REC_ItemRange
+_MIXER_FIRST_OFFSET = REC_Mixer_First - REC_Plug_First
+_MIXER_LAST_OFFSET = REC_Mixer_Last - REC_Plug_First
+
+_SLOT_BITS = 6
+"""
+Number of bits used for the effect slot within an item number in the
+effects range. Equivalent to `mixer.getTrackPluginId`.
+"""
+_SLOT_MASK = (1 << _SLOT_BITS) - 1
+
+
+class RecEventInfo(NamedTuple):
+    """
+    Components of a Rec event ID, as returned by
+    {{docs_url_fn[midi.DecodeRecEventID]}}.
+    """
+
+    kind: int
+    """
+    Kind of event, eg {{docs_url_attr[midi.RecKind_Channel]}}.
+    """
+
+    item: int
+    """
+    Index of the channel, mixer track, pattern or playlist track, or `0` if
+    not applicable.
+    """
+
+    slot: int
+    """
+    Index of the mixer effect slot, or `0` if not applicable.
+    """
+
+    param: int
+    """
+    Parameter within the item. Its meaning depends on the `kind`.
+    """
+
+
+def EncodeRecEventID(kind: int, item: int, slot: int, param: int) -> int:
+    """
+    Build a Rec event ID from its components.
+
+    ## Args
+
+    * `kind` (`int`): kind of event, eg {{docs_url_attr[midi.RecKind_Mixer]}}.
+
+    * `item` (`int`): index of the channel, mixer track, pattern or playlist
+      track. Ignored for global and other events.
+
+    * `slot` (`int`): mixer effect slot. Ignored unless the event is for a
+      mixer track or effect.
+
+    * `param` (`int`): parameter, as described by the documentation for each
+      kind of event.
+
+    ## Returns
+
+    * `int`: event ID.
+    """
+    if kind == RecKind_Channel:
+        return item * REC_ItemRange + param
+    if kind == RecKind_ChannelPlugin:
+        return item * REC_ItemRange + REC_PluginBase + param
+    if kind in (RecKind_Mixer, RecKind_Effect):
+        return param + (((item << _SLOT_BITS) | slot) * REC_ItemRange)
+    if kind == RecKind_EffectPlugin:
+        return (
+            REC_Plug_First
+            + (((item << _SLOT_BITS) | slot) * REC_ItemRange)
+            + REC_PluginBase
+            + param
+        )
+    if kind == RecKind_Pattern:
+        return REC_Pat_First + item * REC_ItemRange + param
+    if kind == RecKind_PlaylistTrack:
+        return REC_PLTrack_First + item * REC_ItemRange + param
+    if kind in (RecKind_Global, RecKind_Other):
+        return param
+    raise ValueError(f"Unknown Rec event kind {kind}")
+
+
+def DecodeRecEventID(eventId: int) -> RecEventInfo:
+    """
+    Split a Rec event ID into its components.
+
+    This is the inverse of {{docs_url_fn[midi.EncodeRecEventID]}}.
+
+    ## Args
+
+    * `eventId` (`int`): event ID.
+
+    ## Returns
+
+    * `RecEventInfo`: components of the event ID.
+
+    ## Example Usage
+
+    ```py
+    >>> midi.DecodeRecEventID(549617676)
+    RecEventInfo(kind=5, item=3, slot=2, param=12)
+    ```
+    """
+    if eventId < 0:
+        return RecEventInfo(RecKind_Other, 0, 0, eventId)
+    item = eventId // REC_ItemRange
+    offset = eventId & REC_ItemMask
+
+    if item < _CHAN_ITEMS:
+        if offset >= REC_PluginBase:
+            return RecEventInfo(
+                RecKind_ChannelPlugin, item, 0, offset - REC_PluginBase)
+        return RecEventInfo(RecKind_Channel, item, 0, offset)
+
+    if _PLUG_FIRST_ITEM <= item < _GLOBAL_FIRST_ITEM:
+        plug = item - _PLUG_FIRST_ITEM
+        track = plug >> _SLOT_BITS
+        slot = plug & _SLOT_MASK
+        if offset >= REC_PluginBase:
+            return RecEventInfo(
+                RecKind_EffectPlugin, track, slot, offset - REC_PluginBase)
+        if _MIXER_FIRST_OFFSET <= offset <= _MIXER_LAST_OFFSET:
+            kind = RecKind_Mixer
+        else:
+            kind = RecKind_Effect
+        return RecEventInfo(kind, track, slot, REC_Plug_First + offset)
+
+    if _GLOBAL_FIRST_ITEM <= item <= _GLOBAL_FIRST_ITEM + 1:
+        return RecEventInfo(RecKind_Global, 0, 0, eventId)
+
+    if _PAT_FIRST_ITEM <= item < _PLTRACK_FIRST_ITEM:
+        return RecEventInfo(
+            RecKind_Pattern, item - _PAT_FIRST_ITEM, 0, offset)
+
+    if _PLTRACK_FIRST_ITEM <= item < _PLTRACK_FIRST_ITEM + REC_MaxChan:
+        return RecEventInfo(
+            RecKind_PlaylistTrack, item - _PLTRACK_FIRST_ITEM, 0, offset)
+
+    return RecEventInfo(RecKind_Other, 0, 0, eventId)
+
+
+def EncodeRecEventIDs(
+    kinds: Iterable[int],
+    items: Iterable[int],
+    slots: Iterable[int],
+    params: Iterable[int],
+) -> 'array[int]':
+    """
+    Build many Rec event IDs at once.
+
+    This is equivalent to calling {{docs_url_fn[midi.EncodeRecEventID]}} on
+    each set of components, but returns the results in a compact array.
+
+    ## Args
+
+    * `kinds` (`Iterable[int]`): kind of each event.
+
+    * `items` (`Iterable[int]`): item index of each event.
+
+    * `slots` (`Iterable[int]`): slot of each event.
+
+    * `params` (`Iterable[int]`): parameter of each event.
+
+    ## Returns
+
+    * `array[int]`: array of event IDs (type code `q`).
+    """
+    encode = EncodeRecEventID
+    return array('q', map(encode, kinds, items, slots, params))
+
+
+def DecodeRecEventIDs(
+    eventIds: Iterable[int],
+) -> 'tuple[array[int], array[int], array[int], array[int]]':
+    """
+    Split many Rec event IDs into their components at once.
+
+    This is equivalent to calling {{docs_url_fn[midi.DecodeRecEventID]}} on
+    each event ID, but returns the components as parallel arrays, which use
+    far less memory than a list of `RecEventInfo` objects. It is a little
+    slower than decoding each event ID into a list, since the components
+    must be converted to arrays, so it is only worth using when the results
+    are kept for a long time.
+
+    ## Args
+
+    * `eventIds` (`Iterable[int]`): event IDs to decode.
+
+    ## Returns
+
+    * `array[int]`: kind of each event (type code `b`).
+
+    * `array[int]`: item index of each event (type code `i`).
+
+    * `array[int]`: slot of each event (type code `b`).
+
+    * `array[int]`: parameter of each event (type code `q`).
+
+    ## Example Usage
+
+    ```py
+    >>> kinds, tracks, slots, params = midi.DecodeRecEventIDs(
+    ...     [549461952, 549617676])
+    >>> kinds, tracks
+    (array('b', [3, 5]), array('i', [3, 3]))
+    ```
+    """
+    decoded = list(map(DecodeRecEventID, eventIds))
+    if not decoded:
+        return array('b'), array('i'), array('b'), array('q')
+    # Transposing the results and building each array in one call is much
+    # faster than appending to four arrays for every event
+    kinds, items, slots, params = zip(*decoded, strict=True)
+    return (
+        array('b', kinds),
+        array('i', items),
+        array('b', slots),
+        array('q', params),
+    )
@@ -0,0 +1,256 @@
+"""
+Names provided by each submodule of `midi`.
+
+This is kept separate from `midi/__init__.py` so that other submodules can
+find the names of the constants without reaching into private parts of the
+package.
+"""
+
+SUBMODULE_NAMES: dict[str, tuple[str, ...]] = {
+    '__miscellaneous': (
+        'EncodeRemoteControlID', 'DecodeRemoteControlID',
+        'BuildRemoteControlIDTable', 'MaxInt', 'GPN_GetCurrentPreset',
+        'TranzPort_OffOnT', 'TranzPort_OffBlinkT', 'TranzPort_OffOnBlinkT',
+        'FromMIDI_Max', 'FromMIDI_Half', 'EKRes', 'TrackNum_Master', 'SM_Pat',
+        'SM_Song', 'MiddleNote_Default', 'FineTune_Default', 'DotVol_Default',
+        'DotPan_Default', 'DotVol_Max', 'DotNote_Default',
+        'ChannelDefaultVolume', 'TackDefaultVolume',
+    ),
+    '__midi_codes': (
+        'MIDI_NOTEON', 'MIDI_NOTEOFF', 'MIDI_KEYAFTERTOUCH',
+        'MIDI_CONTROLCHANGE', 'MIDI_PROGRAMCHANGE', 'MIDI_CHANAFTERTOUCH',
+        'MIDI_PITCHBEND', 'MIDI_SYSTEMMESSAGE', 'MIDI_BEGINSYSEX',
+        'MIDI_MTCQUARTERFRAME', 'MIDI_SONGPOSPTR', 'MIDI_SONGSELECT',
+        'MIDI_ENDSYSEX', 'MIDI_TIMINGCLOCK', 'MIDI_START', 'MIDI_CONTINUE',
+        'MIDI_STOP', 'MIDI_ACTIVESENSING', 'MIDI_SYSTEMRESET', 'EventNameT',
+    ),
+    '__pme_flags': (
+        'PME_LiveInput', 'PME_System', 'PME_System_Safe', 'PME_PreviewNote',
+        'PME_FromHost', 'PME_FromMIDI', 'PME_FromScript',
+    ),
+    '__overlay_flags': (
+        'CR_HighlightChannels', 'CR_ScrollToView', 'CR_HighlightChannelMute',
+        'CR_HighlightChannelPanVol', 'CR_HighlightChannelTrack',
+        'CR_HighlightChannelName', 'CR_HighlightChannelSelect',
+        'MI_ScrollToView',
+    ),
+    '__tlc_flags': (
+        'TLC_MuteOthers', 'TLC_Fill', 'TLC_Queue', 'TLC_Release',
+        'TLC_NoPlayCheck', 'TLC_NoHardwareUpdate', 'TLC_SecondPass',
+        'TLC_ColumnMode', 'TLC_WeakColumnMode', 'TLC_TriggerCheckColumnMode',
+        'TLC_TrackSnap', 'TLC_GlobalSnap', 'TLC_NoSnap', 'TLC_SubNum_Normal',
+        'TLC_SubNum_ClipPos', 'TLC_SubNum_GroupNum', 'TLC_SubNum_Read',
+        'TLC_SubNum_Leave',
+    ),
+    '__play_modes': (
+        'PM_Stopped', 'PM_Playing', 'PM_Precount',
+    ),
+    '__on_refresh_flags': (
+        'HW_Dirty_Mixer_Sel', 'HW_Dirty_Mixer_Display',
+        'HW_Dirty_Mixer_Controls', 'HW_Dirty_RemoteLinks',
+        'HW_Dirty_FocusedWindow', 'HW_Dirty_Performance', 'HW_Dirty_LEDs',
+        'HW_Dirty_RemoteLinkValues', 'HW_Dirty_Patterns', 'HW_Dirty_Tracks',
+        'HW_Dirty_ControlValues', 'HW_Dirty_Colors', 'HW_Dirty_Names',
+        'HW_Dirty_ChannelRackGroup', 'HW_ChannelEvent',
+    ),
+    '__song_time': (
+        'SONGLENGTH_MS', 'SONGLENGTH_S', 'SONGLENGTH_ABSTICKS',
+        'SONGLENGTH_BARS', 'SONGLENGTH_STEPS', 'SONGLENGTH_TICKS',
+    ),
+    '__linked_event_flags': (
+        'Event_CantInterpolate', 'Event_Float', 'Event_Centered',
+    ),
+    '__rec_events': (
+        'REC_ItemRange', 'REC_TrackRange', 'REC_EnvRange', 'REC_PluginBase',
+        'REC_PluginRange', 'REC_ItemMask', 'REC_MaxChan', 'REC_MaxPat',
+        'REC_GlobalChan', 'REC_GlobalPlugTrack', 'REC_GlobalPlug',
+        'REC_MixerMask', 'REC_Chan_First', 'REC_Chan_Last', 'REC_Global_First',
+        'REC_Global_Last', 'REC_Chan_Vol', 'REC_Chan_Pan', 'REC_Chan_FCut',
+        'REC_Chan_FRes', 'REC_Chan_Pitch', 'REC_Chan_FType',
+        'REC_Chan_PortaTime', 'REC_Chan_Mute', 'REC_Chan_FXTrack',
+        'REC_Chan_GateTime', 'REC_Chan_Crossfade', 'REC_Chan_TimeOfs',
+        'REC_Chan_SwingMix', 'REC_Chan_SmpOfs', 'REC_Chan_StretchTime',
+        'REC_Chan_OfsPan', 'REC_Chan_OfsVol', 'REC_Chan_OfsPitch',
+        'REC_Chan_OfsFCut', 'REC_Chan_OfsFRes', 'REC_Chan_TS404_First',
+        'REC_Chan_TS404_FCut', 'REC_Chan_TS404_FRes',
+        'REC_Chan_TS404_Env_First', 'REC_Chan_TS404_Env_Last',
+        'REC_Chan_TS404_Last', 'REC_Chan_TS404_Valid_First',
+        'REC_Chan_TS404_Valid_Last', 'REC_TS404Delay_First',
+        'REC_TS404Delay_Feed', 'REC_TS404Delay_Pan', 'REC_TS404Delay_Vol',
+        'REC_TS404Delay_Time', 'REC_Chan_Delay_First', 'REC_Chan_Delay_Last',
+        'REC_Chan_Delay_Time', 'REC_Chan_Arp_First', 'REC_Chan_Arp_Last',
+        'REC_Chan_Arp_Chord', 'REC_Chan_Arp_Time', 'REC_Chan_Arp_Gate',
+        'REC_Chan_Arp_Repeat', 'REC_Chan_Misc', 'REC_Chan_Track_First',
+        'REC_Chan_Track_PLast', 'REC_Chan_Track_Last', 'REC_Chan_AC_First',
+        'REC_Chan_AC_Last', 'REC_Chan_Env_First', 'REC_Chan_Env_LFO_First',
+        'REC_Chan_Env_MA', 'REC_Chan_Env_LFOA', 'REC_Chan_Env_Hole',
+        'REC_Chan_Env_PLast', 'REC_Chan_Env_Last', 'REC_Chan_Note_First',
+        'REC_Chan_Note_Num', 'REC_Chan_Note_Last', 'REC_Chan_NoteOn',
+        'REC_Chan_NoteMask', 'REC_Chan_NoteSlideMask', 'REC_Chan_NoteSlide',
+        'REC_Chan_NoteSlideTo', 'REC_Chan_NoteSlideOfs', 'REC_Chan_NoteOff',
+        'REC_Chan_PianoRoll', 'REC_Chan_Clip', 'REC_Chan_Plugin_First',
+        'REC_Chan_Plugin_Last',
+        'REC_Plug_First', 'REC_Plug_Last', 'REC_Plug_General_First',
+        'REC_Plug_General_Last', 'REC_Plug_Mute', 'REC_Plug_MixLevel',
+        'REC_Mixer_First', 'REC_Mixer_Last', 'REC_Mixer_Send_First',
+        'REC_Mixer_Send_Last', 'REC_Mixer_Vol', 'REC_Mixer_Pan',
+        'REC_Mixer_SS', 'REC_Mixer_EQ_First', 'REC_Mixer_EQ_Last',
+        'REC_Mixer_EQ_Gain', 'REC_Mixer_EQ_Freq', 'REC_Mixer_EQ_Q',
+        'REC_Mixer_EQ_Type', 'REC_Plug_Plugin_First', 'REC_Plug_Plugin_Last',
+        'REC_MainVol', 'REC_MainShuffle',
+        'REC_MainPitch', 'REC_MainFRes', 'REC_MainFCut', 'REC_Tempo',
+        'REC_Playlist_First', 'REC_Playlist_Last', 'REC_Pat_First',
+        'REC_Pat_Last', 'REC_Pat_Clip', 'REC_PLClip_First', 'REC_PLClip_Last',
+        'REC_Playlist_Old', 'REC_Pat_Block', 'REC_Playlist',
+        'REC_PLTrack_First', 'REC_PLTrack_Last', 'REC_Reserved', 'REC_Special',
+        'REC_StartStop', 'REC_SongPosition', 'REC_SongLength',
+        'REC_LastTweakedFirst', 'REC_LastTweakedLast', 'REC_Proj_First',
+        'REC_UpdateValue', 'REC_GetValue', 'REC_ShowHint',
+        'REC_UpdatePlugLabel', 'REC_UpdateControl', 'REC_FromMIDI',
+        'REC_Store', 'REC_SetChanged', 'REC_SetTouched', 'REC_Init',
+        'REC_NoLink', 'REC_InternalCtrl', 'REC_PlugReserved', 'REC_Smoothed',
+        'REC_NoLastTweaked', 'REC_NoSaveUndo', 'REC_InitStore', 'REC_Control',
+        'REC_MIDIController', 'REC_Controller', 'REC_SetAll', 'REC_Visual',
+        'REC_FromMixThread', 'REC_PlugCallback', 'REC_FromInternalCtrl',
+        'REC_AnyInternalCtrl', 'REC_InvalidID', 'REC_None', 'REC_SomeGeneric',
+        'REC_WrapperModWheel', 'REC_WrapperAfterTouch', 'PME_RECFlagsT',
+    ),
+    '__gt_commands': (
+        'FPT_Jog', 'FPT_Jog2', 'FPT_Strip', 'FPT_StripJog', 'FPT_StripHold',
+        'FPT_Previous', 'FPT_Next', 'FPT_PreviousNext', 'FPT_MoveJog',
+        'FPT_Play', 'FPT_Stop', 'FPT_Record', 'FPT_Rewind', 'FPT_FastForward',
+        'FPT_Loop', 'FPT_Mute', 'FPT_Mode', 'FPT_Undo', 'FPT_UndoUp',
+        'FPT_UndoJog', 'FPT_Punch', 'FPT_PunchIn', 'FPT_PunchOut',
+        'FPT_AddMarker', 'FPT_AddAltMarker', 'FPT_MarkerJumpJog',
+        'FPT_MarkerSelJog', 'FPT_Up', 'FPT_Down', 'FPT_Left', 'FPT_Right',
+        'FPT_HZoomJog', 'FPT_VZoomJog', 'FPT_Snap', 'FPT_SnapMode', 'FPT_Cut',
+        'FPT_Copy', 'FPT_Paste', 'FPT_Insert', 'FPT_Delete', 'FPT_NextWindow',
+        'FPT_WindowJog', 'FPT_F1', 'FPT_F2', 'FPT_F3', 'FPT_F4', 'FPT_F5',
+        'FPT_F6', 'FPT_F7', 'FPT_F8', 'FPT_F9', 'FPT_F10', 'FPT_F11',
+        'FPT_F12', 'FPT_Enter', 'FPT_Escape', 'FPT_Yes', 'FPT_No', 'FPT_Menu',
+        'FPT_ItemMenu', 'FPT_Save', 'FPT_SaveNew', 'FPT_PatternJog',
+        'FPT_TrackJog', 'FPT_ChannelJog', 'FPT_TempoJog', 'FPT_TapTempo',
+        'FPT_NudgeMinus', 'FPT_NudgePlus', 'FPT_Metronome', 'FPT_WaitForInput',
+        'FPT_Overdub', 'FPT_LoopRecord', 'FPT_StepEdit', 'FPT_CountDown',
+        'FPT_NextMixerWindow', 'FPT_MixerWindowJog', 'FPT_ShuffleJog',
+        'FPT_ArrangementJog',
+    ),
+    '__gt_flags': (
+        'GT_Cannot', 'GT_None', 'GT_Plugin', 'GT_Form', 'GT_Menu', 'GT_Global',
+        'GT_All',
+    ),
+    '__pickup_modes': (
+        'PIM_None', 'PIM_AlwaysPickup', 'PIM_FollowGlobal',
+    ),
+    '__window_indexes': (
+        'widMixer', 'widChannelRack', 'widPlaylist', 'widPianoRoll',
+        'widBrowser', 'widPluginEffect', 'widPluginGenerator',
+    ),
+    '__mixer_setTrackNumber_flags': (
+        'curfxScrollToMakeVisible', 'StartcurfxCancelSmoothing',
+        'curfxNoDeselectAll', 'curfxMinimalLatencyUpdate',
+    ),
+    '__mixer_solo_flags': (
+        'fxSoloModeWithSourceTracks', 'fxSoloModeWithDestTracks',
+        'fxSoloModeIgnorePrevious', 'fxSoloSetOff', 'fxSoloSetOn',
+        'fxSoloToggle', 'fxSoloGetValue',
+    ),
+    '__mixer_peaks_mode': (
+        'PEAK_L', 'PEAK_R', 'PEAK_LR', 'PEAK_LR_INV',
+    ),
+    '__mixer_link_channel_mode': (
+        'ROUTE_ToThis', 'ROUTE_StartingFromThis',
+    ),
+    '__scale_indexes': (
+        'HARMONICSCALE_MAJOR', 'HARMONICSCALE_HARMONICMINOR',
+        'HARMONICSCALE_MELODICMINOR', 'HARMONICSCALE_WHOLETONE',
+        'HARMONICSCALE_DIMINISHED', 'HARMONICSCALE_MAJORPENTATONIC',
+        'HARMONICSCALE_MINORPENTATONIC', 'HARMONICSCALE_JAPINSEN',
+        'HARMONICSCALE_MAJORBEBOP', 'HARMONICSCALE_DOMINANTBEBOP',
+        'HARMONICSCALE_BLUES', 'HARMONICSCALE_ARABIC',
+        'HARMONICSCALE_ENIGMATIC', 'HARMONICSCALE_NEAPOLITAN',
+        'HARMONICSCALE_NEAPOLITANMINOR', 'HARMONICSCALE_HUNGARIANMINOR',
+        'HARMONICSCALE_DORIAN', 'HARMONICSCALE_PHRYGIAN',
+        'HARMONICSCALE_LYDIAN', 'HARMONICSCALE_MIXOLYDIAN',
+        'HARMONICSCALE_AEOLIAN', 'HARMONICSCALE_LOCRIAN',
+        'HARMONICSCALE_CHROMATIC', 'HARMONICSCALE_LAST',
+    ),
+    '__ffnep_flags': (
+        'FFNEP_FindFirst', 'FFNEP_DontPromptName',
+    ),
+    '__step_params': (
+        'pPitch', 'pVelocity', 'pRelease', 'pFinePitch', 'pPan', 'pModX',
+        'pModY', 'pShift',
+    ),
+    '__channel_types': (
+        'CT_Sampler', 'CT_Hybrid', 'CT_TS404', 'CT_GenPlug', 'CT_Layer',
+        'CT_AudioClip', 'CT_AutoClip', 'CT_ColorT',
+    ),
+    '__event_editor_modes': (
+        'EE_EE', 'EE_PR', 'EE_PL',
+    ),
+    '__snap_modes': (
+        'Snap_Default', 'Snap_Line', 'Snap_Cell', 'Snap_None',
+        'Snap_SixthStep', 'Snap_FourthStep', 'Snap_ThirdStep', 'Snap_HalfStep',
+        'Snap_Step', 'Snap_SixthBeat', 'Snap_FourthBeat', 'Snap_ThirdBeat',
+        'Snap_HalfBeat', 'Snap_Beat', 'Snap_SixthBar', 'Snap_FourthBar',
+        'Snap_ThirdBar', 'Snap_HalfBar', 'Snap_Bar', 'Snap_Events',
+        'Snap_Markers', 'Snap_ForceCell', 'Snap_AltNone', 'Snap_FlagsMask',
+    ),
+    '__track_info_flags': (
+        'TN_Master', 'TN_FirstIns', 'TN_LastIns', 'TN_Sel',
+    ),
+    '__undo_flags': (
+        'UF_None', 'UF_EE', 'UF_PR', 'UF_PL', 'UF_EEPR', 'UF_Knob', 'UF_SS',
+        'UF_AudioRec', 'UF_AutoClip', 'UF_PRMarker', 'UF_PLMarker',
+        'UF_Plugin', 'UF_SSLooping',
+    ),
+    '__cc_flags': (
+        'CC_Normal', 'CC_Special', 'CC_PitchBend', 'CC_KeyAfterTouch',
+        'CC_ChanAfterTouch', 'CC_Note', 'CC_Free', 'CC_PLTrack',
+    ),
+    '__song_tick_modes': (
+        'ST_Int', 'ST_Beat', 'ST_PGB',
+    ),
+    '__live_block_status': (
+        'LB_Status_Default', 'LB_Status_Simple', 'LB_Status_Simplest',
+    ),
+    '__step_sequencer_loop': (
+        'ssLoopOff', 'ssLoopNextStep', 'ssLoopNextBeat', 'ssLoopNextBar',
+    ),
+    '__get_color_flags': (
+        'GC_BackgroundColor', 'GC_Semitone',
+    ),
+    '__get_version_flags': (
+        'VER_Major', 'VER_Minor', 'VER_Release', 'VER_Build',
+        'VER_VersionAndEdition', 'VER_FullVersionAndEdition',
+        'VER_ArchAndBuild',
+    ),
+    '__plugin_get_name_flags': (
+        'FPN_Param', 'FPN_ParamValue', 'FPN_Semitone', 'FPN_Patch',
+        'FPN_VoiceLevel', 'FPN_VoiceLevelHint', 'FPN_Preset', 'FPN_OutCtrl',
+        'FPN_VoiceColor', 'FPN_OutVoice',
+    ),
+    '__project_load_status': (
+        'PL_Start', 'PL_LoadOk', 'PL_LoadError',
+    ),
+    '__on_dirty_channel_flags': (
+        'CE_New', 'CE_Delete', 'CE_Replace', 'CE_Rename', 'CE_Select',
+    ),
+    '__constant_names': (
+        'GetConstantFamilies', 'GetConstantNames', 'DecomposeFlags',
+    ),
+    '__rec_event_codec': (
+        'RecKind_Other', 'RecKind_Channel', 'RecKind_ChannelPlugin',
+        'RecKind_Mixer', 'RecKind_Effect', 'RecKind_EffectPlugin',
+        'RecKind_Global', 'RecKind_Pattern', 'RecKind_PlaylistTrack',
+        'RecEventInfo', 'EncodeRecEventID', 'DecodeRecEventID',
+        'EncodeRecEventIDs', 'DecodeRecEventIDs',
+    ),
+}
+"""
+Names provided by each submodule.
+
+Submodules are only imported the first time that one of their names is
+accessed, which greatly reduces the amount of work done by `import midi`.
+"""
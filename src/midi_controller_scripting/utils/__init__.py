@@ -14,6 +14,22 @@ creation of the repository authors, and no credit is claimed for the code
 content. However, the documentation for the provided code is created by the
 authors of this repository.
 
+Some functions are additions which are not included in FL Studio's version
+of this module:
+
+* the batch color conversion functions (those with names ending in `Batch`).
+
+* `VolTodBTable` and `dBToVol`, for converting between volumes and decibels
+  using the same curve as `VolTodB`.
+
+* `FaderTodB` and `dBToFader`, for converting between volumes and decibels
+  using the curve of the mixer's faders, where 0.8 is 0 dB.
+
+* `TRectIndex`, a spatial index of rectangles.
+
+* `NoteNameTable`, `GetNoteNames` and `ParseNoteName`, for converting between
+  note numbers and names.
+
 ## WARNING
 
 Many of the provided functions in the FL Studio installation have bugs
@@ -22,12 +38,19 @@ file for your inspection and warnings have been added to the docstrings. Use
 any functions here with caution.
 """
 import math
+import re
+import sys
+from array import array
+from collections.abc import Iterable
+from operator import index
 
 
 class TRect:
     """Represents a rectangle object
     """
 
+    __slots__ = ('Top', 'Left', 'Bottom', 'Right')
+
     def __init__(self, left: int, top: int, right: int, bottom: int):
         """Create a `TRect` object representing a rectangle
 
@@ -62,6 +85,133 @@ class TRect:
         return self.Bottom - self.Top
 
 
+class TRectIndex:
+    """A spatial index of rectangles, for finding all of the rectangles that
+    overlap a given rectangle without checking every one of them
+
+    Rectangles are sorted into a grid of square cells, so each query only
+    checks the rectangles in the cells that it covers. For the best
+    performance, `CellSize` should be similar to the size of a typical
+    rectangle.
+
+    The index stores the position of each rectangle when it is inserted. If a
+    rectangle is moved (for example using `OffsetRect`), call `Update` to
+    move it within the index.
+
+    NOTE: This class is not included in FL Studio's version of this module.
+    """
+
+    def __init__(self, CellSize: int = 64):
+        """Create an empty `TRectIndex`
+
+        ## Args:
+         * CellSize (int, optional): width and height of each grid cell.
+           Defaults to 64.
+        """
+        if CellSize <= 0:
+            raise ValueError("CellSize must be positive")
+        self.__cellSize = CellSize
+        self.__cells: dict[tuple[int, int], dict[TRect, None]] = {}
+        self.__rects: dict[TRect, list[tuple[int, int]]] = {}
+
+    def __cellsOf(self, R: TRect) -> 'list[tuple[int, int]]':
+        """Return the cells covered by a rectangle, including its edges
+        """
+        size = self.__cellSize
+        left, right = sorted((R.Left, R.Right))
+        top, bottom = sorted((R.Top, R.Bottom))
+        xs = range(int(left // size), int(right // size) + 1)
+        return [
+            (x, y)
+            for y in range(int(top // size), int(bottom // size) + 1)
+            for x in xs
+        ]
+
+    def Insert(self, R: TRect) -> None:
+        """Add a rectangle to the index
+
+        ## Args:
+         * R (TRect): rectangle
+        """
+        if R in self.__rects:
+            raise ValueError("Rectangle is already in the index")
+        cells = self.__cellsOf(R)
+        self.__rects[R] = cells
+        for cell in cells:
+            contents = self.__cells.get(cell)
+            if contents is None:
+                contents = self.__cells[cell] = {}
+            contents[R] = None
+
+    def Remove(self, R: TRect) -> None:
+        """Remove a rectangle from the index
+
+        ## Args:
+         * R (TRect): rectangle
+        """
+        for cell in self.__rects.pop(R):
+            contents = self.__cells[cell]
+            del contents[R]
+            if not contents:
+                del self.__cells[cell]
+
+    def Update(self, R: TRect) -> None:
+        """Update the position of a rectangle that has been moved or resized
+
+        ## Args:
+         * R (TRect): rectangle
+        """
+        self.Remove(R)
+        self.Insert(R)
+
+    def Clear(self) -> None:
+        """Remove all rectangles from the index
+        """
+        self.__cells.clear()
+        self.__rects.clear()
+
+    def __len__(self) -> int:
+        return len(self.__rects)
+
+    def __contains__(self, R: object) -> bool:
+        return R in self.__rects
+
+    def __candidates(self, R: TRect) -> 'dict[TRect, None]':
+        """Return the rectangles sharing a cell with a rectangle
+        """
+        cells = self.__cells
+        found: dict[TRect, None] = {}
+        for cell in self.__cellsOf(R):
+            contents = cells.get(cell)
+            if contents is not None:
+                found.update(contents)
+        return found
+
+    def Overlap(self, R: TRect) -> 'list[TRect]':
+        """Returns all rectangles in the index that overlap a rectangle, as
+        per `RectOverlap`
+
+        ## Args:
+         * R (TRect): rectangle
+
+        ## Returns:
+         * list[TRect]: overlapping rectangles
+        """
+        return [r for r in self.__candidates(R) if RectOverlap(r, R)]
+
+    def OverlapEqual(self, R: TRect) -> 'list[TRect]':
+        """Returns all rectangles in the index that overlap or touch a
+        rectangle, as per `RectOverlapEqual`
+
+        ## Args:
+         * R (TRect): rectangle
+
+        ## Returns:
+         * list[TRect]: overlapping or touching rectangles
+        """
+        return [r for r in self.__candidates(R) if RectOverlapEqual(r, R)]
+
+
 class TClipLauncherLastClip:
     def __init__(self, trackNum, subNum, flags):
         self.TrackNum = trackNum
@@ -447,6 +597,112 @@ def GetNoteName(NoteNum: int) -> str:
     return NoteNameT[NoteNum % 12] + str((NoteNum // 12) - 100)
 
 
+# Note name tables
+#
+# These functions are not included in FL Studio's version of this module.
+
+_NoteNameTables: dict[int, tuple[tuple[str, ...], dict[str, int]]] = {}
+
+_NoteNamePattern = re.compile(r'\s*([A-Ga-g])([#b]*)(-?\d+)\s*$')
+
+_NoteSemitones = {
+    'C': 0, 'D': 2, 'E': 4, 'F': 5, 'G': 7, 'A': 9, 'B': 11,
+}
+
+
+def _noteNameTable(
+    OctaveOffset: int,
+) -> 'tuple[tuple[str, ...], dict[str, int]]':
+    """Return the note name table for an octave offset, along with a mapping
+    from each name back to its note number
+    """
+    tables = _NoteNameTables.get(OctaveOffset)
+    if tables is None:
+        names = tuple(
+            NoteNameT[n % 12] + str(n // 12 + OctaveOffset)
+            for n in range(128)
+        )
+        tables = (names, {name: n for n, name in enumerate(names)})
+        _NoteNameTables[OctaveOffset] = tables
+    return tables
+
+
+def NoteNameTable(OctaveOffset: int = 0) -> 'tuple[str, ...]':
+    """Return a table of the names of MIDI notes 0-127, as per `GetNoteName`,
+    so that note names can be looked up without any calculations
+
+    Tables are calculated the first time they are requested, then reused.
+
+    ## Args:
+     * OctaveOffset (int, optional): number added to the octave of each
+       note. Defaults to 0, where middle C (note 60) is `C5`, as per
+       `GetNoteName`. Use -1 for `C4`, or -2 for `C3`, which gives names in
+       octave -2 for the lowest notes.
+
+    ## Returns:
+     * tuple[str, ...]: note names
+    """
+    return _noteNameTable(OctaveOffset)[0]
+
+
+def GetNoteNames(
+    NoteNums: 'Iterable[int]',
+    OctaveOffset: int = 0,
+) -> 'list[str]':
+    """Return the note names of many note numbers, for example to label a
+    row of the piano roll or step sequencer
+
+    ## Args:
+     * NoteNums (Iterable[int]): note numbers
+
+     * OctaveOffset (int, optional): number added to the octave of each
+       note, as per `NoteNameTable`. Defaults to 0.
+
+    ## Returns:
+     * list[str]: note names
+    """
+    table = _noteNameTable(OctaveOffset)[0]
+    return [
+        table[n] if 0 <= n < 128
+        else NoteNameT[n % 12] + str(n // 12 + OctaveOffset)
+        for n in NoteNums
+    ]
+
+
+def ParseNoteName(Name: str, OctaveOffset: int = 0) -> int:
+    """Return the note number given a note name. This is the inverse of
+    `GetNoteName`, so `ParseNoteName("C#5")` is 61
+
+    Flats (such as `Db5`), multiple accidentals, negative octaves and lower
+    case letters are also accepted.
+
+    ## Args:
+     * Name (str): note name
+
+     * OctaveOffset (int, optional): number added to the octave of each
+       note, as per `NoteNameTable`. Defaults to 0.
+
+    ## Returns:
+     * int: note number
+
+    ## Raises:
+     * ValueError: the name isn't a valid note name
+    """
+    n = _noteNameTable(OctaveOffset)[1].get(Name)
+    if n is not None:
+        return n
+    match = _NoteNamePattern.match(Name)
+    if match is None:
+        raise ValueError(f"Invalid note name: {Name!r}")
+    letter, accidentals, octave = match.groups()
+    return (
+        (int(octave) - OctaveOffset) * 12
+        + _NoteSemitones[letter.upper()]
+        + accidentals.count('#')
+        - accidentals.count('b')
+    )
+
+
 def ColorToRGB(Color: int) -> 'tuple[int, int, int]':
     """Convert an integer color to an RGB tuple that uses range 0-255.
 
@@ -520,6 +776,316 @@ def LightenColor(Color: int, Value: float) -> int:
     return RGBToColor(round(r + (1.0 - r) * ratio), round(g + (1.0 - g) * ratio), round(b + (1.0 - b) * ratio))
 
 
+# Batch color conversion
+#
+# These functions are not included in FL Studio's version of this module.
+# They convert many colors at once, giving the same results as calling the
+# scalar functions above on each color (including their bugs), but with less
+# overhead per color. The inputs can be any iterable of integers, including
+# NumPy arrays, and the results are `array.array` objects, which can be
+# wrapped by NumPy without copying using `numpy.frombuffer`.
+#
+# Where possible, colors are packed into an array of 8-byte integers, so that
+# each color component can be extracted as a strided slice of the array's
+# bytes, and mapped through a 256-entry table using `bytes.translate`,
+# without any Python code running per color.
+
+
+def _colorBytes(Colors: 'list[int]') -> 'bytes | None':
+    """Pack colors into little-endian 8-byte integers, or return `None` if
+    any of them are too large
+    """
+    try:
+        packed = array('q', Colors)
+    except OverflowError:
+        return None
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _bytesToColors(B: bytes, G: bytes, R: bytes) -> 'array[int]':
+    """Combine the components of colors into an array of integer colors
+    """
+    packed = bytearray(8 * len(B))
+    packed[0::8] = B
+    packed[1::8] = G
+    packed[2::8] = R
+    result = array('q')
+    result.frombytes(packed)
+    if sys.byteorder == 'big':
+        result.byteswap()
+    return result
+
+
+def _byteTable(Table: 'list[int]') -> 'bytes | None':
+    """Convert a table of color components to `bytes`, or return `None` if
+    any of them are outside the range 0-255
+    """
+    if min(Table) < 0 or max(Table) > 255:
+        return None
+    return bytes(Table)
+
+
+def _splitTriples(
+    Triples: 'list[tuple[float, float, float]]',
+) -> 'tuple[array[float], array[float], array[float]]':
+    """Split a list of triples into three arrays
+    """
+    return (
+        array('d', [t[0] for t in Triples]),
+        array('d', [t[1] for t in Triples]),
+        array('d', [t[2] for t in Triples]),
+    )
+
+
+def ColorToRGBBatch(
+    Colors: 'Iterable[int]',
+) -> 'tuple[array[int], array[int], array[int]]':
+    """Convert many integer colors to RGB components, as per `ColorToRGB`
+
+    ## Args:
+     * Colors (Iterable[int]): colors as integers (`0x--RRGGBB`)
+
+    ## Returns:
+     * array[int]: red values (0-255)
+
+     * array[int]: green values (0-255)
+
+     * array[int]: blue values (0-255)
+    """
+    colors = list(map(index, Colors))
+    packed = _colorBytes(colors)
+    if packed is None:
+        return (
+            array('B', [(c >> 16) & 0xFF for c in colors]),
+            array('B', [(c >> 8) & 0xFF for c in colors]),
+            array('B', [c & 0xFF for c in colors]),
+        )
+    return (
+        array('B', packed[2::8]),
+        array('B', packed[1::8]),
+        array('B', packed[0::8]),
+    )
+
+
+def RGBToColorBatch(
+    R: 'Iterable[int]',
+    G: 'Iterable[int]',
+    B: 'Iterable[int]',
+) -> 'array[int]':
+    """Convert many RGB sets to integer colors, as per `RGBToColor`. values
+    must be 0-255
+
+    ## Args:
+     * R (Iterable[int]): red values
+
+     * G (Iterable[int]): green values
+
+     * B (Iterable[int]): blue values
+
+    ## Returns:
+     * array[int]: colors
+    """
+    reds = list(map(index, R))
+    greens = list(map(index, G))
+    blues = list(map(index, B))
+    if not len(reds) == len(greens) == len(blues):
+        raise ValueError("R, G and B must have the same length")
+    try:
+        return _bytesToColors(bytes(blues), bytes(greens), bytes(reds))
+    except ValueError:
+        # Values outside the range 0-255
+        return array('q', [
+            (r << 16) | (g << 8) | b
+            for r, g, b in zip(reds, greens, blues, strict=True)
+        ])
+
+
+def RGBToHSVBatch(
+    R: 'Iterable[float]',
+    G: 'Iterable[float]',
+    B: 'Iterable[float]',
+) -> 'tuple[array[float], array[float], array[float]]':
+    """Convert many RGB colors to HSV colors, as per `RGBToHSV`
+
+    Each distinct color is only converted once.
+
+    ## Args:
+     * R (Iterable[float]): red values (0.0 - 1.0)
+
+     * G (Iterable[float]): green values (0.0 - 1.0)
+
+     * B (Iterable[float]): blue values (0.0 - 1.0)
+
+    ## Returns:
+     * array[float]: hues (degrees: 0.0-360)
+
+     * array[float]: saturations (0.0-1.0)
+
+     * array[float]: values/luminosities (0.0/1.0)
+    """
+    cache: dict[tuple[float, float, float], tuple[float, float, float]] = {}
+    results = []
+    for rgb in zip(R, G, B, strict=True):
+        hsv = cache.get(rgb)
+        if hsv is None:
+            hsv = cache[rgb] = RGBToHSV(*rgb)
+        results.append(hsv)
+    return _splitTriples(results)
+
+
+def RGBToHSVColorBatch(
+    Colors: 'Iterable[int]',
+) -> 'tuple[array[float], array[float], array[float]]':
+    """Convert many integer colors to HSV colors, as per `RGBToHSVColor`
+
+    Each distinct color is only converted once, so this is fastest when
+    colors repeat, such as when converting the colors of many channels.
+
+    ## Args:
+     * Colors (Iterable[int]): colors as integers (`0x--RRGGBB`)
+
+    ## Returns:
+     * array[float]: hues
+
+     * array[float]: saturations
+
+     * array[float]: values (brightness)
+    """
+    cache: dict[int, tuple[float, float, float]] = {}
+    results = []
+    for color in Colors:
+        # Only the lower 24 bits are used by the conversion
+        color = index(color) & 0xFFFFFF
+        hsv = cache.get(color)
+        if hsv is None:
+            hsv = cache[color] = RGBToHSVColor(color)
+        results.append(hsv)
+    return _splitTriples(results)
+
+
+def HSVtoRGBBatch(
+    H: 'Iterable[float]',
+    S: 'Iterable[float]',
+    V: 'Iterable[float]',
+) -> 'tuple[array[float], array[float], array[float]]':
+    """Convert many HSV colors to RGB colors, as per `HSVtoRGB`
+
+    Each distinct color is only converted once.
+
+    ## Args:
+     * H (Iterable[float]): hues (degrees: 0.0-360)
+
+     * S (Iterable[float]): saturations (0-1.0)
+
+     * V (Iterable[float]): values/luminosities (0-1.0)
+
+    ## Returns:
+     * array[float]: red values (0.0-1.0)
+
+     * array[float]: green values (0.0-1.0)
+
+     * array[float]: blue values (0.0-1.0)
+    """
+    cache: dict[tuple[float, float, float], tuple[float, float, float]] = {}
+    results = []
+    for hsv in zip(H, S, V, strict=True):
+        rgb = cache.get(hsv)
+        if rgb is None:
+            rgb = cache[hsv] = HSVtoRGB(*hsv)
+        results.append(rgb)
+    return _splitTriples(results)
+
+
+def FadeColorBatch(
+    StartColors: 'Iterable[int]',
+    EndColor: int,
+    Value: float,
+) -> 'array[int]':
+    """Fade many colors towards one color, as per `FadeColor`
+
+    ## Args:
+     * StartColors (Iterable[int]): color integers
+
+     * EndColor (int): color integer
+
+     * Value (float): fade position (0-255)
+
+    ## Returns:
+     * array[int]: faded colors
+
+    WARNING:
+     * Blue value is incorrect, using green start value
+    """
+    rEnd, gEnd, bEnd = ColorToRGB(EndColor)
+    ratio = Value / 255
+    # Each component of the result only depends on one component of the
+    # start color, so the results for every possible component are
+    # calculated up-front
+    rTable = [round(c * (1 - ratio) + (rEnd * ratio)) for c in range(256)]
+    gTable = [round(c * (1 - ratio) + (gEnd * ratio)) for c in range(256)]
+    bTable = [round(c * (1 - ratio) + (bEnd * ratio)) for c in range(256)]
+    colors = list(map(index, StartColors))
+    packed = _colorBytes(colors)
+    rBytes = _byteTable(rTable)
+    gBytes = _byteTable(gTable)
+    bBytes = _byteTable(bTable)
+    if (
+        packed is not None
+        and rBytes is not None
+        and gBytes is not None
+        and bBytes is not None
+    ):
+        greens = packed[1::8]
+        return _bytesToColors(
+            greens.translate(bBytes),
+            greens.translate(gBytes),
+            packed[2::8].translate(rBytes),
+        )
+    result = array('q')
+    for color in colors:
+        g = (color >> 8) & 0xFF
+        result.append(
+            (rTable[(color >> 16) & 0xFF] << 16)
+            | (gTable[g] << 8)
+            | bTable[g]
+        )
+    return result
+
+
+def LightenColorBatch(Colors: 'Iterable[int]', Value: float) -> 'array[int]':
+    """Lighten many colors by a certain amount, as per `LightenColor`
+
+    ## Args:
+     * Colors (Iterable[int]): color integers
+
+     * Value (float): amount to lighten by (0-255)
+
+    ## Returns:
+     * array[int]: lightened colors
+    """
+    ratio = Value / 255
+    table = [round(c + (1.0 - c) * ratio) for c in range(256)]
+    colors = list(map(index, Colors))
+    packed = _colorBytes(colors)
+    tableBytes = _byteTable(table)
+    if packed is not None and tableBytes is not None:
+        return _bytesToColors(
+            packed[0::8].translate(tableBytes),
+            packed[1::8].translate(tableBytes),
+            packed[2::8].translate(tableBytes),
+        )
+    result = array('q')
+    for color in colors:
+        result.append(
+            (table[(color >> 16) & 0xFF] << 16)
+            | (table[(color >> 8) & 0xFF] << 8)
+            | table[color & 0xFF]
+        )
+    return result
+
+
 def VolTodB(Value: float) -> float:
     """Convert volume as a decimal (0.0 - 1.0) to a decibel value
 
@@ -536,3 +1102,125 @@ def VolTodB(Value: float) -> float:
     if Value == 0:
         return 0
     return round(math.log10(Value) * 20, 1)
+
+
+# Volume conversion
+#
+# These functions are not included in FL Studio's version of this module.
+
+_VolTodBTables: 'dict[int, tuple[float, ...]]' = {}
+
+
+def VolTodBTable(Steps: int = 128) -> 'tuple[float, ...]':
+    """Return a table of the decibel values of each position of a MIDI
+    control, as per `VolTodB`, so that the decibel value of a control can be
+    looked up without any calculations.
+
+    Tables are calculated the first time they are requested, then reused.
+
+    ```py
+    >>> table = utils.VolTodBTable()
+    >>> table[100], table[127]
+    (-5.0, 0.0)
+    ```
+
+    ### WARNING:
+    * For zero volume, the table contains 0 instead of -oo dB, as per
+      `VolTodB`
+
+    ## Args:
+     * Steps (int, optional): number of control positions, where the volume
+       of position `i` is `i / (Steps - 1)`. Defaults to 128 (a 7-bit
+       control). Use 16384 for a 14-bit control.
+
+    ## Returns:
+     * tuple[float, ...]: volumes in decibels
+    """
+    table = _VolTodBTables.get(Steps)
+    if table is None:
+        if Steps < 2:
+            raise ValueError("Steps must be at least 2")
+        table = tuple(VolTodB(i / (Steps - 1)) for i in range(Steps))
+        _VolTodBTables[Steps] = table
+    return table
+
+
+_Log11 = math.log(11)
+
+
+def dBToVol(dB: float) -> float:
+    """Convert a decibel value to a volume as a decimal (0.0 - 1.0). This is
+    the inverse of `VolTodB`, so it uses the same curve, where 1.0 is 0 dB.
+
+    Values above 0 dB (the maximum of `VolTodB`) give a volume of 1.0, and
+    -oo dB gives a volume of 0.0.
+
+    ### WARNING:
+    * This is not the curve of FL Studio's mixer faders, where the default
+      volume of 0.8 is 0 dB, so `mixer.setTrackVolume(i, dBToVol(dB))`
+      doesn't set a track to `dB` decibels. Use `dBToFader` instead.
+
+    ## Args:
+     * dB (float): volume in decibels
+
+    ## Returns:
+     * float: volume
+    """
+    if dB >= 0:
+        return 1.0
+    return math.log(10 ** (dB / 20) * 10 + 1) / _Log11
+
+
+# Fader volume conversion
+#
+# These functions are not included in FL Studio's version of this module.
+
+_FaderDefault = 0.8
+_FaderMaxdB = 5.6
+_FaderLogMax = math.log(1.0 / _FaderDefault)
+
+
+def FaderTodB(Value: float) -> float:
+    """Convert the volume of a mixer track's fader as a decimal (0.0 - 1.0)
+    to a decibel value, as used by `mixer.getTrackVolume` and
+    `mixer.setTrackVolume`. The default volume of 0.8 is 0 dB, 1.0 is
+    +5.6 dB, and 0.0 is -oo dB.
+
+    Between those points, the gain is modelled as a power of the volume, so
+    values far below the default are approximate.
+
+    ## Args:
+     * Value (float): volume
+
+    ## Returns:
+     * float: volume in decibels, rounded to 0.1 dB
+    """
+    if Value <= 0:
+        return -math.inf
+    return round(
+        _FaderMaxdB * math.log(Value / _FaderDefault) / _FaderLogMax, 1)
+
+
+def dBToFader(dB: float) -> float:
+    """Convert a decibel value to the volume of a mixer track's fader as a
+    decimal (0.0 - 1.0). This is the inverse of `FaderTodB`.
+
+    Values above +5.6 dB (the top of the fader) give a volume of 1.0, and
+    -oo dB gives a volume of 0.0.
+
+    ```py
+    >>> utils.dBToFader(0.0)
+    0.8
+    >>> utils.FaderTodB(utils.dBToFader(-6.0))
+    -6.0
+    ```
+
+    ## Args:
+     * dB (float): volume in decibels
+
+    ## Returns:
+     * float: volume
+    """
+    if dB >= _FaderMaxdB:
+        return 1.0
+    return _FaderDefault * math.exp(dB * _FaderLogMax / _FaderMaxdB)